@@ -1,28 +1,82 @@
 import os
-from pathlib import Path
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 import dearpygui.dearpygui as dpg
 import numpy as np
-from PIL import Image
 
 from parakeet_lipsync.audio_player import AudioPlayer
-from parakeet_lipsync.models import RecognitionResult
+from parakeet_lipsync.audio_source import SampleSource
+from parakeet_lipsync.cache import AudioCache
+from parakeet_lipsync.live import LiveLipsync, LiveUpdate
+from parakeet_lipsync.models import BINARY_EXTENSION, RecognitionResult
+from parakeet_lipsync.output_view import ResultTable
+from parakeet_lipsync.postprocess import PostProcessSettings, postprocess
+from parakeet_lipsync.project import (
+    PROJECT_EXTENSION, AudioFingerprint, AudioStatus, Project, ProjectError, load_project, save_project
+)
 from parakeet_lipsync.recognizer import PhonemeRecognizer
+from parakeet_lipsync.rigs import DEFAULT_RIG, MOUTH_SHAPES, CharacterRig, RigAtlas, build_atlas, discover_rigs
+from parakeet_lipsync.scheduler import Priority, RecognitionJob, RecognitionScheduler
+from parakeet_lipsync.spectrogram import SpectrogramTile, SpectrogramTiler, TileKey
+from parakeet_lipsync.ui_dispatch import UIDispatcher
+from parakeet_lipsync.waveform import PeakPyramid
+
+# Horizontal points drawn for the visible part of the waveform
+WAVEFORM_POINTS = 2048
+# Deepest zoom shows at least this many samples across the plot
+MIN_VIEW_SAMPLES = 64
+# Timeline track: at most this many spans (about one per pixel column) and labels
+TIMELINE_MAX_SPANS = 1500
+TIMELINE_MAX_LABELS = 150
+
+# Fill colours of timeline spans, in MOUTH_SHAPES order
+SHAPE_COLORS = [
+    (230, 100, 90), (240, 170, 70), (200, 200, 80), (120, 200, 100), (80, 180, 180), (90, 140, 230),
+    (150, 110, 220), (210, 110, 190), (150, 150, 150), (90, 90, 100), (170, 130, 90)
+]
+
+
+def _shape_color(shape: str) -> tuple[int, int, int]:
+    """Return the timeline colour of a mouth shape."""
+    if shape in MOUTH_SHAPES:
+        return SHAPE_COLORS[MOUTH_SHAPES.index(shape) % len(SHAPE_COLORS)]
+    return SHAPE_COLORS[sum(shape.encode()) % len(SHAPE_COLORS)]
 
 
 class ParakeetApp:
     """Main application class for Parakeet Lipsync."""
 
     def __init__(self):
-        self.audio_player = AudioPlayer()
-        self.recognizer = PhonemeRecognizer()
+        self.audio_cache = AudioCache()
+        self.audio_player = AudioPlayer(audio_cache=self.audio_cache)
+        # Posteriors are kept so changing decoding settings re-decodes without the model
+        self.recognizer = PhonemeRecognizer(audio_cache=self.audio_cache, keep_posteriors=True)
+        self.scheduler = RecognitionScheduler(self.recognizer, max_workers=1)
+        self._process_job: Optional[RecognitionJob] = None
+        # Live microphone mode and the steps it has committed so far
+        self._live: Optional[LiveLipsync] = None
+        self._live_result: Optional[RecognitionResult] = None
 
         self.current_file: Optional[str] = None
         self.lipsync_result: Optional[RecognitionResult] = None
+        self._raw_result: Optional[RecognitionResult] = None  # Before clean-up
+        self.postprocess_settings = PostProcessSettings()
+        self.postprocess_enabled: bool = False
         self.fps: int = 24
 
         # Waveform data
+        self._peaks: Optional[PeakPyramid] = None
+        self._saved_peaks: Optional[tuple] = None  # (block, level-0 peaks) from a project, used once
+        self._saved_view: Optional[dict] = None  # Project view restored once the audio is decoded
+        # Spectrogram lane: tiler for the loaded audio and the tiles on the plot
+        self.show_spectrogram: bool = False
+        self._spectrogram: Optional[SpectrogramTiler] = None
+        # key -> (texture, series, tile); the tile keeps the texture's buffer alive
+        self._spectrogram_items: dict[TileKey, tuple[int, int, SpectrogramTile]] = {}
+        self._spectrogram_wanted: set[TileKey] = set()
+        # What the timeline track was last drawn for: (result, view start, view end)
+        self._timeline_drawn: Optional[tuple] = None
         self.waveform_x: list = []
         self.waveform_y: list = []
         self.cursor_position: float = 0.0
@@ -33,26 +87,44 @@ class ParakeetApp:
         self._view_start: float = 0.0  # Start of visible range in seconds
 
         # Mouth shape textures
-        self._mouth_textures: dict[str, int] = {}
-        self._mouth_shapes_dir = Path(__file__).parent.parent.parent / "resources" / "mouthShapes"
+        self.rigs: dict[str, CharacterRig] = discover_rigs()
+        self.rig_name: str = DEFAULT_RIG
+        if DEFAULT_RIG in self.rigs:
+            self.recognizer.rig_directory = self.rigs[DEFAULT_RIG].directory
+        self._rig_atlases: dict[str, RigAtlas] = {}  # Kept alive: DearPyGui reads their buffers
+        self._rig_textures: dict[str, int] = {}
+        self._rig_loading: set[str] = set()
+        self._mouth_shape: str = "rest"
 
         # UI element tags
         self.file_label_tag = "file_label"
         self.waveform_plot_tag = "waveform_plot"
         self.waveform_series_tag = "waveform_series"
         self.cursor_line_tag = "cursor_line"
-        self.output_text_tag = "output_text"
+        self.output_view = ResultTable("output", on_row_clicked=self._on_output_row_clicked)
         self.fps_input_tag = "fps_input"
         self.process_btn_tag = "process_btn"
+        self.process_progress_tag = "process_progress"
         self.play_btn_tag = "play_btn"
 
-        # Set up audio player callbacks
-        self.audio_player.set_position_callback(self._on_position_update)
-        self.audio_player.set_finished_callback(self._on_playback_finished)
+        # Widgets are only touched on the UI thread; background threads post here
+        self.ui_queue = UIDispatcher()
+        self._widget_values: dict[str, Any] = {}  # Last value written per tag
+        self._mouth_image_key: Optional[tuple] = None  # (texture, uv) currently shown
+
+        # Set up audio player callbacks (called from the player's thread)
+        self.audio_player.set_position_callback(
+            lambda position: self.ui_queue.post_latest("position", self._on_position_update, position)
+        )
+        self.audio_player.set_finished_callback(
+            lambda: self.ui_queue.post(self._on_playback_finished)
+        )
 
     def run(self):
         """Run the application."""
         dpg.create_context()
+        # Run widget callbacks on this thread, between frames
+        dpg.configure_app(manual_callback_management=True)
         self._load_mouth_textures()
         self._setup_ui()
         self._setup_theme()
@@ -61,39 +133,84 @@ class ParakeetApp:
         dpg.setup_dearpygui()
         dpg.show_viewport()
         dpg.set_primary_window("main_window", True)
-        dpg.start_dearpygui()
+        while dpg.is_dearpygui_running():
+            dpg.run_callbacks(dpg.get_callback_queue())
+            self.ui_queue.drain()
+            dpg.render_dearpygui_frame()
+        if self._live is not None:
+            self._stop_live()
+        self.scheduler.shutdown(wait=False)
+        self._close_spectrogram()
+        self.audio_player.close()
         dpg.destroy_context()
 
     def _load_mouth_textures(self):
-        """Load mouth shape images as textures."""
-        mouth_shapes = ["AI", "E", "FV", "L", "MBP", "O", "U", "WQ", "etc", "rest", "N"]
-
-        with dpg.texture_registry(show=False):
-            for shape in mouth_shapes:
-                image_path = self._mouth_shapes_dir / f"{shape}.jpg"
-                if image_path.exists():
-                    # Load image with PIL
-                    img = Image.open(image_path).convert("RGBA")
-                    width, height = img.size
-
-                    # Convert to flat list of floats (0-1 range)
-                    img_data = np.array(img).astype(np.float32) / 255.0
-                    img_data = img_data.flatten().tolist()
-
-                    # Create texture
-                    texture_id = dpg.add_static_texture(
-                        width=width,
-                        height=height,
-                        default_value=img_data,
-                        tag=f"texture_{shape}"
-                    )
-                    self._mouth_textures[shape] = texture_id
+        """Load the current rig's sprite atlas as a texture."""
+        dpg.add_texture_registry(tag="texture_registry", show=False)
+        rig = self.rigs.get(self.rig_name)
+        if rig is None:
+            return
+        try:
+            self._install_rig_atlas(build_atlas(rig))
+        except Exception as e:
+            print(f"Error loading mouth shapes: {e}")
+
+    def _install_rig_atlas(self, atlas: RigAtlas):
+        """Upload a rig atlas as a texture (UI thread only)."""
+        # A raw texture reads the float32 buffer directly, with no list conversion
+        pixels = np.ascontiguousarray(atlas.data, dtype=np.float32).reshape(-1)
+        atlas.data = pixels.reshape(atlas.height, atlas.width, 4)
+        texture_id = dpg.add_raw_texture(
+            width=atlas.width,
+            height=atlas.height,
+            default_value=pixels,
+            format=dpg.mvFormat_Float_rgba,
+            parent="texture_registry"
+        )
+        self._rig_atlases[atlas.rig_name] = atlas
+        self._rig_textures[atlas.rig_name] = texture_id
+
+    def _on_rig_selected(self, sender, app_data):
+        """Switch the mouth shape preview to another character rig."""
+        name = app_data
+        if name not in self.rigs or name == self.rig_name:
+            return
+        self._use_rig_mapping(name)
+        if name in self._rig_textures:
+            self.rig_name = name
+            self._set_mouth_shape_image(self._mouth_shape)
+            return
+        if name in self._rig_loading:
+            return
 
-        # Use 'rest' as fallback for missing shapes
-        if "rest" in self._mouth_textures:
-            for shape in mouth_shapes:
-                if shape not in self._mouth_textures:
-                    self._mouth_textures[shape] = self._mouth_textures["rest"]
+        # Decode off the UI thread; keep showing the old rig meanwhile
+        self._rig_loading.add(name)
+
+        def load():
+            try:
+                atlas = build_atlas(self.rigs[name])
+            except Exception as e:
+                print(f"Error loading rig '{name}': {e}")
+                self.ui_queue.post(self._rig_loading.discard, name)
+                return
+            self.ui_queue.post(self._on_rig_loaded, atlas)
+
+        threading.Thread(target=load, name=f"rig-loader-{name}", daemon=True).start()
+
+    def _use_rig_mapping(self, name: str):
+        """Map phones with a rig's mapping table and remap the current result."""
+        self.recognizer.rig_directory = self.rigs[name].directory
+        if self._raw_result is not None and self._raw_result.phones is not None:
+            self._raw_result = self.recognizer.remap(self._raw_result)
+            self._apply_postprocess()
+
+    def _on_rig_loaded(self, atlas: RigAtlas):
+        """Install a rig decoded in the background and show it if still selected."""
+        self._rig_loading.discard(atlas.rig_name)
+        self._install_rig_atlas(atlas)
+        if dpg.get_value("rig_combo") == atlas.rig_name:
+            self.rig_name = atlas.rig_name
+            self._set_mouth_shape_image(self._mouth_shape)
 
     def _setup_theme(self):
         """Set up application theme."""
@@ -130,6 +247,7 @@ class ParakeetApp:
                 default_filename="lipsync_output.txt"
         ):
             dpg.add_file_extension(".txt", color=(255, 255, 0, 255))
+            dpg.add_file_extension(BINARY_EXTENSION, color=(200, 150, 255, 255))
 
         with dpg.file_dialog(
                 directory_selector=False,
@@ -142,6 +260,28 @@ class ParakeetApp:
         ):
             dpg.add_file_extension(".dat", color=(255, 128, 0, 255))
 
+        # Project dialogs
+        with dpg.file_dialog(
+                directory_selector=False,
+                show=False,
+                callback=self._on_open_project,
+                tag="open_project_dialog",
+                width=600,
+                height=400
+        ):
+            dpg.add_file_extension(PROJECT_EXTENSION, color=(120, 200, 255, 255))
+
+        with dpg.file_dialog(
+                directory_selector=False,
+                show=False,
+                callback=self._on_save_project,
+                tag="save_project_dialog",
+                width=600,
+                height=400,
+                default_filename=f"lipsync{PROJECT_EXTENSION}"
+        ):
+            dpg.add_file_extension(PROJECT_EXTENSION, color=(120, 200, 255, 255))
+
         # Register keyboard shortcuts
         with dpg.handler_registry():
             dpg.add_key_press_handler(dpg.mvKey_O, callback=self._shortcut_open)
@@ -150,6 +290,7 @@ class ParakeetApp:
             dpg.add_key_press_handler(dpg.mvKey_Add, callback=self._shortcut_zoom_in)
             dpg.add_key_press_handler(dpg.mvKey_Subtract, callback=self._shortcut_zoom_out)
             dpg.add_key_press_handler(dpg.mvKey_0, callback=self._shortcut_zoom_fit)
+            dpg.add_mouse_wheel_handler(callback=self._on_mouse_wheel)
 
         # Main window
         with dpg.window(tag="main_window"):
@@ -160,6 +301,16 @@ class ParakeetApp:
                         label="Open Audio (Ctrl+O)",
                         callback=lambda: dpg.show_item("file_dialog")
                     )
+                    dpg.add_menu_item(
+                        label="Open Project...",
+                        callback=lambda: dpg.show_item("open_project_dialog")
+                    )
+                    dpg.add_menu_item(
+                        label="Save Project...",
+                        callback=lambda: dpg.show_item("save_project_dialog"),
+                        tag="save_project_menu_item",
+                        enabled=False
+                    )
                     dpg.add_separator()
                     dpg.add_menu_item(
                         label="Save Output (Ctrl+S)",
@@ -228,10 +379,49 @@ class ParakeetApp:
                     tag=self.cursor_line_tag
                 )
 
+            # Spectrogram lane (optional), filled in tile by tile
+            with dpg.plot(
+                    tag="spectrogram_plot",
+                    height=120,
+                    width=-1,
+                    no_menus=True,
+                    no_box_select=True,
+                    no_mouse_pos=True,
+                    show=False,
+            ):
+                dpg.add_plot_axis(dpg.mvXAxis, tag="spectrogram_x_axis", no_tick_labels=True)
+                dpg.add_plot_axis(
+                    dpg.mvYAxis, label="Hz", tag="spectrogram_y_axis",
+                    lock_min=True,
+                    lock_max=True
+                )
+
+            # Phoneme timeline track, kept on the same time range as the waveform
+            with dpg.plot(
+                    tag="timeline_plot",
+                    height=50,
+                    width=-1,
+                    no_menus=True,
+                    no_box_select=True,
+                    no_mouse_pos=True,
+            ):
+                dpg.add_plot_axis(dpg.mvXAxis, tag="timeline_x_axis", no_tick_labels=True)
+                dpg.add_plot_axis(
+                    dpg.mvYAxis, tag="timeline_y_axis",
+                    no_tick_labels=True,
+                    no_tick_marks=True,
+                    lock_min=True,
+                    lock_max=True
+                )
+                dpg.set_axis_limits("timeline_y_axis", 0, 1)
+                dpg.add_draw_layer(tag="timeline_layer")
+
             # Set up plot click handler for seeking (left click)
             with dpg.item_handler_registry(tag="plot_handler"):
                 dpg.add_item_clicked_handler(button=dpg.mvMouseButton_Left, callback=self._on_waveform_click)
             dpg.bind_item_handler_registry(self.waveform_plot_tag, "plot_handler")
+            dpg.bind_item_handler_registry("timeline_plot", "plot_handler")
+            dpg.bind_item_handler_registry("spectrogram_plot", "plot_handler")
 
             # Horizontal scroll slider (for panning when zoomed)
             dpg.add_slider_float(
@@ -253,6 +443,8 @@ class ParakeetApp:
                 dpg.add_button(label="+", callback=self._on_zoom_in, width=30)
                 dpg.add_spacer(width=10)
                 dpg.add_button(label="Fit All (0)", callback=self._on_zoom_fit, width=80)
+                dpg.add_spacer(width=10)
+                dpg.add_checkbox(label="Spectrogram", tag="spectrogram_toggle", callback=self._on_spectrogram_toggled)
                 dpg.add_spacer(width=20)
                 dpg.add_text("Keys: +/- zoom, 0 fit  |  Click to seek  |  Drag slider to scroll", color=(120, 120, 120))
 
@@ -290,6 +482,9 @@ class ParakeetApp:
                 )
                 dpg.add_spacer(width=20)
                 dpg.add_text("0:00.00 / 0:00.00", tag="time_display")
+                dpg.add_spacer(width=20)
+                dpg.add_button(label="Live Mic", tag="live_btn", callback=self._on_live_toggled, width=100)
+                dpg.add_text("", tag="live_latency", color=(150, 150, 150))
 
             dpg.add_spacer(height=10)
 
@@ -302,34 +497,119 @@ class ParakeetApp:
                 height=40,
                 enabled=False
             )
+            dpg.add_progress_bar(
+                tag=self.process_progress_tag,
+                default_value=0.0,
+                width=-1,
+                show=False
+            )
+
+            # Clean-up settings, applied to the result without re-running recognition
+            with dpg.collapsing_header(label="Clean-up", default_open=False):
+                with dpg.group(horizontal=True):
+                    dpg.add_checkbox(
+                        label="Enable",
+                        tag="postprocess_enabled",
+                        default_value=self.postprocess_enabled,
+                        callback=self._on_postprocess_changed
+                    )
+                    dpg.add_checkbox(
+                        label="Merge repeats",
+                        tag="postprocess_merge",
+                        default_value=self.postprocess_settings.merge_equal,
+                        callback=self._on_postprocess_changed
+                    )
+                    dpg.add_checkbox(
+                        label="Fill gaps",
+                        tag="postprocess_fill_gaps",
+                        default_value=self.postprocess_settings.fill_gaps,
+                        callback=self._on_postprocess_changed
+                    )
+                    dpg.add_spacer(width=10)
+                    dpg.add_text("Min hold (frames):")
+                    dpg.add_input_int(
+                        tag="postprocess_min_hold",
+                        default_value=self.postprocess_settings.min_hold_frames,
+                        min_value=0,
+                        max_value=24,
+                        min_clamped=True,
+                        max_clamped=True,
+                        width=80,
+                        callback=self._on_postprocess_changed
+                    )
+                    dpg.add_text("Min phone (ms):")
+                    dpg.add_input_int(
+                        tag="postprocess_min_phone",
+                        default_value=int(self.postprocess_settings.min_phone_seconds * 1000),
+                        min_value=0,
+                        max_value=500,
+                        min_clamped=True,
+                        max_clamped=True,
+                        width=80,
+                        callback=self._on_postprocess_changed
+                    )
+
+            # Decoding settings; changing them re-decodes the cached model output
+            with dpg.collapsing_header(label="Decoding", default_open=False):
+                with dpg.group(horizontal=True):
+                    dpg.add_text("Emission:")
+                    dpg.add_input_float(
+                        tag="decode_emit",
+                        default_value=self.recognizer.decode_params["emit"],
+                        min_value=0.1,
+                        max_value=5.0,
+                        min_clamped=True,
+                        max_clamped=True,
+                        step=0.1,
+                        format="%.1f",
+                        width=100,
+                        callback=self._on_decode_changed
+                    )
+                    dpg.add_text("Language:")
+                    dpg.add_input_text(
+                        tag="decode_lang",
+                        default_value=self.recognizer.decode_params["lang_id"],
+                        width=80,
+                        on_enter=True,
+                        callback=self._on_decode_changed
+                    )
+                    dpg.add_text("Higher emission finds more phones; 'ipa' allows every phone",
+                                 color=(120, 120, 120))
 
             dpg.add_spacer(height=10)
 
-            # Output section: text area on left, mouth shape on right
+            # Output section: step table on left, mouth shape on right
             dpg.add_text("Output:")
             with dpg.group(horizontal=True):
-                # Text area (takes most of the width)
-                dpg.add_input_text(
-                    tag=self.output_text_tag,
-                    multiline=True,
-                    readonly=True,
-                    width=-200,
-                    height=-1,
-                    default_value="Load an audio file and click 'Process Audio' to generate lipsync data."
-                )
+                # Step table (takes most of the width)
+                self.output_view.build(width=-220, height=-1)
+                self.output_view.set_message("Load an audio file and click 'Process Audio' to generate lipsync data.")
 
                 # Mouth shape display panel
                 with dpg.child_window(width=-1, height=-1, border=True, tag="mouth_shape_panel"):
                     dpg.add_text("Mouth Shape", color=(150, 150, 150))
                     dpg.add_separator()
                     dpg.add_spacer(height=10)
-                    # Mouth shape image
-                    if "rest" in self._mouth_textures:
+                    # Character rig picker
+                    dpg.add_combo(
+                        items=list(self.rigs),
+                        default_value=self.rig_name,
+                        tag="rig_combo",
+                        width=150,
+                        callback=self._on_rig_selected
+                    )
+                    dpg.add_spacer(height=5)
+                    # Mouth shape image (one cell of the rig's atlas)
+                    atlas = self._rig_atlases.get(self.rig_name)
+                    if atlas is not None and atlas.uv("rest"):
+                        uv_min, uv_max = atlas.uv("rest")
                         dpg.add_image(
-                            self._mouth_textures["rest"],
+                            self._rig_textures[self.rig_name],
                             tag="mouth_shape_image",
                             width=150,
-                            height=150
+                            height=150,
+                            uv_min=uv_min,
+                            uv_max=uv_max
                         )
                     dpg.add_spacer(height=5)
                     dpg.add_text(
@@ -349,18 +629,39 @@ class ParakeetApp:
             file_path = app_data["file_path_name"]
             self._load_audio(file_path)
 
-    def _load_audio(self, file_path: str):
-        """Load audio file and update UI."""
+    def _load_audio(self, file_path: str, peaks: Optional[tuple] = None):
+        """Load audio file and update UI.
+
+        Args:
+            file_path: Audio file to open
+            peaks: Saved (block size, level-0 peaks) to build the waveform
+                from instead of reading the audio
+        """
+        self._saved_peaks = peaks
+        self._saved_view = None
+        # A result for the previous file is no longer wanted
+        if self._process_job is not None:
+            self._process_job.cancel()
+            self._process_job = None
+
         try:
-            samples, sample_rate = self.audio_player.load(file_path)
+            source = self.audio_player.load(
+                file_path, on_ready=lambda source: self.ui_queue.post(self._on_audio_decoded, source)
+            )
             self.current_file = file_path
+            self._peaks = None
+            self._close_spectrogram()
+            dpg.configure_item("save_project_menu_item", enabled=True)
             self.cursor_position = 0.0
 
             # Clear previous lipsync data
             self.lipsync_result = None
+            self._raw_result = None
+            self._update_timeline()
+            self.output_view.set_message("Click 'Process Audio' to generate lipsync data.")
             self._set_mouth_shape_image("rest")
-            dpg.set_value("mouth_shape_name", "rest")
-            dpg.set_value("mouth_shape_time", "Not processed")
+            self._set_widget_value("mouth_shape_name", "rest")
+            self._set_widget_value("mouth_shape_time", "Not processed")
 
             # Reset zoom
             self._zoom_level = 1
@@ -371,10 +672,13 @@ class ParakeetApp:
 
             # Update file label
             filename = os.path.basename(file_path)
-            dpg.set_value(self.file_label_tag, f"Loaded: {filename}")
-
-            # Generate waveform data (downsample for display)
-            self._update_waveform(samples, sample_rate)
+            if source.is_ready:
+                dpg.set_value(self.file_label_tag, f"Loaded: {filename}")
+                # Generate waveform data (downsample for display)
+                self._update_waveform(source)
+            else:
+                # Compressed audio keeps decoding in the background
+                dpg.set_value(self.file_label_tag, f"Decoding: {filename}...")
 
             # Enable controls
             dpg.configure_item(self.process_btn_tag, enabled=True)
@@ -391,35 +695,53 @@ class ParakeetApp:
             print(f"Error loading audio: {e}")
             dpg.set_value(self.file_label_tag, f"Error loading file: {e}")
 
-    def _update_waveform(self, samples: np.ndarray, sample_rate: int):
-        """Update waveform display."""
-        duration = len(samples) / sample_rate
-
-        # Downsample for display (target ~2000 points)
-        target_points = 2000
-        step = max(1, len(samples) // target_points)
-
-        # Use peak values for better visualization
-        num_points = len(samples) // step
-        self.waveform_x = []
-        self.waveform_y = []
-
-        for i in range(num_points):
-            start_idx = i * step
-            end_idx = min(start_idx + step, len(samples))
-            segment = samples[start_idx:end_idx]
-
-            t = (start_idx / sample_rate)
-            peak = np.max(np.abs(segment)) if len(segment) > 0 else 0
-
-            # Add positive and negative peaks for waveform shape
-            self.waveform_x.extend([t, t])
-            self.waveform_y.extend([-peak, peak])
+    def _on_audio_decoded(self, source: SampleSource):
+        """Handle a background decode finishing."""
+        if source is not self.audio_player.source:
+            return  # A different file was opened in the meantime
+        filename = os.path.basename(source.path)
+        if source.error is not None:
+            dpg.set_value(self.file_label_tag, f"Error loading file: {source.error}")
+            return
+        dpg.set_value(self.file_label_tag, f"Loaded: {filename}")
+        self._update_waveform(source)
+        self._update_time_display()
+        self._update_zoom_view()
+        if self._saved_view is not None:
+            view, self._saved_view = self._saved_view, None
+            self._restore_view(view)
 
-        # Update plot
-        dpg.set_value(self.waveform_series_tag, [self.waveform_x, self.waveform_y])
+    def _update_waveform(self, source: SampleSource):
+        """Build the peak pyramid for a source and draw the whole file."""
+        saved, self._saved_peaks = self._saved_peaks, None
+        try:
+            if saved is None:
+                raise ValueError("No saved peaks")
+            block, peaks = saved
+            self._peaks = PeakPyramid(source, base_block=block, base_level=peaks)
+        except ValueError:
+            self._peaks = PeakPyramid(source)
+        duration = source.duration
+
+        self._close_spectrogram()
+        self._spectrogram = SpectrogramTiler(
+            source, on_tile_ready=lambda tile: self.ui_queue.post(self._on_spectrogram_tile, tile)
+        )
+        dpg.set_axis_limits("spectrogram_y_axis", 0, self._spectrogram.max_frequency)
+
+        self._draw_waveform_window(0.0, duration)
         dpg.set_axis_limits("waveform_x_axis", 0, duration)
         dpg.fit_axis_data("waveform_x_axis")
+        self._update_timeline()
+
+    def _draw_waveform_window(self, start: float, end: float):
+        """Upload the waveform vertices for the visible time range."""
+        if self._peaks is None:
+            return
+        x, y = self._peaks.window(start, end, WAVEFORM_POINTS)
+        self.waveform_x = x.tolist()
+        self.waveform_y = y.tolist()
+        dpg.set_value(self.waveform_series_tag, [self.waveform_x, self.waveform_y])
 
     def _on_waveform_click(self, sender, app_data):
         """Handle waveform click for seeking."""
@@ -437,9 +759,15 @@ class ParakeetApp:
             self._update_cursor()
             self._update_time_display()
 
+    def _set_widget_value(self, tag: str, value: Any) -> None:
+        """Set a widget's value, skipping the write if it hasn't changed."""
+        if self._widget_values.get(tag) != value:
+            self._widget_values[tag] = value
+            dpg.set_value(tag, value)
+
     def _update_cursor(self):
         """Update cursor position on waveform."""
-        dpg.set_value(self.cursor_line_tag, [[self.cursor_position], []])
+        self._set_widget_value(self.cursor_line_tag, [[self.cursor_position], []])
 
     def _update_time_display(self, position: Optional[float] = None):
         """Update time display label."""
@@ -448,7 +776,7 @@ class ParakeetApp:
 
         current_str = f"{int(current // 60)}:{current % 60:05.2f}"
         total_str = f"{int(total // 60)}:{total % 60:05.2f}"
-        dpg.set_value("time_display", f"{current_str} / {total_str}")
+        self._set_widget_value("time_display", f"{current_str} / {total_str}")
 
     def _on_position_update(self, position: float):
         """Handle position update from audio player."""
@@ -459,6 +787,28 @@ class ParakeetApp:
         self._update_time_display(position)
         self._update_mouth_shape_display(position)
 
+    def _on_output_row_clicked(self, index: int):
+        """Seek to the start of the step clicked in the output table."""
+        if self.lipsync_result is None or self._live is not None:
+            return
+        position = float(self.lipsync_result.starts[index])
+        self.cursor_position = position
+        self.audio_player.seek(position)
+        self._update_cursor()
+        self._update_time_display()
+        self._update_mouth_shape_display(position)
+
+        # Bring the step into view if the waveform is zoomed elsewhere
+        view_duration = self.audio_player.duration / self._zoom_level
+        if not self._view_start <= position < self._view_start + view_duration:
+            self._view_start = position - view_duration / 2
+            self._update_zoom_view()
+
+    def _on_mouse_wheel(self, sender, app_data):
+        """Scroll the output table with the mouse wheel."""
+        if self.output_view.is_hovered():
+            self.output_view.scroll_by(-int(app_data) * 3)
+
     def _on_playback_finished(self):
         """Handle playback finished."""
         # If we were in "play to" mode, move cursor to the target position
@@ -501,18 +851,78 @@ class ParakeetApp:
         self.audio_player.play_from(self.cursor_position)
         dpg.configure_item(self.play_btn_tag, label="Pause")
 
+    def _on_live_toggled(self):
+        """Start or stop live lipsync from the microphone."""
+        if self._live is not None:
+            self._stop_live()
+            return
+
+        if self.audio_player.is_playing:
+            self._on_play_pause()
+        live = LiveLipsync(
+            self.recognizer,
+            # Called on the live worker thread
+            on_update=lambda update: self.ui_queue.post(self._on_live_update, update)
+        )
+        try:
+            live.start()
+        except Exception as e:
+            print(f"Error starting live input: {e}")
+            self._set_widget_value("live_latency", f"Microphone unavailable: {e}")
+            return
+
+        self._live = live
+        self._live_result = RecognitionResult()
+        self.output_view.set_result(self._live_result)
+        dpg.configure_item("live_btn", label="Stop Live")
+        self._set_widget_value("live_latency", "Listening...")
+
+    def _on_live_update(self, update: LiveUpdate):
+        """Show a live update: the shape at the live edge and new steps."""
+        if self._live is None:
+            return  # Stopped while the update was queued
+        for step in update.steps:
+            self._live_result.add_step(step)
+        if update.steps:
+            self.output_view.set_result(self._live_result)
+            self.output_view.follow(len(self._live_result) - 1)
+
+        self._set_mouth_shape_image(update.shape)
+        self._set_widget_value("mouth_shape_name", update.shape)
+        self._set_widget_value("mouth_shape_time", f"Live {update.stream_time:.1f}s")
+        self._set_widget_value("live_latency", f"Latency {update.latency * 1000:.0f} ms")
+
+    def _stop_live(self):
+        """Stop live mode and go back to the loaded file's result."""
+        live, self._live = self._live, None
+        live.stop()
+        print(f"Live lipsync: {live.stats.summary()}")
+        p95 = live.stats.percentile(95) + live.stats.fixed
+        dpg.configure_item("live_btn", label="Live Mic")
+        self._set_widget_value("live_latency", f"Last session: p95 {p95 * 1000:.0f} ms")
+
+        if self.lipsync_result is not None:
+            self.output_view.set_result(self.lipsync_result)
+        else:
+            self.output_view.set_message("Click 'Process Audio' to generate lipsync data.")
+        self._update_mouth_shape_display(self.cursor_position)
+
     def _on_zoom_in(self):
         """Zoom in on the waveform (show less time, more detail)."""
         if self.audio_player.duration <= 0:
             return
 
-        # Max zoom: 16x
-        if self._zoom_level >= 16:
+        # Max zoom: a few dozen samples across the plot
+        if self._zoom_level * 2 > self._max_zoom_level():
             return
 
         self._zoom_level *= 2
         self._update_zoom_view()
 
+    def _max_zoom_level(self) -> int:
+        """Return the deepest zoom level for the loaded audio."""
+        return max(1, self.audio_player.num_frames // MIN_VIEW_SAMPLES)
+
     def _on_zoom_out(self):
         """Zoom out on the waveform (show more time, less detail)."""
         if self.audio_player.duration <= 0:
@@ -586,53 +996,360 @@ class ParakeetApp:
         view_end = self._view_start + view_duration
 
         dpg.set_axis_limits("waveform_x_axis", self._view_start, view_end)
+        self._draw_waveform_window(self._view_start, view_end)
+        self._update_timeline()
+        self._update_spectrogram()
+
+    def _on_spectrogram_toggled(self, sender, app_data):
+        """Show or hide the spectrogram lane."""
+        self.show_spectrogram = app_data
+        dpg.configure_item("spectrogram_plot", show=app_data)
+        self._update_spectrogram()
+
+    def _update_spectrogram(self):
+        """Show the cached tiles for the visible range and request the rest.
+
+        Tiles come from the tiler's cache keyed by (zoom level, tile index),
+        so only tiles never computed before cost any work; they are added by
+        _on_spectrogram_tile as the workers finish them.
+        """
+        if not self.show_spectrogram or self._spectrogram is None:
+            return
+
+        view_end = self._view_start + self.audio_player.duration / self._zoom_level
+        dpg.set_axis_limits("spectrogram_x_axis", self._view_start, view_end)
+        level = self._zoom_level
+        self._spectrogram_wanted = {
+            (level, index) for index in self._spectrogram.tile_range(level, self._view_start, view_end)
+        }
+
+        for key in list(self._spectrogram_items):
+            if key not in self._spectrogram_wanted:
+                self._remove_spectrogram_tile(key)
+        for tile in self._spectrogram.request(level, self._view_start, view_end):
+            self._add_spectrogram_tile(tile)
+
+    def _on_spectrogram_tile(self, tile: SpectrogramTile):
+        """Place a freshly computed tile if it is still in view."""
+        if tile.key in self._spectrogram_wanted and self.show_spectrogram:
+            self._add_spectrogram_tile(tile)
+
+    def _add_spectrogram_tile(self, tile: SpectrogramTile):
+        """Upload a tile as a texture and draw it at its time range."""
+        if tile.key in self._spectrogram_items:
+            return
+        texture = dpg.add_raw_texture(
+            width=tile.width,
+            height=tile.height,
+            default_value=tile.pixels.reshape(-1),
+            format=dpg.mvFormat_Float_rgba,
+            parent="texture_registry"
+        )
+        series = dpg.add_image_series(
+            texture,
+            bounds_min=(tile.start, 0),
+            bounds_max=(tile.end, tile.max_frequency),
+            parent="spectrogram_y_axis"
+        )
+        self._spectrogram_items[tile.key] = (texture, series, tile)
+
+    def _remove_spectrogram_tile(self, key: TileKey):
+        """Remove a tile's image series and texture from the plot."""
+        texture, series, _ = self._spectrogram_items.pop(key)
+        dpg.delete_item(series)
+        dpg.delete_item(texture)
+
+    def _close_spectrogram(self):
+        """Drop the spectrogram of the previous audio."""
+        for key in list(self._spectrogram_items):
+            self._remove_spectrogram_tile(key)
+        self._spectrogram_wanted = set()
+        if self._spectrogram is not None:
+            self._spectrogram.close()
+            self._spectrogram = None
+
+    def _update_timeline(self):
+        """Redraw the phoneme track for the visible range.
+
+        Only steps overlapping the view are drawn, found by binary search.
+        When there are more than about one per pixel column, only the first
+        step in each column is kept. Nothing is redrawn unless the result
+        or the view changed since the last call.
+        """
+        result = self.lipsync_result
+        duration = self.audio_player.duration
+        view_end = self._view_start + duration / self._zoom_level
+        drawn = self._timeline_drawn
+        if drawn is not None and drawn[0] is result and drawn[1:] == (self._view_start, view_end):
+            return
+        self._timeline_drawn = (result, self._view_start, view_end)
+
+        dpg.delete_item("timeline_layer", children_only=True)
+        if duration <= 0:
+            return
+        dpg.set_axis_limits("timeline_x_axis", self._view_start, view_end)
+        if result is None or result.is_empty:
+            return
+
+        indices = result.indices_in_range(self._view_start, view_end)
+        if len(indices) > TIMELINE_MAX_SPANS:
+            scale = TIMELINE_MAX_SPANS / (view_end - self._view_start)
+            columns = ((result.starts[indices] - self._view_start) * scale).astype(np.int64)
+            indices = indices[np.concatenate(([True], columns[1:] != columns[:-1]))]
+        show_labels = len(indices) <= TIMELINE_MAX_LABELS
+
+        starts = result.starts[indices]
+        ends = starts + result.durations[indices]
+        for start, end, code in zip(starts.tolist(), ends.tolist(), result.codes[indices].tolist()):
+            shape = result.shape_table[code]
+            dpg.draw_rectangle(
+                (start, 0.1), (end, 0.9),
+                color=(30, 30, 30, 255),
+                fill=_shape_color(shape),
+                parent="timeline_layer"
+            )
+            if show_labels:
+                dpg.draw_text((start, 0.8), shape, size=13, color=(255, 255, 255), parent="timeline_layer")
 
     def _on_fps_changed(self, sender, app_data):
         """Handle FPS change."""
         self.fps = app_data
+        if self.postprocess_enabled and self._raw_result:
+            # Minimum hold is measured in frames, so the clean-up depends on fps
+            self._apply_postprocess()
+        elif self.lipsync_result:
+            # Build the frame table now rather than on the first playback tick
+            self.lipsync_result.frame_table(self.fps)
+
+    def _on_postprocess_changed(self, sender=None, app_data=None):
+        """Read clean-up settings from the UI and re-apply them."""
+        self.postprocess_enabled = dpg.get_value("postprocess_enabled")
+        self.postprocess_settings.merge_equal = dpg.get_value("postprocess_merge")
+        self.postprocess_settings.fill_gaps = dpg.get_value("postprocess_fill_gaps")
+        self.postprocess_settings.min_hold_frames = dpg.get_value("postprocess_min_hold")
+        self.postprocess_settings.min_phone_seconds = dpg.get_value("postprocess_min_phone") / 1000.0
+        if self._raw_result:
+            self._apply_postprocess()
+
+    def _on_decode_changed(self, sender=None, app_data=None):
+        """Read decoding settings from the UI and re-decode the current file."""
+        self.recognizer.decode_params["emit"] = round(dpg.get_value("decode_emit"), 2)
+        self.recognizer.decode_params["lang_id"] = dpg.get_value("decode_lang").strip() or "ipa"
+        # A running job keeps its settings; the new ones apply to the next run
+        running = self._process_job is not None and not self._process_job.done()
+        if self._raw_result is not None and not running:
+            self._on_process()
+
+    def _apply_postprocess(self):
+        """Derive the displayed result from the raw recognizer output."""
+        result = self._raw_result
+        if self.postprocess_enabled:
+            self.postprocess_settings.fps = self.fps
+            result = postprocess(result, self.postprocess_settings)
+        result.frame_table(self.fps)
+        self.lipsync_result = result
+        self.output_view.set_result(result)
+        self._update_timeline()
 
     def _on_process(self):
-        """Process audio for phoneme recognition."""
+        """Process audio for phoneme recognition, or cancel a running job."""
+        if self._process_job is not None and not self._process_job.done():
+            self._process_job.cancel()
+            return
+
         if not self.current_file:
             return
 
-        dpg.configure_item(self.process_btn_tag, enabled=False, label="Processing...")
-        dpg.set_value(self.output_text_tag, "Processing audio... Please wait.")
+        dpg.configure_item(self.process_btn_tag, label="Cancel")
+        dpg.set_value(self.process_progress_tag, 0.0)
+        dpg.configure_item(self.process_progress_tag, show=True, overlay="Processing...")
+        self.output_view.set_message("Processing audio... Please wait.")
 
-        def on_complete(result: RecognitionResult):
-            self.lipsync_result = result
-            dpg.set_value(self.output_text_tag, result.to_string())
+        def reset_controls():
             dpg.configure_item(self.process_btn_tag, enabled=True, label="Process Audio")
+            dpg.configure_item(self.process_progress_tag, show=False)
+
+        job = None
+
+        # Loading another file replaces the job; a late outcome of the old one is ignored
+        def is_stale() -> bool:
+            if job is self._process_job:
+                return False
+            if self._process_job is None:
+                reset_controls()
+            return True
+
+        def on_progress(fraction: float):
+            if job is not self._process_job:
+                return
+            dpg.set_value(self.process_progress_tag, fraction)
+            dpg.configure_item(self.process_progress_tag, overlay=f"Processing... {fraction:.0%}")
+
+        def on_complete(result: RecognitionResult):
+            if is_stale():
+                return
+            self._raw_result = result
+            self._apply_postprocess()
+            reset_controls()
             dpg.configure_item("save_menu_item", enabled=True)
             dpg.configure_item("export_menu_item", enabled=True)
-            print(f"Processing complete. Found {len(result)} phoneme steps.")
+            print(f"Processing complete. Found {len(self.lipsync_result)} phoneme steps.")
+            if self.recognizer.cache is not None:
+                stats = self.recognizer.cache.stats()
+                print(f"Recognition cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
 
         def on_error(error: Exception):
-            dpg.set_value(self.output_text_tag, f"Error: {error}")
-            dpg.configure_item(self.process_btn_tag, enabled=True, label="Process Audio")
+            if is_stale():
+                return
+            self.output_view.set_message(f"Error: {error}")
+            reset_controls()
             print(f"Processing error: {error}")
 
-        self.recognizer.recognize_async(self.current_file, on_complete, on_error)
+        def on_cancel():
+            if is_stale():
+                return
+            reset_controls()
+            self.output_view.set_message("Processing cancelled.")
+
+        # Callbacks run on the UI thread after this assignment, via ui_queue
+        job = self._process_job = self.scheduler.submit(
+            self.current_file,
+            priority=Priority.INTERACTIVE,
+            # Scheduler callbacks run on its worker thread
+            on_progress=lambda fraction: self.ui_queue.post_latest("progress", on_progress, fraction),
+            on_complete=lambda result: self.ui_queue.post(on_complete, result),
+            on_error=lambda error: self.ui_queue.post(on_error, error),
+            on_cancel=lambda: self.ui_queue.post(on_cancel),
+            block=False,
+            source=self.audio_player.source
+        )
 
     def _on_save_text(self, sender, app_data):
-        """Save lipsync output as text file."""
+        """Save lipsync output as a text file, or binary for .pkr paths."""
         if app_data and "file_path_name" in app_data and self.lipsync_result:
             file_path = app_data["file_path_name"]
             try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(self.lipsync_result.to_string())
+                if file_path.lower().endswith(BINARY_EXTENSION):
+                    self.lipsync_result.save_binary(file_path)
+                else:
+                    with open(file_path, "w", encoding="utf-8") as f:
+                        f.write(self.lipsync_result.to_string())
                 print(f"Saved to: {file_path}")
             except Exception as e:
                 print(f"Error saving file: {e}")
 
+    def _on_save_project(self, sender, app_data):
+        """Save the session and its derived data as a project."""
+        if not (app_data and "file_path_name" in app_data and self.current_file):
+            return
+        file_path = app_data["file_path_name"]
+        if not file_path.lower().endswith(PROJECT_EXTENSION):
+            file_path += PROJECT_EXTENSION
+        try:
+            project = Project(
+                audio=AudioFingerprint.from_file(self.current_file),
+                sample_rate=self.audio_player.sample_rate,
+                num_frames=self.audio_player.num_frames,
+                fps=self.fps,
+                postprocess_enabled=self.postprocess_enabled,
+                postprocess_settings=self.postprocess_settings,
+                raw_result=self._raw_result,
+                result=self.lipsync_result,
+                peak_block=self._peaks.base_block if self._peaks else 64,
+                peaks=(self._peaks.mins[0], self._peaks.maxs[0]) if self._peaks else None,
+                view={
+                    "zoom_level": self._zoom_level,
+                    "view_start": self._view_start,
+                    "cursor_position": self.cursor_position,
+                    "rig": self.rig_name,
+                },
+            )
+            save_project(file_path, project)
+            print(f"Saved project: {file_path}")
+        except Exception as e:
+            print(f"Error saving project: {e}")
+
+    def _on_open_project(self, sender, app_data):
+        """Handle project file selection."""
+        if app_data and "file_path_name" in app_data:
+            self._load_project(app_data["file_path_name"])
+
+    def _load_project(self, file_path: str):
+        """Restore a saved session without recomputing its derived data."""
+        try:
+            project = load_project(file_path)
+        except ProjectError as e:
+            print(f"Error opening project: {e}")
+            dpg.set_value(self.file_label_tag, f"Error opening project: {e}")
+            return
+
+        audio_path = project.resolve_audio_path(file_path)
+        status = project.audio.check(audio_path)
+        if status == AudioStatus.MISSING:
+            dpg.set_value(self.file_label_tag, f"Project audio not found: {audio_path}")
+            return
+
+        # Settings apply either way; derived data only if the audio is unchanged
+        unchanged = status == AudioStatus.OK
+        saved_peaks = (project.peak_block, project.peaks) if unchanged and project.peaks is not None else None
+        self._load_audio(audio_path, peaks=saved_peaks)
+        if self.current_file != audio_path:
+            return  # Loading failed and was already reported
+
+        self.fps = project.fps
+        dpg.set_value(self.fps_input_tag, project.fps)
+        self.postprocess_enabled = project.postprocess_enabled
+        self.postprocess_settings = project.postprocess_settings
+        dpg.set_value("postprocess_enabled", project.postprocess_enabled)
+        dpg.set_value("postprocess_merge", project.postprocess_settings.merge_equal)
+        dpg.set_value("postprocess_fill_gaps", project.postprocess_settings.fill_gaps)
+        dpg.set_value("postprocess_min_hold", project.postprocess_settings.min_hold_frames)
+        dpg.set_value("postprocess_min_phone", int(project.postprocess_settings.min_phone_seconds * 1000))
+        rig = project.view.get("rig")
+        if rig in self.rigs and rig != self.rig_name:
+            dpg.set_value("rig_combo", rig)
+            self._on_rig_selected(None, rig)
+
+        if not unchanged:
+            dpg.set_value(
+                self.file_label_tag,
+                f"Loaded: {os.path.basename(audio_path)} (audio changed since the project was saved; process again)"
+            )
+            return
+
+        if project.raw_result is not None:
+            self._raw_result = project.raw_result
+            result = project.result if project.result is not None else project.raw_result
+            result.frame_table(self.fps)
+            self.lipsync_result = result
+            self.output_view.set_result(result)
+            dpg.configure_item("save_menu_item", enabled=True)
+            dpg.configure_item("export_menu_item", enabled=True)
+
+        if self.audio_player.source is not None and self.audio_player.source.is_ready:
+            self._restore_view(project.view)
+        else:
+            self._saved_view = project.view
+        print(f"Opened project: {file_path}")
+
+    def _restore_view(self, view: dict):
+        """Apply a project's saved zoom, scroll and cursor position."""
+        self._zoom_level = max(1, min(int(view.get("zoom_level", 1)), self._max_zoom_level()))
+        self._view_start = float(view.get("view_start", 0.0))
+        self.cursor_position = min(float(view.get("cursor_position", 0.0)), self.audio_player.duration)
+        self.audio_player.seek(self.cursor_position)
+        self._update_cursor()
+        self._update_time_display()
+        self._update_mouth_shape_display(self.cursor_position)
+        self._update_zoom_view()
+
     def _on_save_moho(self, sender, app_data):
         """Export lipsync data as Moho timesheet."""
         if app_data and "file_path_name" in app_data and self.lipsync_result:
             file_path = app_data["file_path_name"]
             try:
-                moho_data = self.lipsync_result.export_as_moho_timesheet(self.fps)
                 with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(moho_data)
+                    self.lipsync_result.write_moho_timesheet(f, self.fps)
                 print(f"Exported to: {file_path}")
             except Exception as e:
                 print(f"Error exporting file: {e}")
@@ -673,34 +1390,39 @@ class ParakeetApp:
 
     def _update_mouth_shape_display(self, position: float) -> None:
         """Update the mouth shape display widget."""
+        if self._live is not None:
+            return  # Live updates drive the panel
         if not self.lipsync_result or self.lipsync_result.is_empty:
             self._set_mouth_shape_image("rest")
-            dpg.set_value("mouth_shape_name", "rest")
-            dpg.set_value("mouth_shape_time", "Not processed")
+            self._set_widget_value("mouth_shape_name", "rest")
+            self._set_widget_value("mouth_shape_time", "Not processed")
             return
 
-        step = self.lipsync_result.get_shape_at(position)
+        index = self.lipsync_result.get_shape_index_at_frame(int(position * self.fps), self.fps)
+        self.output_view.follow(index)
+        step = self.lipsync_result[index] if index >= 0 else None
         if step:
             self._set_mouth_shape_image(step.mouth_shape)
-            dpg.set_value("mouth_shape_name", step.mouth_shape)
-            dpg.set_value("mouth_shape_time", f"{step.start_time:.2f}s - {step.end_time:.2f}s")
+            self._set_widget_value("mouth_shape_name", step.mouth_shape)
+            self._set_widget_value("mouth_shape_time", f"{step.start_time:.2f}s - {step.end_time:.2f}s")
         else:
             self._set_mouth_shape_image("rest")
-            dpg.set_value("mouth_shape_name", "rest")
-            dpg.set_value("mouth_shape_time", "")
+            self._set_widget_value("mouth_shape_name", "rest")
+            self._set_widget_value("mouth_shape_time", "")
 
     def _set_mouth_shape_image(self, shape: str) -> None:
         """Set the mouth shape image to the given shape."""
-        if shape in self._mouth_textures:
-            texture_id = self._mouth_textures[shape]
-        elif "rest" in self._mouth_textures:
-            texture_id = self._mouth_textures["rest"]
-        else:
+        self._mouth_shape = shape
+        atlas = self._rig_atlases.get(self.rig_name)
+        uv = atlas.uv(shape) if atlas is not None else None
+        if uv is None:
             return
 
-        # Update the image texture
-        if dpg.does_item_exist("mouth_shape_image"):
-            dpg.configure_item("mouth_shape_image", texture_tag=texture_id)
+        # Point the image at the shape's cell of the atlas
+        key = (self._rig_textures[self.rig_name], uv)
+        if key != self._mouth_image_key and dpg.does_item_exist("mouth_shape_image"):
+            self._mouth_image_key = key
+            dpg.configure_item("mouth_shape_image", texture_tag=key[0], uv_min=uv[0], uv_max=uv[1])
 
     def _show_about(self):
         """Show about dialog."""
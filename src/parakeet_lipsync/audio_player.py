@@ -2,27 +2,64 @@
 
 import time
 import threading
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
-import librosa
 import numpy as np
-import sounddevice as sd
 
+from parakeet_lipsync.audio_source import SampleSource, open_audio
+from parakeet_lipsync.cache import AudioCache
 
-class AudioPlayer:
-    """Audio player with position tracking and seek functionality."""
 
-    def __init__(self):
-        self.samples: Optional[np.ndarray] = None
-        self.sample_rate: Optional[int] = None
-        self.duration: float = 0.0
+def _default_stream_factory(**kwargs) -> Any:
+    """Open a real sounddevice output stream."""
+    # Imported lazily so the player can be used with a fake stream on
+    # machines without PortAudio
+    import sounddevice as sd
+    return sd.OutputStream(**kwargs)
+
 
-        # Playback state
-        self.is_playing: bool = False
-        self.current_position: int = 0  # Position in samples
+class AudioPlayer:
+    """Audio player with position tracking and seek functionality.
+
+    Playback runs on one persistent output stream whose callback copies
+    samples from the loaded buffer at a read index. Play, pause, seek and
+    play-to just move that index or the end marker; the device is never
+    restarted. The reported position follows the stream clock, so it matches
+    what is actually coming out of the speakers.
+
+    The stream is created by ``stream_factory``, which is called with
+    sounddevice.OutputStream keyword arguments. Tests can pass a fake that
+    drives the callback by hand and exposes a ``time`` attribute.
+
+    Compressed files are decoded through ``audio_cache`` when one is given,
+    so re-opening them maps the cached decode instead.
+    """
+
+    def __init__(
+        self,
+        stream_factory: Optional[Callable[..., Any]] = None,
+        blocksize: int = 512,
+        audio_cache: Optional[AudioCache] = None
+    ):
+        self.source: Optional[SampleSource] = None
+        self.audio_cache = audio_cache
+
+        self._stream_factory = stream_factory or _default_stream_factory
+        self._blocksize = blocksize
+        self._stream = None
+        self._stream_rate: Optional[int] = None
+
+        # Playback state, shared with the audio callback
+        self._lock = threading.Lock()
+        self._playing: bool = False
+        self._read_index: int = 0  # Next sample the callback will copy
         self._play_start_sample: int = 0
         self._play_end_sample: Optional[int] = None
-        self._play_start_time: float = 0.0
+        # Clock anchor: first sample of the last block and when it reaches the DAC
+        self._anchor_sample: int = 0
+        self._anchor_time: Optional[float] = None
+        self._end_time: Optional[float] = None  # Stream time the last sample is heard
+        self._reached_end: bool = False
 
         # Callbacks
         self._on_position_update: Optional[Callable[[float], None]] = None
@@ -32,89 +69,222 @@ class AudioPlayer:
         self._update_thread: Optional[threading.Thread] = None
         self._stop_update_thread: bool = False
 
-    def load(self, file_path: str) -> tuple[np.ndarray, int]:
-        """Load audio file and return samples and sample rate."""
+    def load(
+        self,
+        file_path: str,
+        on_ready: Optional[Callable[[SampleSource], None]] = None
+    ) -> SampleSource:
+        """Open an audio file for playback.
+
+        WAV files and cached decodes are memory-mapped and usable
+        immediately. Other formats decode in the background; until they finish, unread parts play as
+        silence and ``on_ready`` is called once they are done.
+
+        Returns:
+            The sample source for the file
+        """
         self.stop()
-        self.samples, self.sample_rate = librosa.load(file_path, sr=None)
-        self.duration = len(self.samples) / self.sample_rate if self.sample_rate else 0
-        self.current_position = 0
-        self._play_start_sample = 0
-        self._play_end_sample = None
-        return self.samples, self.sample_rate
+        source = open_audio(file_path, on_ready=on_ready, audio_cache=self.audio_cache)
+        with self._lock:
+            if self.source is not None:
+                self.source.close()
+            self.source = source
+            self._read_index = 0
+            self._play_start_sample = 0
+            self._play_end_sample = None
+        return source
+
+    @property
+    def sample_rate(self) -> Optional[int]:
+        """Return the sample rate of the loaded audio."""
+        return self.source.sample_rate if self.source is not None else None
+
+    @property
+    def duration(self) -> float:
+        """Return the length of the loaded audio in seconds."""
+        return self.source.duration if self.source is not None else 0.0
+
+    @property
+    def num_frames(self) -> int:
+        """Return the number of frames in the loaded audio."""
+        return self.source.num_frames if self.source is not None else 0
+
+    @property
+    def samples(self) -> Optional[np.ndarray]:
+        """Return all samples as one array.
+
+        This materializes the whole file; prefer reading ranges from
+        ``source``.
+        """
+        return self.source.read_all() if self.source is not None else None
+
+    @property
+    def is_playing(self) -> bool:
+        """Return True while audio is being played."""
+        return self._playing
+
+    @property
+    def current_position(self) -> int:
+        """Return the current position in samples."""
+        return int(self.get_position_seconds() * self.sample_rate) if self.sample_rate else 0
+
+    @current_position.setter
+    def current_position(self, position: int) -> None:
+        """Move the read index to a position in samples."""
+        self._seek_samples(position)
+
+    def _stream_time(self) -> Optional[float]:
+        """Return the stream's clock, or None if there isn't one."""
+        if self._stream is None:
+            return None
+        try:
+            return float(self._stream.time)
+        except Exception:
+            return None
 
     def get_position_seconds(self) -> float:
         """Return current position in seconds."""
-        if self.sample_rate and self.samples is not None:
-            return min(self.current_position / self.sample_rate, self.duration)
-        return 0.0
+        if not self.sample_rate or self.source is None:
+            return 0.0
+
+        with self._lock:
+            position = self._read_index
+            if self._playing and self._anchor_time is not None:
+                now = self._stream_time()
+                if now is not None:
+                    # Interpolate from the last block's DAC time, but never
+                    # report a sample that hasn't been handed to the device
+                    heard = self._anchor_sample + (now - self._anchor_time) * self.sample_rate
+                    position = int(min(max(heard, self._play_start_sample), self._read_index))
+                else:
+                    position = self._anchor_sample
+        return min(position / self.sample_rate, self.duration)
+
+    def _clamp_sample(self, position: int) -> int:
+        """Clamp a sample index to the loaded audio."""
+        return max(0, min(int(position), self.num_frames))
+
+    def _seek_samples(self, position: int) -> None:
+        """Move playback to a sample index without touching the stream."""
+        if self.source is None:
+            return
+        with self._lock:
+            self._read_index = self._clamp_sample(position)
+            self._play_start_sample = self._read_index
+            self._anchor_sample = self._read_index
+            self._anchor_time = None
+            self._end_time = None
+            self._reached_end = False
 
     def seek(self, position_seconds: float) -> None:
         """Seek to a position in seconds."""
-        if self.samples is not None and self.sample_rate is not None:
-            was_playing = self.is_playing
-            if was_playing:
-                self.stop()
+        if self.source is not None:
+            self._seek_samples(int(position_seconds * self.sample_rate))
 
-            self.current_position = int(position_seconds * self.sample_rate)
-            self.current_position = max(0, min(self.current_position, len(self.samples)))
-
-            if was_playing:
-                self.play()
+    def _ensure_stream(self) -> None:
+        """Open and start the output stream for the current sample rate."""
+        if self._stream is not None and self._stream_rate == self.sample_rate:
+            return
+        self._close_stream()
+        self._stream = self._stream_factory(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=self._blocksize,
+            callback=self._audio_callback
+        )
+        self._stream_rate = self.sample_rate
+        self._stream.start()
+
+    def _audio_callback(self, outdata: np.ndarray, frames: int, time_info, status) -> None:
+        """Fill the device buffer from the read index (runs on the audio thread)."""
+        with self._lock:
+            if not self._playing or self.source is None:
+                outdata.fill(0)
+                return
+
+            end_sample = self._play_end_sample if self._play_end_sample is not None else self.num_frames
+            start = self._read_index
+            stop = min(start + frames, end_sample)
+            count = max(0, stop - start)
+
+            outdata[:count, 0] = self.source.read(start, start + count)
+            outdata[count:] = 0
+
+            dac_time = getattr(time_info, "outputBufferDacTime", None)
+            self._anchor_sample = start
+            self._anchor_time = dac_time
+            self._read_index = start + count
+
+            if self._read_index >= end_sample:
+                self._playing = False
+                self._reached_end = True
+                self._end_time = dac_time + count / self.sample_rate if dac_time is not None else None
 
     def play(self) -> None:
         """Play audio from current position."""
-        if self.samples is None or self.sample_rate is None:
+        if self.source is None:
             return
 
-        # Stop any current playback without clearing end_sample
-        self._stop_playback()
-
-        start = self.current_position
-        end = self._play_end_sample if self._play_end_sample else len(self.samples)
-
-        if start >= end or start >= len(self.samples):
+        end = self._play_end_sample if self._play_end_sample is not None else self.num_frames
+        if self._read_index >= end:
             return
 
-        audio_slice = self.samples[start:end]
-        self._play_start_sample = start
-        self._play_start_time = time.time()
+        self._ensure_stream()
+        with self._lock:
+            self._play_start_sample = self._read_index
+            self._anchor_sample = self._read_index
+            self._anchor_time = None
+            self._end_time = None
+            self._reached_end = False
+            self._playing = True
 
-        sd.play(audio_slice, self.sample_rate)
-        self.is_playing = True
         self._start_position_updates()
 
     def play_from(self, position_seconds: float) -> None:
         """Play from specified position to the end."""
-        if self.samples is not None and self.sample_rate is not None:
+        if self.source is not None:
             self._play_end_sample = None  # Play to end
-            self.current_position = int(position_seconds * self.sample_rate)
-            self.current_position = max(0, min(self.current_position, len(self.samples)))
+            self.seek(position_seconds)
             self.play()
 
     def play_to(self, position_seconds: float) -> None:
         """Play from beginning to specified position."""
-        if self.samples is not None and self.sample_rate is not None:
-            self.current_position = 0
-            self._play_end_sample = int(position_seconds * self.sample_rate)
-            self._play_end_sample = max(0, min(self._play_end_sample, len(self.samples)))
+        if self.source is not None:
+            self._seek_samples(0)
+            self._play_end_sample = self._clamp_sample(int(position_seconds * self.sample_rate))
             self.play()
 
     def pause(self) -> None:
         """Pause audio playback, maintaining position."""
-        if self.is_playing:
-            self._update_current_position()
-            self._stop_playback()
+        if self._playing:
+            self._stop_position_updates()
+            position = int(self.get_position_seconds() * self.sample_rate)
+            with self._lock:
+                self._playing = False
+            self._seek_samples(position)
 
     def stop(self) -> None:
         """Stop audio playback and reset end position."""
-        self._stop_playback()
+        self.pause()
         self._play_end_sample = None
 
-    def _stop_playback(self) -> None:
-        """Stop audio playback without clearing end position."""
-        sd.stop()
-        self.is_playing = False
-        self._stop_position_updates()
+    def close(self) -> None:
+        """Stop playback and release the output stream."""
+        self.stop()
+        self._close_stream()
+        if self.source is not None:
+            self.source.close()
+
+    def _close_stream(self) -> None:
+        """Stop and release the output stream, if any."""
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            finally:
+                self._stream = None
+                self._stream_rate = None
 
     def toggle(self) -> None:
         """Toggle between play and pause."""
@@ -131,33 +301,33 @@ class AudioPlayer:
         """Set callback for playback finished."""
         self._on_playback_finished = callback
 
-    def _update_current_position(self) -> None:
-        """Update current position based on elapsed time."""
-        if not self.is_playing or self.samples is None or self.sample_rate is None:
-            return
-
-        elapsed = time.time() - self._play_start_time
-        self.current_position = self._play_start_sample + int(elapsed * self.sample_rate)
-
-        end_sample = self._play_end_sample if self._play_end_sample else len(self.samples)
-        if self.current_position >= end_sample:
-            self.current_position = end_sample
-            self.is_playing = False
-            # Don't call _stop_position_updates here - let the loop exit naturally
-            # and call the finished callback
-            if self._on_playback_finished:
-                self._on_playback_finished()
+    def _playback_done(self) -> bool:
+        """Return True once the last played sample has been heard."""
+        if self._playing or not self._reached_end:
+            return False
+        if self._end_time is None:
+            return True
+        now = self._stream_time()
+        return now is None or now >= self._end_time
 
     def _position_update_loop(self) -> None:
         """Background thread for position updates."""
-        while not self._stop_update_thread and self.is_playing:
-            self._update_current_position()
-            if self._on_position_update and self.is_playing:
+        while not self._stop_update_thread:
+            if self._playback_done():
+                with self._lock:
+                    self._anchor_time = None
+                    self._end_time = None
+                    self._reached_end = False
+                if self._on_playback_finished:
+                    self._on_playback_finished()
+                break
+            if self._on_position_update:
                 self._on_position_update(self.get_position_seconds())
             time.sleep(0.05)  # 50ms update interval
 
     def _start_position_updates(self) -> None:
         """Start the position update thread."""
+        self._stop_position_updates()
         self._stop_update_thread = False
         self._update_thread = threading.Thread(target=self._position_update_loop, daemon=True)
         self._update_thread.start()
@@ -0,0 +1,396 @@
+"""Lazily loaded audio sample sources.
+
+A sample source exposes decoded audio as mono float32 ranges pulled on
+demand, so opening a file doesn't require decoding all of it up front.
+PCM WAV files are memory-mapped; other formats are read blockwise or
+decoded on a background thread while the rest of the app keeps working.
+"""
+
+import os
+import struct
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+from parakeet_lipsync.cache import AudioCache
+
+
+class SampleSource:
+    """Base class for on-demand access to decoded audio.
+
+    ``read`` always returns mono float32 samples in [-1, 1]. Sources that
+    decode in the background report ``is_ready`` False until every sample
+    is available; reads past ``available_frames`` return silence.
+    """
+
+    path: Optional[str] = None
+    sample_rate: int = 0
+    num_frames: int = 0
+    channels: int = 1
+
+    @property
+    def duration(self) -> float:
+        """Return the length of the audio in seconds."""
+        return self.num_frames / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def available_frames(self) -> int:
+        """Return how many frames can currently be read."""
+        return self.num_frames
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True once all frames are available."""
+        return True
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until all frames are available."""
+        return True
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return mono float32 samples for frames [start, stop)."""
+        raise NotImplementedError
+
+    def read_all(self) -> np.ndarray:
+        """Return the whole file as mono float32 (may copy)."""
+        return self.read(0, self.num_frames)
+
+    def close(self) -> None:
+        """Release any file handles or worker threads."""
+
+    def _clamp(self, start: int, stop: int) -> tuple[int, int]:
+        """Clamp a frame range to the source."""
+        start = max(0, min(int(start), self.num_frames))
+        stop = max(start, min(int(stop), self.num_frames))
+        return start, stop
+
+
+class ArraySource(SampleSource):
+    """Sample source over an in-memory array."""
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, path: Optional[str] = None):
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=0, dtype=np.float32)
+        self._samples = samples
+        self.path = path
+        self.sample_rate = int(sample_rate)
+        self.num_frames = len(samples)
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return a view of the requested frames."""
+        start, stop = self._clamp(start, stop)
+        return self._samples[start:stop]
+
+    def read_all(self) -> np.ndarray:
+        """Return the underlying array without copying."""
+        return self._samples
+
+
+# WAVE format tags
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavMemmapSource(SampleSource):
+    """Memory-mapped PCM or float WAV file.
+
+    Only the requested frames are paged in and converted, so opening a
+    multi-hour WAV is instant and costs no RAM up front.
+    """
+
+    # (format tag, bits per sample) -> (numpy dtype, offset, scale)
+    _FORMATS = {
+        (_WAVE_FORMAT_PCM, 8): ("u1", 128.0, 1.0 / 128.0),
+        (_WAVE_FORMAT_PCM, 16): ("<i2", 0.0, 1.0 / 32768.0),
+        (_WAVE_FORMAT_PCM, 32): ("<i4", 0.0, 1.0 / 2147483648.0),
+        (_WAVE_FORMAT_IEEE_FLOAT, 32): ("<f4", 0.0, 1.0),
+        (_WAVE_FORMAT_IEEE_FLOAT, 64): ("<f8", 0.0, 1.0),
+    }
+
+    def __init__(self, path: str):
+        format_tag, channels, sample_rate, bits, data_offset, data_size = _parse_wav_header(path)
+        key = (format_tag, bits)
+        if key not in self._FORMATS:
+            raise ValueError(f"Unsupported WAV encoding for memory mapping: format {format_tag}, {bits}-bit")
+
+        dtype, self._offset, self._scale = self._FORMATS[key]
+        frame_bytes = channels * bits // 8
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.num_frames = data_size // frame_bytes
+        self._data = np.memmap(path, dtype=dtype, mode="r", offset=data_offset, shape=(self.num_frames, channels))
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Convert the requested frames to mono float32."""
+        start, stop = self._clamp(start, stop)
+        block = self._data[start:stop]
+        if self.channels > 1:
+            samples = block.mean(axis=1, dtype=np.float32)
+        elif self._offset or self._scale != 1.0:
+            samples = block[:, 0].astype(np.float32)
+        else:
+            return block[:, 0].astype(np.float32, copy=False)
+        if self._offset:
+            samples -= self._offset
+        if self._scale != 1.0:
+            samples *= self._scale
+        return samples
+
+    def close(self) -> None:
+        """Drop the memory map."""
+        self._data = None
+
+
+def _parse_wav_header(path: str) -> tuple[int, int, int, int, int, int]:
+    """Locate the format and data chunks of a RIFF/WAVE file.
+
+    Returns:
+        (format_tag, channels, sample_rate, bits_per_sample, data_offset, data_size)
+
+    Raises:
+        ValueError: If the file isn't a WAV file with fmt and data chunks
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {path}")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                data = f.read(chunk_size)
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", data[:16])
+                if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(data) >= 26:
+                    # The real format tag is the first two bytes of the sub-format GUID
+                    format_tag = struct.unpack("<H", data[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    break
+                data_offset = f.tell()
+                # Some writers leave the size at 0 or 0xFFFFFFFF when streaming
+                data_size = min(chunk_size, file_size - data_offset) if chunk_size else file_size - data_offset
+                return (*fmt, data_offset, data_size)
+            else:
+                f.seek(chunk_size, os.SEEK_CUR)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)  # Chunks are word-aligned
+
+    raise ValueError(f"WAV file has no fmt/data chunks: {path}")
+
+
+class DecodingSource(SampleSource):
+    """Source for compressed audio, decoded on a background thread.
+
+    When libsndfile can read the format, the frame count is known up front
+    and blocks become readable as they are decoded. Otherwise the whole
+    file is decoded with librosa and becomes readable at once.
+
+    If an audio cache and key are given, the finished decode is stored so
+    the next open of the same file can skip decoding.
+    """
+
+    _BLOCK_FRAMES = 65536
+
+    def __init__(
+        self,
+        path: str,
+        on_ready: Optional[Callable[["DecodingSource"], None]] = None,
+        audio_cache: Optional[AudioCache] = None,
+        cache_key: Optional[str] = None
+    ):
+        self.path = path
+        self.error: Optional[Exception] = None
+        self._on_ready = on_ready
+        self._audio_cache = audio_cache
+        self._cache_key = cache_key
+        self._ready = threading.Event()
+        self._available = 0
+        self._cancelled = False
+        self._buffer = np.zeros(0, dtype=np.float32)
+
+        try:
+            import soundfile as sf
+            info = sf.info(path)
+            self.sample_rate = int(info.samplerate)
+            self.channels = int(info.channels)
+            self.num_frames = int(info.frames)
+            target = self._decode_soundfile
+        except Exception:
+            import librosa
+            self.sample_rate = int(librosa.get_samplerate(path))
+            self.num_frames = 0  # Unknown until decoded
+            target = self._decode_librosa
+
+        self._buffer = np.zeros(self.num_frames, dtype=np.float32)
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def _run(self, target: Callable[[], None]) -> None:
+        """Decode, then mark the source ready and notify the listener."""
+        try:
+            target()
+        except Exception as e:
+            self.error = e
+            print(f"Error decoding audio: {e}")
+        else:
+            if self._audio_cache is not None and self._cache_key and not self._cancelled:
+                try:
+                    self._audio_cache.put_native(self._cache_key, self._buffer, self.sample_rate)
+                except OSError as e:
+                    print(f"Could not cache decoded audio: {e}")
+        self._ready.set()
+        if self._on_ready and not self._cancelled:
+            self._on_ready(self)
+
+    def _decode_soundfile(self) -> None:
+        """Fill the preallocated buffer block by block."""
+        import soundfile as sf
+
+        pos = 0
+        for block in sf.blocks(self.path, blocksize=self._BLOCK_FRAMES, dtype="float32", always_2d=True):
+            if self._cancelled:
+                return
+            count = min(len(block), self.num_frames - pos)
+            self._buffer[pos:pos + count] = block[:count].mean(axis=1) if self.channels > 1 else block[:count, 0]
+            pos += count
+            self._available = pos
+
+        # Some compressed formats report an approximate length
+        self.num_frames = pos
+        self._buffer = self._buffer[:pos]
+
+    def _decode_librosa(self) -> None:
+        """Decode the whole file in one go."""
+        import librosa
+
+        samples, _ = librosa.load(self.path, sr=self.sample_rate, mono=True)
+        self._buffer = samples.astype(np.float32, copy=False)
+        self.num_frames = len(samples)
+        self._available = self.num_frames
+
+    @property
+    def available_frames(self) -> int:
+        """Return how many frames have been decoded so far."""
+        return self._available
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True once decoding has finished."""
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until decoding has finished."""
+        return self._ready.wait(timeout)
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return decoded frames, with silence for parts not decoded yet."""
+        start, stop = self._clamp(start, stop)
+        available = self._available
+        if stop <= available:
+            return self._buffer[start:stop]
+        samples = np.zeros(stop - start, dtype=np.float32)
+        if start < available:
+            samples[:available - start] = self._buffer[start:available]
+        return samples
+
+    def read_all(self) -> np.ndarray:
+        """Wait for decoding and return the decoded buffer without copying."""
+        self.wait_ready()
+        return self._buffer
+
+    def close(self) -> None:
+        """Stop decoding if it is still running."""
+        self._cancelled = True
+
+
+def open_audio(
+    path: str,
+    on_ready: Optional[Callable[[SampleSource], None]] = None,
+    audio_cache: Optional[AudioCache] = None
+) -> SampleSource:
+    """Open an audio file as a lazily loaded sample source.
+
+    Args:
+        path: Audio file path
+        on_ready: Called (from a worker thread) when a background decode
+            finishes. Not called for sources that are ready immediately.
+        audio_cache: Decoded-audio cache to read from and fill
+
+    Returns:
+        A memory-mapped source for PCM/float WAV or cached decodes,
+        otherwise a DecodingSource
+    """
+    if path.lower().endswith((".wav", ".wave")):
+        try:
+            return WavMemmapSource(path)
+        except (ValueError, OSError, struct.error):
+            pass  # e.g. 24-bit or compressed WAV; fall back to decoding
+
+    cache_key = None
+    if audio_cache is not None:
+        try:
+            cache_key = AudioCache.make_key(path)
+        except OSError:
+            pass  # Let the decoder report the problem
+        else:
+            cached = audio_cache.get_native(cache_key)
+            if cached is not None:
+                samples, sample_rate = cached
+                return ArraySource(samples, sample_rate, path=path)
+
+    return DecodingSource(path, on_ready=on_ready, audio_cache=audio_cache, cache_key=cache_key)
+
+
+def resample_source(source: SampleSource, target_rate: int, block_seconds: float = 60.0) -> np.ndarray:
+    """Read a source as mono float32 at another sample rate, block by block.
+
+    Only one block of native-rate audio is held at a time. Each block is
+    resampled with a little context on both sides, which is trimmed off,
+    so block seams don't click.
+
+    Args:
+        source: Source to read (waited on if still decoding)
+        target_rate: Output sample rate
+        block_seconds: Length of each block read from the source
+
+    Returns:
+        Resampled samples (a view of the source's data when no resampling
+        is needed and the source holds it in memory)
+    """
+    import librosa
+
+    source.wait_ready()
+    if source.sample_rate == target_rate:
+        return source.read_all()
+
+    block = int(block_seconds * source.sample_rate)
+    pad = int(0.1 * source.sample_rate)
+    ratio = target_rate / source.sample_rate
+    total_out = int(round(source.num_frames * ratio))
+    output = np.empty(total_out, dtype=np.float32)
+
+    for start in range(0, source.num_frames, block):
+        stop = min(start + block, source.num_frames)
+        lo = max(0, start - pad)
+        hi = min(source.num_frames, stop + pad)
+        resampled = librosa.resample(source.read(lo, hi), orig_sr=source.sample_rate, target_sr=target_rate)
+
+        out_start = int(round(start * ratio))
+        out_stop = min(int(round(stop * ratio)), total_out)
+        skip = int(round((start - lo) * ratio))
+        count = min(out_stop - out_start, len(resampled) - skip)
+        output[out_start:out_start + count] = resampled[skip:skip + count]
+        if out_start + count < out_stop:
+            output[out_start + count:out_stop] = 0.0
+
+    return output
@@ -0,0 +1,305 @@
+"""Headless batch processing of audio files.
+
+This module must not import DearPyGui or sounddevice so that it can run on
+machines without a display or audio device.
+"""
+
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Collection, Optional
+
+from parakeet_lipsync.cache import DEFAULT_MAX_BYTES, RecognitionCache
+from parakeet_lipsync.mapping import DEFAULT_MAPPING, MAPPINGS_DIR
+from parakeet_lipsync.model_pool import DEFAULT_MODEL, ModelPool, language_models_from_env, model_for_language
+from parakeet_lipsync.postprocess import PostProcessSettings, postprocess
+from parakeet_lipsync.recognizer import PhonemeRecognizer
+
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".ogg")
+
+# ISO 639-3 ids of languages commonly dubbed into, recognized as folder
+# names without further setup. Others become known by giving them a model
+# (--lang-model) or a mapping table (mappings/<lang>.json).
+COMMON_LANGUAGE_IDS = frozenset((
+    "ara", "ben", "ces", "cmn", "dan", "deu", "ell", "eng", "fin", "fra", "heb", "hin", "hun", "ind",
+    "ita", "jpn", "kor", "nld", "nor", "pol", "por", "ron", "rus", "spa", "swe", "tha", "tur", "ukr",
+    "vie", "yue", "zho",
+))
+
+# Per-process recognizer, created once by the pool initializer and reused
+# for every file that worker handles.
+_worker_recognizer: Optional[PhonemeRecognizer] = None
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of processing a single file in a batch."""
+
+    audio_path: str
+    lang_id: Optional[str] = None  # Language recognized, when not the batch default
+    num_steps: int = 0
+    audio_duration: float = 0.0  # Length of the audio in seconds
+    elapsed: float = 0.0  # Wall-clock processing time in seconds
+    cache_hit: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the file was processed successfully."""
+        return self.error is None
+
+    @property
+    def realtime_factor(self) -> float:
+        """Return seconds of audio processed per second of wall time."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.audio_duration / self.elapsed
+
+
+def collect_audio_files(patterns: list[str]) -> list[str]:
+    """Expand directories and glob patterns into a sorted list of audio files.
+
+    Args:
+        patterns: Directories, glob patterns or plain file paths
+
+    Returns:
+        De-duplicated list of audio file paths
+    """
+    files: list[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for name in sorted(os.listdir(pattern)):
+                path = os.path.join(pattern, name)
+                if os.path.isfile(path) and name.lower().endswith(AUDIO_EXTENSIONS):
+                    files.append(path)
+        else:
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path) and path.lower().endswith(AUDIO_EXTENSIONS):
+                    files.append(path)
+
+    # Preserve order while dropping duplicates from overlapping patterns
+    return list(dict.fromkeys(files))
+
+
+def known_language_ids(language_models: Optional[dict[str, str]] = None) -> set[str]:
+    """Return the language ids a folder name is accepted as.
+
+    Args:
+        language_models: Language id -> model; its languages count as known
+    """
+    known = set(COMMON_LANGUAGE_IDS) | set(language_models or {})
+    known.update(path.stem.lower() for path in MAPPINGS_DIR.glob("*.json") if path.stem != DEFAULT_MAPPING)
+    return known
+
+
+def language_from_directory(audio_path: str, known: Collection[str]) -> Optional[str]:
+    """Return the language id a file's folder is named after, if any.
+
+    Only known ids count, so folders such as ``wav`` or ``out`` don't send
+    their files to a language's inventory or model.
+
+    Args:
+        audio_path: Audio file
+        known: Accepted language ids (see known_language_ids)
+    """
+    name = os.path.basename(os.path.dirname(os.path.abspath(audio_path))).lower()
+    return name if name in known else None
+
+
+def group_by_model(
+    files: list[str],
+    languages: dict[str, str],
+    language_models: dict[str, str],
+    default_model: str = DEFAULT_MODEL
+) -> dict[str, list[str]]:
+    """Split files by the model their language is recognized with.
+
+    Args:
+        files: Audio files
+        languages: File -> language id, for files not in the default language
+        language_models: Language id -> model
+        default_model: Model for languages without one of their own
+
+    Returns:
+        Model name -> files, in input order within each group
+    """
+    groups: dict[str, list[str]] = {}
+    for path in files:
+        model_name = model_for_language(languages.get(path), language_models, default_model)
+        groups.setdefault(model_name, []).append(path)
+    return groups
+
+
+def output_paths(audio_path: str) -> tuple[str, str]:
+    """Return the (.txt, .dat) output paths written next to an input file."""
+    base, _ = os.path.splitext(audio_path)
+    return f"{base}.txt", f"{base}.dat"
+
+
+def _init_worker(
+    torch_threads: int,
+    use_cache: bool,
+    cache_bytes: int,
+    decode_params: Optional[dict] = None,
+    keep_posteriors: bool = False,
+    model_name: str = DEFAULT_MODEL,
+    language_models: Optional[dict[str, str]] = None
+) -> None:
+    """Create the worker's recognizer and limit intra-op threads.
+
+    Every file a worker gets is recognized with ``model_name``, so the
+    worker's pool only ever holds that one model.
+    """
+    global _worker_recognizer
+
+    # Each worker is its own process; letting every one of them spawn a
+    # full set of torch threads oversubscribes the CPU.
+    import torch
+    torch.set_num_threads(torch_threads)
+
+    cache = RecognitionCache(max_bytes=cache_bytes) if use_cache else None
+    _worker_recognizer = PhonemeRecognizer(
+        model_name, cache=cache, use_cache=use_cache, decode_params=decode_params,
+        keep_posteriors=keep_posteriors, language_models=language_models, pool=ModelPool()
+    )
+
+
+def _process_file(
+    audio_path: str,
+    fps: int,
+    postprocess_settings: Optional[PostProcessSettings] = None,
+    lang_id: Optional[str] = None
+) -> BatchItemResult:
+    """Recognize one file in a worker and write its outputs."""
+    import librosa
+
+    item = BatchItemResult(audio_path=audio_path, lang_id=lang_id)
+    cache = _worker_recognizer.cache
+    hits_before = cache.hits if cache else 0
+    start = time.perf_counter()
+    try:
+        result = _worker_recognizer.recognize(audio_path, lang_id=lang_id)
+        item.cache_hit = cache is not None and cache.hits > hits_before
+        if postprocess_settings is not None:
+            result = postprocess(result, postprocess_settings)
+        txt_path, dat_path = output_paths(audio_path)
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(result.export_as_text())
+        with open(dat_path, "w", encoding="utf-8") as f:
+            result.write_moho_timesheet(f, fps)
+        item.num_steps = len(result)
+        item.audio_duration = librosa.get_duration(path=audio_path)
+    except Exception as e:
+        item.error = str(e)
+    item.elapsed = time.perf_counter() - start
+    return item
+
+
+def run_batch(
+    files: list[str],
+    fps: int = 24,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    cache_bytes: int = DEFAULT_MAX_BYTES,
+    postprocess_settings: Optional[PostProcessSettings] = None,
+    decode_params: Optional[dict] = None,
+    keep_posteriors: bool = False,
+    languages: Optional[dict[str, str]] = None,
+    language_models: Optional[dict[str, str]] = None
+) -> list[BatchItemResult]:
+    """Lipsync a list of audio files across a process pool.
+
+    Files are grouped by the model their language needs and each group
+    gets its own pool of workers, so a worker loads one model and keeps it
+    warm for every file it handles.
+
+    Args:
+        files: Audio files to process
+        fps: Frames per second for the Moho timesheet
+        workers: Number of worker processes (defaults to CPU count)
+        use_cache: Reuse recognition output for audio seen before
+        cache_bytes: Byte budget of the shared recognition cache
+        postprocess_settings: Clean-up applied before writing, or None for raw output
+        decode_params: Overrides of the recognizer's decoding parameters
+        keep_posteriors: Cache model posteriors for cheap re-decoding
+        languages: File -> language id for files not in the decoding
+            language (see language_from_directory)
+        language_models: Language id -> Allosaurus model (defaults to
+            PARAKEET_LANG_MODELS)
+
+    Returns:
+        One BatchItemResult per input file, in completion order
+    """
+    if not files:
+        return []
+
+    languages = languages or {}
+    language_models = language_models if language_models is not None else language_models_from_env()
+    default_lang = (decode_params or {}).get("lang_id")
+    default_model = model_for_language(default_lang, language_models)
+    groups = group_by_model(files, languages, language_models, default_model)
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(files)))
+
+    results: list[BatchItemResult] = []
+    batch_start = time.perf_counter()
+
+    # "spawn" keeps workers from inheriting the parent's torch thread pools
+    context = multiprocessing.get_context("spawn")
+    for model_name, group in groups.items():
+        group_workers = max(1, min(workers, len(group)))
+        torch_threads = max(1, cpu_count // group_workers)
+        if len(groups) > 1:
+            group_langs = sorted({languages.get(path) or default_lang or "ipa" for path in group})
+            print(f"Model '{model_name}' ({', '.join(group_langs)}): {len(group)} file(s)")
+
+        with ProcessPoolExecutor(
+                max_workers=group_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(torch_threads, use_cache, cache_bytes, decode_params, keep_posteriors,
+                          model_name, language_models)
+        ) as executor:
+            futures = [
+                executor.submit(_process_file, path, fps, postprocess_settings, languages.get(path))
+                for path in group
+            ]
+            for future in as_completed(futures):
+                item = future.result()
+                results.append(item)
+                i = len(results)
+                lang = f" [{item.lang_id}]" if item.lang_id else ""
+                if item.ok:
+                    print(
+                        f"[{i}/{len(files)}] {item.audio_path}{lang}: {item.num_steps} steps, "
+                        f"{item.audio_duration:.2f}s audio in {item.elapsed:.2f}s "
+                        f"({item.realtime_factor:.1f}x realtime)"
+                        + (" [cached]" if item.cache_hit else "")
+                    )
+                else:
+                    print(f"[{i}/{len(files)}] {item.audio_path}{lang}: FAILED ({item.error})")
+
+    _print_summary(results, time.perf_counter() - batch_start, workers)
+    return results
+
+
+def _print_summary(results: list[BatchItemResult], wall_time: float, workers: int) -> None:
+    """Print aggregate throughput for a finished batch."""
+    succeeded = [r for r in results if r.ok]
+    failed = len(results) - len(succeeded)
+    audio_total = sum(r.audio_duration for r in succeeded)
+    throughput = audio_total / wall_time if wall_time > 0 else 0.0
+
+    print()
+    print(f"Processed {len(succeeded)}/{len(results)} files with {workers} worker(s) in {wall_time:.2f}s")
+    print(f"Total audio: {audio_total:.2f}s ({throughput:.1f}x realtime overall)")
+    cache_hits = sum(1 for r in succeeded if r.cache_hit)
+    if cache_hits:
+        print(f"Recognition cache: {cache_hits} hit(s), {len(succeeded) - cache_hits} miss(es)")
+    if failed:
+        print(f"{failed} file(s) failed")
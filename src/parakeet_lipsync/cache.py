@@ -0,0 +1,352 @@
+"""Persistent on-disk caches for decoded audio, model posteriors and recognition output."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+import numpy as np
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+DEFAULT_AUDIO_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+DEFAULT_POSTERIOR_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+
+def default_cache_dir() -> Path:
+    """Return the root directory for Parakeet's caches.
+
+    Honours PARAKEET_CACHE_DIR, then XDG_CACHE_HOME, then ~/.cache.
+    """
+    override = os.environ.get("PARAKEET_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "parakeet_lipsync"
+
+
+class _FileCache:
+    """Directory of cache files with a byte budget and LRU eviction.
+
+    Each entry is one file named after its key, sharded into subdirectories
+    by the key's first two characters. Recency is tracked in memory and
+    persisted through file modification times, so the cache directory can
+    safely be shared between processes.
+    """
+
+    suffix = ""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock = threading.Lock()
+        # key -> entry size in bytes, ordered from least to most recently used
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._total_bytes: int = 0
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the file path for a cache key."""
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def _ensure_index(self) -> OrderedDict[str, int]:
+        """Scan the cache directory once to build the LRU index."""
+        if self._index is None:
+            entries = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob(f"*/*{self.suffix}"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.name[:-len(self.suffix)], stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _touch(self, key: str, size: int) -> None:
+        """Mark an entry as most recently used (call with the lock held)."""
+        index = self._ensure_index()
+        # Touch the file so recency survives across processes
+        try:
+            os.utime(self._entry_path(key))
+        except OSError:
+            pass
+        if key not in index:
+            index[key] = size
+            self._total_bytes += size
+        index.move_to_end(key)
+
+    def _forget(self, key: str) -> None:
+        """Drop an entry from the index (call with the lock held)."""
+        index = self._ensure_index()
+        if key in index:
+            self._total_bytes -= index.pop(key)
+
+    def _write(self, key: str, write: Callable[[BinaryIO], None]) -> None:
+        """Atomically write an entry and evict old ones (call with the lock held)."""
+        path = self._entry_path(key)
+        index = self._ensure_index()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so concurrent readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._forget(key)
+        index[key] = path.stat().st_size
+        self._total_bytes += index[key]
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under the byte budget."""
+        index = self._index
+        while self._total_bytes > self.max_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            index = self._ensure_index()
+            for key in list(index):
+                try:
+                    self._entry_path(key).unlink()
+                except OSError:
+                    pass
+            index.clear()
+            self._total_bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the total size of cached entries in bytes."""
+        with self._lock:
+            self._ensure_index()
+            return self._total_bytes
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        with self._lock:
+            return len(self._ensure_index())
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and usage figures."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class RecognitionCache(_FileCache):
+    """Content-addressed cache of raw IPA recognizer output.
+
+    Entries are keyed by a hash of the decoded audio and everything else that
+    influences the recognizer's output. Each entry is a small text file; the
+    least recently used entries are evicted once the cache exceeds its byte
+    budget.
+    """
+
+    suffix = ".txt"
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(Path(cache_dir) if cache_dir else default_cache_dir() / "recognition", max_bytes)
+
+    @staticmethod
+    def make_key(samples: np.ndarray, model_name: str, mapping_version: int, params: dict) -> str:
+        """Build a cache key from decoded audio and recognizer settings.
+
+        Args:
+            samples: Decoded audio samples as fed to the model
+            model_name: Name of the recognition model
+            mapping_version: Version of the IPA to mouth shape mapping table
+            params: Recognizer parameters that affect the output
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        h = hashlib.blake2b(digest_size=20)
+        samples = np.ascontiguousarray(samples)
+        h.update(str(samples.dtype).encode())
+        h.update(samples.data)
+        meta = {"model": model_name, "mapping_version": mapping_version, "params": params}
+        h.update(json.dumps(meta, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached IPA output for a key, or None on a miss."""
+        with self._lock:
+            try:
+                data = self._entry_path(key).read_text(encoding="utf-8")
+            except OSError:
+                self.misses += 1
+                self._forget(key)
+                return None
+
+            self.hits += 1
+            self._touch(key, len(data.encode("utf-8")))
+            return data
+
+    def put(self, key: str, ipa_output: str) -> None:
+        """Store IPA output under a key, evicting old entries if needed."""
+        data = ipa_output.encode("utf-8")
+        with self._lock:
+            self._write(key, lambda f: f.write(data))
+
+
+class PosteriorCache(_FileCache):
+    """Cache of the acoustic model's per-frame phone log probabilities.
+
+    Decoding (emission threshold, top-k, language inventory) only needs
+    these, so re-decoding cached audio with new parameters skips the model.
+    Entries are keyed by the audio and everything that shapes the model
+    input, but not by decoding parameters. Log probabilities are stored as
+    float16 in an uncompressed .npz, one array per recognition chunk.
+    """
+
+    suffix = ".npz"
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_POSTERIOR_MAX_BYTES):
+        super().__init__(Path(cache_dir) if cache_dir else default_cache_dir() / "posteriors", max_bytes)
+
+    @staticmethod
+    def make_key(samples: np.ndarray, model_name: str, chunking: dict) -> str:
+        """Build a cache key from decoded audio, the model and the chunking settings."""
+        h = hashlib.blake2b(digest_size=20)
+        samples = np.ascontiguousarray(samples)
+        h.update(str(samples.dtype).encode())
+        h.update(samples.data)
+        h.update(json.dumps({"model": model_name, "chunking": chunking}, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[list[np.ndarray]]:
+        """Return the cached float16 log probabilities per chunk, or None on a miss."""
+        with self._lock:
+            path = self._entry_path(key)
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    logprobs = np.split(data["logprobs"], np.cumsum(data["lengths"])[:-1])
+                size = path.stat().st_size
+            except (OSError, ValueError, KeyError):
+                self.misses += 1
+                self._forget(key)
+                return None
+            self.hits += 1
+            self._touch(key, size)
+            return logprobs
+
+    def put(self, key: str, logprobs: list[np.ndarray]) -> None:
+        """Store log probabilities (frames x phones) per chunk."""
+        lengths = np.array([len(lp) for lp in logprobs], dtype=np.int64)
+        stacked = np.concatenate(logprobs).astype(np.float16)
+        with self._lock:
+            self._write(key, lambda f: np.savez(f, logprobs=stacked, lengths=lengths))
+
+
+class AudioCache(_FileCache):
+    """Cache of decoded audio as memory-mappable .npy files.
+
+    For every source file two buffers can be stored: the mono decode at the
+    file's native sample rate (for playback and the waveform) and the 16 kHz
+    mono resample fed to the recognizer. Re-opening a cached file maps the
+    arrays instead of decoding again.
+
+    Entries are keyed by the file's absolute path, modification time, size
+    and a hash of its first and last megabyte, so an edited file never hits
+    a stale entry. Native buffers record their sample rate in the file name
+    (``<key>.native-44100.npy``).
+    """
+
+    suffix = ".npy"
+
+    _HASH_BYTES = 1024 * 1024
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_AUDIO_MAX_BYTES):
+        super().__init__(Path(cache_dir) if cache_dir else default_cache_dir() / "audio", max_bytes)
+
+    @classmethod
+    def make_key(cls, path: str | Path) -> str:
+        """Build a cache key identifying one version of an audio file.
+
+        Raises:
+            OSError: If the file can't be read
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        h = hashlib.blake2b(digest_size=20)
+        h.update(json.dumps([str(path), stat.st_size, stat.st_mtime_ns]).encode())
+        with open(path, "rb") as f:
+            h.update(f.read(cls._HASH_BYTES))
+            if stat.st_size > 2 * cls._HASH_BYTES:
+                f.seek(-cls._HASH_BYTES, os.SEEK_END)
+                h.update(f.read(cls._HASH_BYTES))
+        return h.hexdigest()
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        """Memory-map an entry and count the hit or miss (call with the lock held)."""
+        path = self._entry_path(key)
+        try:
+            samples = np.load(path, mmap_mode="r")
+            size = path.stat().st_size
+        except (OSError, ValueError):
+            self.misses += 1
+            self._forget(key)
+            return None
+        self.hits += 1
+        self._touch(key, size)
+        return samples
+
+    def _store(self, key: str, samples: np.ndarray) -> None:
+        """Write an array entry (call with the lock held)."""
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self._write(key, lambda f: np.save(f, samples, allow_pickle=False))
+
+    def get_native(self, audio_key: str) -> Optional[tuple[np.ndarray, int]]:
+        """Return the cached native-rate mono buffer and its sample rate."""
+        with self._lock:
+            for path in (self.cache_dir / audio_key[:2]).glob(f"{audio_key}.native-*{self.suffix}"):
+                key = path.name[:-len(self.suffix)]
+                try:
+                    sample_rate = int(key.rsplit("-", 1)[1])
+                except ValueError:
+                    continue
+                samples = self._load(key)
+                return (samples, sample_rate) if samples is not None else None
+            self.misses += 1
+            return None
+
+    def put_native(self, audio_key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Store the native-rate mono buffer for a file."""
+        with self._lock:
+            self._store(f"{audio_key}.native-{int(sample_rate)}", samples)
+
+    def get_model_rate(self, audio_key: str, sample_rate: int) -> Optional[np.ndarray]:
+        """Return the cached mono buffer resampled to a model's rate."""
+        with self._lock:
+            return self._load(f"{audio_key}.mono-{int(sample_rate)}")
+
+    def put_model_rate(self, audio_key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Store the mono buffer resampled to a model's rate."""
+        with self._lock:
+            self._store(f"{audio_key}.mono-{int(sample_rate)}", samples)
@@ -0,0 +1,184 @@
+"""Silence-based splitting of long audio into chunks for recognition."""
+
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+
+@dataclass
+class ChunkingConfig:
+    """Settings for splitting long audio into recognition chunks."""
+
+    max_chunk_seconds: float = 30.0  # Hard cap on chunk length
+    min_chunk_seconds: float = 5.0  # Don't cut at silences closer than this to the chunk start
+    min_silence_seconds: float = 0.25  # Shortest pause that counts as a cut point
+    silence_threshold_db: float = -40.0  # Frame energy below peak considered silent
+    overlap_seconds: float = 1.0  # Context shared by neighbours when a cut isn't at a silence
+    frame_seconds: float = 0.02  # VAD analysis frame length
+
+    def to_dict(self) -> dict:
+        """Return the settings as a plain dict (used in cache keys)."""
+        return asdict(self)
+
+
+@dataclass
+class AudioChunk:
+    """A span of audio to recognize and the part of it whose output is kept.
+
+    ``start``/``end`` are sample indices of the audio fed to the model.
+    ``keep_start``/``keep_end`` are the seam positions in seconds: phonemes
+    starting outside [keep_start, keep_end) belong to a neighbouring chunk.
+    """
+
+    start: int
+    end: int
+    keep_start: float
+    keep_end: float
+
+
+def energy_vad(samples: np.ndarray, sample_rate: int, config: ChunkingConfig) -> np.ndarray:
+    """Classify fixed-size frames as speech (True) or silence (False).
+
+    Args:
+        samples: Mono audio samples
+        sample_rate: Sample rate of the audio
+        config: Chunking settings
+
+    Returns:
+        Boolean array with one entry per analysis frame
+    """
+    frame_length = max(1, int(config.frame_seconds * sample_rate))
+    num_frames = len(samples) // frame_length
+    if num_frames == 0:
+        return np.zeros(0, dtype=bool)
+
+    frames = samples[:num_frames * frame_length].reshape(num_frames, frame_length)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_length
+    energy_db = 10.0 * np.log10(energy + 1e-12)
+    return energy_db > energy_db.max() + config.silence_threshold_db
+
+
+def _silence_cut_points(speech: np.ndarray, min_silence_frames: int) -> np.ndarray:
+    """Return frame indices at the centre of every sufficiently long silence."""
+    if len(speech) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Pad with speech on both sides so every silent run has a start and an end
+    padded = np.concatenate(([True], speech, [True])).astype(np.int8)
+    edges = np.diff(padded)
+    run_starts = np.flatnonzero(edges == -1)
+    run_ends = np.flatnonzero(edges == 1)
+    long_runs = (run_ends - run_starts) >= min_silence_frames
+    return (run_starts[long_runs] + run_ends[long_runs]) // 2
+
+
+def plan_chunks(samples: np.ndarray, sample_rate: int, config: ChunkingConfig) -> list[AudioChunk]:
+    """Split audio into chunks no longer than ``config.max_chunk_seconds``.
+
+    Cuts are placed in the middle of pauses where possible. When a stretch of
+    speech is longer than the cap, it is cut anyway and both neighbours get
+    ``overlap_seconds`` of extra context around the seam. Chunks that contain
+    no speech at all are dropped.
+
+    Args:
+        samples: Mono audio samples
+        sample_rate: Sample rate of the audio
+        config: Chunking settings
+
+    Returns:
+        Chunks in time order; their keep ranges tile the speech regions
+    """
+    total = len(samples)
+    if total == 0:
+        return []
+
+    frame_length = max(1, int(config.frame_seconds * sample_rate))
+    speech = energy_vad(samples, sample_rate, config)
+    min_silence_frames = max(1, int(round(config.min_silence_seconds / config.frame_seconds)))
+    cuts = _silence_cut_points(speech, min_silence_frames) * frame_length
+
+    max_len = int(config.max_chunk_seconds * sample_rate)
+    min_len = int(config.min_chunk_seconds * sample_rate)
+    overlap = int(config.overlap_seconds * sample_rate)
+
+    # Seam positions (in samples) and whether each seam sits in a pause
+    seams = [0]
+    clean = [True]
+    pos = 0
+    while total - pos > max_len:
+        lo = np.searchsorted(cuts, pos + min_len, side="right")
+        hi = np.searchsorted(cuts, pos + max_len, side="right")
+        if hi > lo:
+            pos = int(cuts[hi - 1])
+            clean.append(True)
+        else:
+            pos += max_len
+            clean.append(False)
+        seams.append(pos)
+    seams.append(total)
+    clean.append(True)
+
+    chunks: list[AudioChunk] = []
+    for i in range(len(seams) - 1):
+        keep_start, keep_end = seams[i], seams[i + 1]
+
+        first_frame = keep_start // frame_length
+        last_frame = -(-keep_end // frame_length)
+        if not speech[first_frame:last_frame].any():
+            continue
+
+        start = keep_start if clean[i] else max(0, keep_start - overlap)
+        end = keep_end if clean[i + 1] else min(total, keep_end + overlap)
+        chunks.append(AudioChunk(
+            start=start,
+            end=end,
+            keep_start=keep_start / sample_rate,
+            keep_end=keep_end / sample_rate
+        ))
+
+    return chunks
+
+
+def stitch_ipa_outputs(chunks: list[AudioChunk], outputs: list[str], sample_rate: int) -> str:
+    """Merge per-chunk IPA output into one timeline.
+
+    Timestamps are shifted by each chunk's offset. Phonemes are kept only if
+    they start inside their chunk's keep range, so overlapping context is not
+    emitted twice. A phoneme that both neighbours detected within one
+    analysis frame of the seam is emitted once.
+
+    Args:
+        chunks: Chunks in time order, as returned by plan_chunks
+        outputs: Allosaurus output for each chunk ("start duration phoneme" lines)
+        sample_rate: Sample rate the chunk sample indices refer to
+
+    Returns:
+        Combined output in the same line format
+    """
+    lines: list[str] = []
+    last_start = -1.0
+    last_phone = None
+    last_chunk = -1
+
+    for index, (chunk, output) in enumerate(zip(chunks, outputs)):
+        offset = chunk.start / sample_rate
+        for line in output.strip().split("\n"):
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            try:
+                start = float(parts[0]) + offset
+                duration = float(parts[1])
+            except ValueError:
+                continue
+            phone = parts[2]
+
+            if not (chunk.keep_start <= start < chunk.keep_end):
+                continue
+            if last_chunk != index and phone == last_phone and abs(start - last_start) < 0.03:
+                continue
+
+            lines.append(f"{start:.3f} {duration:.3f} {phone}")
+            last_start, last_phone, last_chunk = start, phone, index
+
+    return "\n".join(lines)
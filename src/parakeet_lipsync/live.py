@@ -0,0 +1,452 @@
+"""Live lipsync from a microphone or any other input stream."""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from parakeet_lipsync.models import PhonemeStep
+from parakeet_lipsync.recognizer import MODEL_SAMPLE_RATE, PhonemeRecognizer
+
+# Steps starting this close (in seconds) before the committed edge are repeats
+_TIME_EPSILON = 1e-3
+
+
+def _default_input_stream_factory(**kwargs) -> Any:
+    """Open a real sounddevice input stream."""
+    # Imported lazily so live mode can run on a synthetic source on
+    # machines without PortAudio
+    import sounddevice as sd
+    return sd.InputStream(**kwargs)
+
+
+class RingBuffer:
+    """Fixed-size buffer of the most recent mono samples.
+
+    One thread writes (the input stream callback), others read the newest
+    window. Positions are counted in samples since the buffer was created,
+    so readers can tell how much audio has arrived since they last looked.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._written: int = 0  # Total samples ever written
+        self._write_time: float = 0.0  # time.monotonic() of the last write
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def written(self) -> int:
+        """Return the total number of samples written so far."""
+        with self._cond:
+            return self._written
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest ones."""
+        samples = np.asarray(samples, dtype=np.float32)
+        count = len(samples)
+        samples = samples[-self.capacity:]
+        with self._cond:
+            # Samples that didn't fit still count towards the stream position
+            start = (self._written + count - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            self._data[:len(samples) - first] = samples[first:]
+            self._written += count
+            self._write_time = time.monotonic()
+            self._cond.notify_all()
+
+    def latest(self, num_samples: int) -> tuple[np.ndarray, int, float]:
+        """Return a copy of the newest samples.
+
+        Args:
+            num_samples: How many samples to return at most
+
+        Returns:
+            (samples, position of the sample after the last one, time the
+            last one was written)
+        """
+        with self._cond:
+            count = min(num_samples, self._written, self.capacity)
+            end = self._written % self.capacity
+            if count <= end:
+                samples = self._data[end - count:end].copy()
+            else:
+                samples = np.concatenate((self._data[end - count:], self._data[:end]))
+            return samples, self._written, self._write_time
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """Wait until ``position`` samples have been written.
+
+        Returns:
+            False on timeout or if the buffer was closed
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._written >= position or self._closed, timeout)
+            return self._written >= position and not self._closed
+
+    def close(self) -> None:
+        """Wake up any waiting readers for good."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class SyntheticInputStream:
+    """Stand-in for sounddevice.InputStream that plays back an array.
+
+    Takes the same keyword arguments and calls ``callback`` the same way,
+    one block at a time from its own thread, so live mode can be run and
+    timed without a microphone. With ``realtime`` the blocks arrive at the
+    pace a device would deliver them; otherwise as fast as they are taken.
+    """
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        samplerate: int,
+        channels: int = 1,
+        blocksize: int = 512,
+        dtype: str = "float32",
+        callback: Optional[Callable] = None,
+        realtime: bool = True,
+        loop: bool = False,
+        on_finished: Optional[Callable[[], None]] = None,
+        **kwargs
+    ):
+        """Create a stream over a sample array.
+
+        Args:
+            samples: Mono float samples to deliver
+            samplerate: Rate the samples are delivered at
+            channels: Channels per block (the samples are repeated)
+            blocksize: Frames per callback
+            dtype: Ignored; blocks are always float32
+            callback: Called as callback(indata, frames, time_info, status)
+            realtime: Pace blocks like a real device
+            loop: Start again from the beginning at the end
+            on_finished: Called once the samples run out (without ``loop``)
+        """
+        self.samples = np.asarray(samples, dtype=np.float32)
+        self.samplerate = samplerate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.callback = callback
+        self.realtime = realtime
+        self.loop = loop
+        self.on_finished = on_finished
+        self.latency = 0.0  # Seconds between capture and callback, like sounddevice
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while blocks are being delivered."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start delivering blocks."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="synthetic-input")
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Deliver blocks until stopped or out of samples."""
+        next_time = time.monotonic()
+        position = 0
+        while not self._stop.is_set():
+            if position >= len(self.samples):
+                if not self.loop or len(self.samples) == 0:
+                    break
+                position = 0
+            block = self.samples[position:position + self.blocksize]
+            position += len(block)
+            if self.realtime:
+                next_time += len(block) / self.samplerate
+                delay = next_time - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+            indata = np.repeat(block[:, None], self.channels, axis=1)
+            if self.callback:
+                self.callback(indata, len(block), None, None)
+            if not self.realtime:
+                time.sleep(0)  # Let the reader run between blocks
+        if not self._stop.is_set() and self.on_finished:
+            self.on_finished()
+
+    def stop(self) -> None:
+        """Stop delivering blocks."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self) -> None:
+        """Stop the stream."""
+        self.stop()
+
+
+def synthetic_input(
+    samples: np.ndarray,
+    sample_rate: int,
+    realtime: bool = True,
+    loop: bool = False,
+    on_finished: Optional[Callable[[], None]] = None
+) -> Callable[..., SyntheticInputStream]:
+    """Return a stream factory that feeds ``samples`` instead of a microphone.
+
+    Raises:
+        ValueError: (when the stream is opened) if the requested sample rate
+            isn't the rate of the samples
+    """
+    def factory(**kwargs) -> SyntheticInputStream:
+        if kwargs.get("samplerate", sample_rate) != sample_rate:
+            raise ValueError(f"Synthetic input is {sample_rate} Hz, not {kwargs['samplerate']} Hz")
+        kwargs["samplerate"] = sample_rate
+        return SyntheticInputStream(samples, realtime=realtime, loop=loop, on_finished=on_finished, **kwargs)
+    return factory
+
+
+@dataclass
+class LiveConfig:
+    """Settings for live recognition."""
+
+    window_seconds: float = 2.0  # Audio context given to the model per update
+    hop_seconds: float = 0.2  # How often a new window is recognized
+    commit_delay_seconds: float = 0.3  # Steps ending this close to the window end may still change
+    latency_budget_seconds: float = 0.5  # Target for the live shape's end-to-end latency
+    blocksize: int = 320  # Input frames per stream callback
+
+    def validate(self) -> None:
+        """Check the settings are consistent.
+
+        Raises:
+            ValueError: If windows wouldn't overlap enough to commit every step
+        """
+        if self.hop_seconds <= 0 or self.commit_delay_seconds < 0:
+            raise ValueError("hop_seconds must be positive and commit_delay_seconds non-negative")
+        if self.window_seconds <= self.hop_seconds + self.commit_delay_seconds:
+            raise ValueError("window_seconds must be longer than hop_seconds + commit_delay_seconds")
+
+
+@dataclass
+class LiveUpdate:
+    """What one recognized window produced."""
+
+    steps: list[PhonemeStep]  # Newly committed steps, in seconds since the stream started
+    shape: str  # Mouth shape at the live edge (provisional)
+    stream_time: float  # Seconds of audio captured when the window was taken
+    latency: float  # Seconds from capturing the window's last sample to this update
+
+
+class LatencyStats:
+    """Running record of live update latencies against a budget.
+
+    Measured latency covers the device's input latency plus everything
+    from the newest sample of a window arriving to its update being ready:
+    waiting for the worker, resampling and inference. On top of that, audio
+    waits for its block to fill and for the next hop, which ``fixed``
+    accounts for in the worst case.
+    """
+
+    def __init__(self, budget: float, fixed: float = 0.0, max_samples: int = 1000):
+        self.budget = budget
+        self.fixed = fixed
+        self._samples: deque = deque(maxlen=max_samples)
+        self.count: int = 0
+        self.over_budget: int = 0
+        self.dropped_windows: int = 0  # Hops skipped because the model fell behind
+
+    def record(self, latency: float) -> None:
+        """Record the measured latency of one update."""
+        self._samples.append(latency)
+        self.count += 1
+        if latency + self.fixed > self.budget:
+            self.over_budget += 1
+
+    def percentile(self, q: float) -> float:
+        """Return a percentile of the recent measured latencies, in seconds."""
+        return float(np.percentile(self._samples, q)) if self._samples else 0.0
+
+    def summary(self) -> str:
+        """Describe the latencies for display."""
+        if not self._samples:
+            return "no updates yet"
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return (
+            f"{self.count} updates, latency p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, "
+            f"max {max(self._samples) * 1000:.0f} ms; worst case with blocks and hop "
+            f"{(p95 + self.fixed) * 1000:.0f} ms of {self.budget * 1000:.0f} ms budget "
+            f"({self.over_budget} over, {self.dropped_windows} windows dropped)"
+        )
+
+
+class LiveLipsync:
+    """Recognizes mouth shapes from an input stream as it is captured.
+
+    The input stream's callback writes into a ring buffer. A worker thread
+    takes the newest ``window_seconds`` every ``hop_seconds`` and runs the
+    recognizer on it. Steps ending more than ``commit_delay_seconds``
+    before the window end are committed and reported once each; the newest
+    step gives the provisional shape at the live edge.
+
+    If inference takes longer than a hop, the worker skips straight to the
+    newest window instead of working through a backlog, so latency stays
+    bounded by one inference rather than growing.
+    """
+
+    def __init__(
+        self,
+        recognizer: PhonemeRecognizer,
+        on_update: Optional[Callable[[LiveUpdate], None]] = None,
+        config: Optional[LiveConfig] = None,
+        sample_rate: int = MODEL_SAMPLE_RATE,
+        stream_factory: Optional[Callable[..., Any]] = None,
+        device: Optional[Any] = None
+    ):
+        """Create a live recognizer (call ``start`` to begin capturing).
+
+        Args:
+            recognizer: Recognizer to run on each window
+            on_update: Called from the worker thread after every window
+            config: Live settings (defaults to LiveConfig())
+            sample_rate: Capture rate; windows are resampled to 16 kHz
+            stream_factory: Opens the input stream with sounddevice.InputStream
+                keyword arguments (defaults to the real device)
+            device: Input device passed to the stream
+
+        Raises:
+            ValueError: If the config is inconsistent
+        """
+        self.recognizer = recognizer
+        self.on_update = on_update
+        self.config = config if config is not None else LiveConfig()
+        self.config.validate()
+        self.sample_rate = sample_rate
+        self.device = device
+        self._stream_factory = stream_factory or _default_input_stream_factory
+
+        self.buffer = RingBuffer(int(self.config.window_seconds * sample_rate))
+        self.stats = LatencyStats(self.config.latency_budget_seconds)
+        self.error: Optional[Exception] = None
+
+        self._stream = None
+        self._input_latency: float = 0.0
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._committed_until: float = 0.0  # Stream time up to which steps are final
+
+    @property
+    def running(self) -> bool:
+        """Return True while capturing."""
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        """Open the input stream and start recognizing."""
+        if self.running:
+            return
+        # stop() closed the old buffer, and stream positions restart at zero
+        self.buffer = RingBuffer(self.buffer.capacity)
+        self.error = None
+        self._stop.clear()
+        self._committed_until = 0.0
+        self._stream = self._stream_factory(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=self.config.blocksize,
+            device=self.device,
+            callback=self._on_input
+        )
+        latency = getattr(self._stream, "latency", 0.0)
+        self._input_latency = float(latency) if isinstance(latency, (int, float)) else 0.0
+        self.stats.fixed = self.config.blocksize / self.sample_rate + self.config.hop_seconds
+        self._worker = threading.Thread(target=self._run, daemon=True, name="live-lipsync")
+        self._worker.start()
+        self._stream.start()
+
+    def stop(self) -> None:
+        """Stop capturing and wait for the worker to finish.
+
+        ``start`` can be called again afterwards; the new session starts
+        from an empty buffer at stream time zero.
+        """
+        self._stop.set()
+        self.buffer.close()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        if self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join()
+        self._worker = None
+
+    def _on_input(self, indata, frames, time_info, status) -> None:
+        """Input stream callback: keep the samples."""
+        if status:
+            print(f"Live input: {status}")
+        samples = indata[:, 0] if indata.ndim > 1 and indata.shape[1] == 1 else indata
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        self.buffer.write(samples)
+
+    def _run(self) -> None:
+        """Recognize the newest window every hop until stopped."""
+        hop = max(1, int(self.config.hop_seconds * self.sample_rate))
+        window = self.buffer.capacity
+        next_position = hop
+        while not self._stop.is_set():
+            if not self.buffer.wait_for(next_position, timeout=0.1):
+                continue
+            samples, end, captured_at = self.buffer.latest(window)
+            self.stats.dropped_windows += max(0, (end - next_position) // hop)
+            next_position = end + hop
+            try:
+                update = self._process(samples, end, captured_at)
+            except Exception as e:
+                self.error = e
+                print(f"Live recognition error: {e}")
+                break
+            if self.on_update:
+                try:
+                    self.on_update(update)
+                except Exception as e:
+                    print(f"Error in live update callback: {e}")
+
+    def _process(self, samples: np.ndarray, end: int, captured_at: float) -> LiveUpdate:
+        """Recognize one window and work out which steps are final."""
+        window_start = (end - len(samples)) / self.sample_rate
+        window_end = end / self.sample_rate
+        if self.sample_rate != MODEL_SAMPLE_RATE:
+            samples = PhonemeRecognizer._to_model_rate(samples, self.sample_rate)
+        result = self.recognizer.recognize_window(samples)
+
+        stable_end = window_end - self.config.commit_delay_seconds
+        steps: list[PhonemeStep] = []
+        pending_start: Optional[float] = None
+        latest: Optional[PhonemeStep] = None
+        for step in sorted(result, key=lambda s: s.start_time):
+            step = PhonemeStep(window_start + step.start_time, step.duration, step.mouth_shape)
+            latest = step
+            if step.start_time < self._committed_until - _TIME_EPSILON or pending_start is not None:
+                continue
+            if step.end_time <= stable_end:
+                steps.append(step)
+            else:
+                pending_start = step.start_time  # Not final yet; the next window commits it
+        self._committed_until = max(
+            self._committed_until, pending_start if pending_start is not None else stable_end
+        )
+
+        # Hold the newest shape briefly, like a committed step would be held
+        shape = "rest"
+        if latest is not None and latest.end_time >= window_end - self.config.commit_delay_seconds:
+            shape = latest.mouth_shape
+
+        latency = time.monotonic() - captured_at + self._input_latency
+        self.stats.record(latency)
+        return LiveUpdate(steps, shape, window_end, latency)
@@ -1,10 +1,264 @@
 """Entry point for Parakeet Lipsync application."""
 
-from parakeet_lipsync.app import ParakeetApp
+import argparse
+import sys
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="parakeet",
+        description="Automatic lip-sync for 2D animation. Runs the GUI when no command is given."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="Lipsync audio files headlessly",
+        description="Write .txt and Moho .dat files next to every matched audio file."
+    )
+    batch.add_argument("inputs", nargs="+", help="Directories or glob patterns of audio files")
+    batch.add_argument("--fps", type=int, default=24, help="Frames per second for Moho export (default: 24)")
+    batch.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    batch.add_argument("--no-cache", action="store_true", help="Always run the model, ignoring cached results")
+    batch.add_argument("--cache-size", type=int, default=256, help="Recognition cache budget in MB (default: 256)")
+
+    decoding = batch.add_argument_group("decoding")
+    decoding.add_argument("--emit", type=float, default=None,
+                          help="Phone emission threshold; higher values emit more phones (default: 1.0)")
+    decoding.add_argument("--lang", default=None, help="Restrict phones to a language's inventory (default: ipa)")
+    decoding.add_argument("--lang-from-dir", action="store_true",
+                          help="Files in a folder named after a language id (eng/, fra/, ...) use that language; "
+                               "ids beyond the common ones need a --lang-model")
+    decoding.add_argument("--lang-model", action="append", default=[], metavar="LANG=MODEL",
+                          help="Recognize a language with its own Allosaurus model; repeatable "
+                               "(default: $PARAKEET_LANG_MODELS)")
+    decoding.add_argument("--keep-posteriors", action="store_true",
+                          help="Cache model posteriors so re-running with other decoding settings skips the model")
+
+    cleanup = batch.add_argument_group("clean-up")
+    cleanup.add_argument("--clean", action="store_true", help="Clean up mouth shapes before writing")
+    cleanup.add_argument("--min-hold", type=int, default=2, help="Minimum frames a shape is held (default: 2)")
+    cleanup.add_argument("--min-phone-ms", type=int, default=0, help="Drop phones shorter than this (default: 0)")
+    cleanup.add_argument("--max-hold-gap-ms", type=int, default=200,
+                         help="Gaps up to this long extend the previous shape; longer ones become rest (default: 200)")
+    cleanup.add_argument("--no-fill-gaps", action="store_true", help="Leave gaps between shapes")
+    cleanup.add_argument("--no-merge", action="store_true", help="Keep repeated neighbouring shapes")
+
+    cache = subparsers.add_parser(
+        "cache",
+        help="Inspect or purge the on-disk caches",
+        description="Show usage of the decoded-audio, posterior and recognition caches, or empty them."
+    )
+    cache.add_argument("action", nargs="?", choices=("info", "purge"), default="info",
+                       help="What to do (default: info)")
+    which = cache.add_mutually_exclusive_group()
+    which.add_argument("--audio", action="store_true", help="Only the decoded-audio cache")
+    which.add_argument("--posteriors", action="store_true", help="Only the model posterior cache")
+    which.add_argument("--recognition", action="store_true", help="Only the recognition cache")
+
+    live = subparsers.add_parser(
+        "live",
+        help="Print mouth shapes from the microphone as they are recognized",
+        description="Recognize mouth shapes from live input and report the latency. "
+                    "Stop with Ctrl+C."
+    )
+    live.add_argument("--input", metavar="FILE",
+                      help="Feed an audio file in real time instead of the microphone")
+    live.add_argument("--device", default=None, help="Input device name or index")
+    live.add_argument("--window-ms", type=int, default=2000, help="Audio given to the model per update (default: 2000)")
+    live.add_argument("--hop-ms", type=int, default=200, help="Time between updates (default: 200)")
+    live.add_argument("--commit-delay-ms", type=int, default=300,
+                      help="Steps this close to the live edge are held back until final (default: 300)")
+    live.add_argument("--budget-ms", type=int, default=500, help="Latency budget to report against (default: 500)")
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="Keep the model loaded and recognize for other parakeet processes",
+        description="Run a local recognition server. Other parakeet commands and the GUI use it "
+                    "instead of loading the model themselves when PARAKEET_SERVER is set to its "
+                    "host:port, or to 'on' for the default address."
+    )
+    serve.add_argument("--address", default=None, help="host:port to listen on (default: $PARAKEET_SERVER or 127.0.0.1:8756)")
+    serve.add_argument("--model", default="latest", help="Allosaurus model to serve (default: latest)")
+    serve.add_argument("--instances", type=int, default=1, help="Model instances kept loaded (default: 1)")
+    serve.add_argument("--max-batch", type=int, default=8, help="Most chunks run through the model at once (default: 8)")
+    serve.add_argument("--max-wait-ms", type=float, default=10,
+                       help="How long a batch waits for more requests (default: 10)")
+
+    return parser
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _run_cache(args: argparse.Namespace) -> int:
+    """Run the cache inspection/purge command."""
+    from parakeet_lipsync.cache import AudioCache, PosteriorCache, RecognitionCache
+
+    everything = not (args.audio or args.posteriors or args.recognition)
+    caches = []
+    if everything or args.audio:
+        caches.append(("Decoded audio", AudioCache()))
+    if everything or args.posteriors:
+        caches.append(("Posteriors", PosteriorCache()))
+    if everything or args.recognition:
+        caches.append(("Recognition", RecognitionCache()))
+
+    for name, cache in caches:
+        if args.action == "purge":
+            entries, size = len(cache), cache.size_bytes
+            cache.clear()
+            print(f"{name}: removed {entries} entries ({_format_bytes(size)})")
+        else:
+            print(f"{name}: {len(cache)} entries, "
+                  f"{_format_bytes(cache.size_bytes)} of {_format_bytes(cache.max_bytes)} in {cache.cache_dir}")
+    return 0
+
+
+def _run_live(args: argparse.Namespace) -> int:
+    """Run live recognition from the microphone or a file."""
+    import threading
+
+    import numpy as np
+
+    from parakeet_lipsync.live import LiveConfig, LiveLipsync, synthetic_input
+    from parakeet_lipsync.recognizer import MODEL_SAMPLE_RATE, PhonemeRecognizer
+
+    config = LiveConfig(
+        window_seconds=args.window_ms / 1000.0,
+        hop_seconds=args.hop_ms / 1000.0,
+        commit_delay_seconds=args.commit_delay_ms / 1000.0,
+        latency_budget_seconds=args.budget_ms / 1000.0
+    )
+    finished = threading.Event()
+    stream_factory = None
+    if args.input:
+        import librosa
+
+        samples, _ = librosa.load(args.input, sr=MODEL_SAMPLE_RATE, mono=True)
+        stream_factory = synthetic_input(samples, MODEL_SAMPLE_RATE, on_finished=finished.set)
+
+    device = int(args.device) if args.device and args.device.isdigit() else args.device
+    recognizer = PhonemeRecognizer(use_cache=False)
+    recognizer.recognize_window(np.zeros(MODEL_SAMPLE_RATE // 10, dtype=np.float32))  # Load and warm up the model
+
+    def on_update(update):
+        for step in update.steps:
+            print(step.to_string())
+
+    try:
+        live = LiveLipsync(recognizer, on_update, config, stream_factory=stream_factory, device=device)
+    except ValueError as e:
+        print(f"Invalid live settings: {e}")
+        return 2
+
+    live.start()
+    print("Listening... (Ctrl+C to stop)")
+    try:
+        while not finished.wait(0.2) and live.error is None:
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        live.stop()
+    print(f"Live lipsync: {live.stats.summary()}")
+    return 1 if live.error is not None else 0
+
+
+def _run_serve(args: argparse.Namespace) -> int:
+    """Run the recognition server."""
+    from parakeet_lipsync.remote import DEFAULT_SERVER_ADDRESS, server_address
+    from parakeet_lipsync.server import serve
+
+    address = args.address or server_address() or DEFAULT_SERVER_ADDRESS
+    try:
+        serve(address, args.model, args.instances, args.max_batch, args.max_wait_ms / 1000.0)
+    except (OSError, ValueError) as e:
+        print(f"Could not start server on {address}: {e}")
+        return 1
+    return 0
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    """Run the headless batch command."""
+    # Imported here so the GUI path never pays for it and vice versa
+    from parakeet_lipsync.batch import collect_audio_files, known_language_ids, language_from_directory, run_batch
+    from parakeet_lipsync.model_pool import language_models_from_env, parse_language_models
+    from parakeet_lipsync.postprocess import PostProcessSettings
+
+    files = collect_audio_files(args.inputs)
+    if not files:
+        print("No audio files found.")
+        return 1
+
+    postprocess_settings = None
+    if args.clean:
+        postprocess_settings = PostProcessSettings(
+            fps=args.fps,
+            min_phone_seconds=args.min_phone_ms / 1000.0,
+            fill_gaps=not args.no_fill_gaps,
+            max_hold_gap_seconds=args.max_hold_gap_ms / 1000.0,
+            merge_equal=not args.no_merge,
+            min_hold_frames=args.min_hold
+        )
+
+    decode_params = {}
+    if args.emit is not None:
+        decode_params["emit"] = args.emit
+    if args.lang:
+        decode_params["lang_id"] = args.lang
+
+    try:
+        language_models = {**language_models_from_env(), **parse_language_models(args.lang_model)}
+    except ValueError as e:
+        print(f"Invalid --lang-model: {e}")
+        return 2
+
+    languages = {}
+    if args.lang_from_dir:
+        known = known_language_ids(language_models)
+        for path in files:
+            lang = language_from_directory(path, known)
+            if lang:
+                languages[path] = lang
+
+    results = run_batch(
+        files,
+        fps=args.fps,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        cache_bytes=args.cache_size * 1024 * 1024,
+        postprocess_settings=postprocess_settings,
+        decode_params=decode_params,
+        keep_posteriors=args.keep_posteriors,
+        languages=languages,
+        language_models=language_models
+    )
+    return 0 if all(r.ok for r in results) else 1
+
+
+def main(argv: list[str] | None = None):
     """Run the Parakeet Lipsync application."""
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "batch":
+        sys.exit(_run_batch(args))
+    if args.command == "cache":
+        sys.exit(_run_cache(args))
+    if args.command == "live":
+        sys.exit(_run_live(args))
+    if args.command == "serve":
+        sys.exit(_run_serve(args))
+
+    # DearPyGui and sounddevice are only imported when the GUI is requested
+    from parakeet_lipsync.app import ParakeetApp
+
     app = ParakeetApp()
     app.run()
 
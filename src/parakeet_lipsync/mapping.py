@@ -0,0 +1,291 @@
+"""IPA to mouth shape mapping tables loaded from JSON.
+
+The default table ships as ``mappings/default.json``. A table named after
+an Allosaurus language id (``mappings/eng.json``) and a rig's own
+``mapping.json`` are layered on top of it, each overriding entries of the
+ones before. A table file is either a flat ``{"phone": "shape"}`` object
+or ``{"map": {...}, "fallback": "rest"}``.
+
+Tables are compiled once into integer codes. Recognizer output is split
+into phone tokens by longest match, so diphthongs and affricates emitted
+as separate phones (``a`` then ``ɪ``) still find their entry, and length
+marks and diacritics are stripped before lookup; anything else without an
+entry is reported as unknown. Mapping a whole result is then one array
+take from phone codes to shape codes.
+"""
+
+import functools
+import json
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from parakeet_lipsync.models import RecognitionResult
+
+
+MAPPINGS_DIR = Path(__file__).parent / "mappings"
+DEFAULT_MAPPING = "default"
+RIG_MAPPING_FILE = "mapping.json"
+FALLBACK_SHAPE = "rest"
+
+# Consecutive phones further apart than this (in seconds) are never joined into one token
+MERGE_MAX_GAP = 0.1
+
+# Unicode categories of the spacing modifiers that mark length, aspiration,
+# palatalization, rhoticity, etc. (modifier letters and modifier symbols)
+_MODIFIER_CATEGORIES = frozenset(("Lm", "Sk"))
+
+
+def strip_diacritics(phone: str) -> str:
+    """Remove combining diacritics and modifier letters from an IPA phone."""
+    decomposed = unicodedata.normalize("NFD", phone)
+    base = "".join(
+        c for c in decomposed
+        if not unicodedata.combining(c) and unicodedata.category(c) not in _MODIFIER_CATEGORIES
+    )
+    return unicodedata.normalize("NFC", base)
+
+
+def load_mapping_file(path: str | Path) -> tuple[dict[str, str], Optional[str]]:
+    """Read a mapping table file.
+
+    Returns:
+        (phone -> mouth shape entries, fallback shape or None)
+
+    Raises:
+        ValueError: If the file isn't a valid mapping table
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read mapping table {path}: {e}") from e
+
+    fallback = None
+    if isinstance(data, dict) and isinstance(data.get("map"), dict):
+        fallback = data.get("fallback")
+        data = data["map"]
+    if not isinstance(data, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in data.items()):
+        raise ValueError(f"Mapping table {path} must map phone strings to mouth shape strings")
+    return data, fallback
+
+
+@dataclass
+class PhoneSequence:
+    """Recognized phone tokens, stored column-wise like RecognitionResult."""
+
+    starts: np.ndarray  # float32 seconds
+    durations: np.ndarray  # float32 seconds
+    codes: np.ndarray  # uint16 indices into phone_table
+    phone_table: list[str]  # Token strings as emitted, joined where merged
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class MappingTable:
+    """A compiled IPA to mouth shape table."""
+
+    def __init__(self, mapping: dict[str, str], fallback: str = FALLBACK_SHAPE, name: str = DEFAULT_MAPPING):
+        """Compile a table.
+
+        Args:
+            mapping: Phone (one or more IPA characters) -> mouth shape
+            fallback: Shape for phones with no entry
+            name: Description used in reports
+        """
+        self.name = name
+        self.fallback = fallback
+        self.mapping = dict(mapping)
+
+        self.shape_table: list[str] = list(dict.fromkeys([fallback, *mapping.values()]))
+        shape_codes = {shape: i for i, shape in enumerate(self.shape_table)}
+        # Exact entries win over entries that only match once stripped
+        self._tokens: dict[str, int] = {}
+        for phone, shape in mapping.items():
+            stripped = strip_diacritics(phone)
+            if stripped and stripped not in self._tokens:
+                self._tokens[stripped] = shape_codes[shape]
+        for phone, shape in mapping.items():
+            self._tokens[phone] = shape_codes[shape]
+        self._max_token_chars = max((len(token) for token in self._tokens), default=1)
+
+        self._phone_codes: dict[str, Optional[int]] = {}  # Memo of lookup() per token
+
+    def lookup(self, phone: str) -> Optional[int]:
+        """Return the shape code of a phone token, or None if it has no entry.
+
+        Tries the token as written, then without diacritics and length
+        marks. A token that only partly matches an entry (``ts`` against
+        ``t``) counts as unknown rather than borrowing that entry's shape.
+        """
+        code = self._phone_codes.get(phone, -1)
+        if code != -1:
+            return code
+        code = self._tokens.get(phone)
+        if code is None:
+            code = self._tokens.get(strip_diacritics(phone))
+        self._phone_codes[phone] = code
+        return code
+
+    def segment(self, ipa_output: str) -> PhoneSequence:
+        """Parse recognizer output into phone tokens.
+
+        Runs of consecutive phones that together spell a table entry (such
+        as ``a`` + ``ɪ``) become one token spanning all of them, preferring
+        the longest run.
+
+        Args:
+            ipa_output: "start duration phoneme" lines
+
+        Returns:
+            The phone tokens in output order
+        """
+        starts: list[float] = []
+        durations: list[float] = []
+        phones: list[str] = []
+        for line in ipa_output.strip().split("\n"):
+            parts = line.split()
+            if len(parts) >= 3:
+                try:
+                    start, duration = float(parts[0]), float(parts[1])
+                except ValueError:
+                    continue
+                starts.append(start)
+                durations.append(duration)
+                phones.append(parts[2])
+
+        token_starts: list[float] = []
+        token_durations: list[float] = []
+        token_codes: list[int] = []
+        phone_table: list[str] = []
+        phone_codes: dict[str, int] = {}
+        i = 0
+        while i < len(phones):
+            # Extend the run while the phones touch and the spelling stays short enough
+            end = i + 1
+            chars = len(strip_diacritics(phones[i]))
+            while (end < len(phones) and starts[end] - (starts[end - 1] + durations[end - 1]) <= MERGE_MAX_GAP
+                   and chars + len(strip_diacritics(phones[end])) <= self._max_token_chars):
+                chars += len(strip_diacritics(phones[end]))
+                end += 1
+            while end > i + 1:
+                joined = "".join(phones[i:end])
+                if joined in self._tokens or strip_diacritics(joined) in self._tokens:
+                    break
+                end -= 1
+
+            token = "".join(phones[i:end])
+            code = phone_codes.get(token)
+            if code is None:
+                code = phone_codes[token] = len(phone_table)
+                phone_table.append(token)
+            token_starts.append(starts[i])
+            token_durations.append(starts[end - 1] + durations[end - 1] - starts[i])
+            token_codes.append(code)
+            i = end
+
+        return PhoneSequence(
+            np.array(token_starts, dtype=np.float32),
+            np.array(token_durations, dtype=np.float32),
+            np.array(token_codes, dtype=np.uint16),
+            phone_table
+        )
+
+    def compile(self, phone_table: list[str]) -> tuple[np.ndarray, list[int]]:
+        """Build the phone code -> shape code array for a phone table.
+
+        Returns:
+            (lookup array, phone codes that have no entry)
+        """
+        lookup = np.zeros(len(phone_table), dtype=np.uint8)
+        unknown = []
+        for i, phone in enumerate(phone_table):
+            code = self.lookup(phone)
+            if code is None:
+                unknown.append(i)
+                code = 0  # The fallback shape
+            lookup[i] = code
+        return lookup, unknown
+
+    def apply(self, phones: PhoneSequence) -> RecognitionResult:
+        """Map phone tokens to mouth shapes; unmapped tokens get the fallback.
+
+        Returns:
+            RecognitionResult keeping ``phones`` so it can be remapped
+        """
+        lookup, _ = self.compile(phones.phone_table)
+        result = RecognitionResult.from_arrays(
+            phones.starts, phones.durations, lookup[phones.codes], self.shape_table, copy=False
+        )
+        result.phones = phones
+        return result
+
+    def to_result(self, ipa_output: str) -> RecognitionResult:
+        """Parse recognizer output and map it to mouth shapes."""
+        return self.apply(self.segment(ipa_output))
+
+    def unknown_phones(self, phones: PhoneSequence) -> Counter:
+        """Count the occurrences of every token with no entry."""
+        _, unknown = self.compile(phones.phone_table)
+        if not unknown:
+            return Counter()
+        counts = np.bincount(phones.codes, minlength=len(phones.phone_table))
+        return Counter({phones.phone_table[i]: int(counts[i]) for i in unknown if counts[i]})
+
+    def unknown_report(self, phones: PhoneSequence) -> str:
+        """Describe the unmapped tokens of a sequence, or "" if there are none."""
+        unknown = self.unknown_phones(phones)
+        if not unknown:
+            return ""
+        listed = ", ".join(f"{phone} x{count}" for phone, count in unknown.most_common())
+        return f"Phones with no entry in mapping '{self.name}' (shown as {self.fallback}): {listed}"
+
+
+def _modified_time(path: Optional[Path]) -> Optional[int]:
+    """Return a file's modification time in ns, or None if it doesn't exist."""
+    try:
+        return path.stat().st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=16)
+def _load_mapping(lang_id: str, rig_mapping: Optional[str], modified: tuple) -> MappingTable:
+    """Load and compile the layered tables.
+
+    Cached per combination; ``modified`` holds the files' modification
+    times so that an edited table is read again.
+    """
+    mapping, fallback = load_mapping_file(MAPPINGS_DIR / f"{DEFAULT_MAPPING}.json")
+    layers = [DEFAULT_MAPPING]
+    language = MAPPINGS_DIR / f"{lang_id}.json" if lang_id != DEFAULT_MAPPING else None
+    for path, label in ((language, lang_id), (rig_mapping, "rig")):
+        if path and Path(path).is_file():
+            entries, layer_fallback = load_mapping_file(path)
+            mapping.update(entries)
+            fallback = layer_fallback or fallback
+            layers.append(label)
+    return MappingTable(mapping, fallback or FALLBACK_SHAPE, "+".join(layers))
+
+
+def load_mapping(lang_id: str = "ipa", rig_directory: Optional[str | Path] = None) -> MappingTable:
+    """Return the compiled table for a language and rig.
+
+    Args:
+        lang_id: Allosaurus language id; ``mappings/<lang_id>.json`` is
+            layered over the default table if it exists
+        rig_directory: Rig whose ``mapping.json``, if any, is layered on top
+
+    Raises:
+        ValueError: If a table file is invalid
+    """
+    rig_mapping = Path(rig_directory) / RIG_MAPPING_FILE if rig_directory else None
+    modified = tuple(
+        _modified_time(path)
+        for path in (MAPPINGS_DIR / f"{DEFAULT_MAPPING}.json", MAPPINGS_DIR / f"{lang_id}.json", rig_mapping)
+    )
+    return _load_mapping(lang_id, str(rig_mapping) if rig_mapping else None, modified)
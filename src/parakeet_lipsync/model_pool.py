@@ -0,0 +1,185 @@
+"""Loaded Allosaurus models shared between recognizers.
+
+Allosaurus language ids select a phone inventory that is applied while
+decoding, so every language can run on the same acoustic model. Languages
+can also be given a model of their own (for example ``eng=eng2102``); the
+pool keeps recently used models loaded and unloads the least recently used
+ones once their combined size passes a memory cap.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+DEFAULT_MODEL = "latest"
+DEFAULT_POOL_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+
+# Environment variable with language -> model entries, "eng=eng2102,deu=latest"
+LANG_MODELS_ENV = "PARAKEET_LANG_MODELS"
+
+# Environment variable overriding the shared pool's cap, in MB
+POOL_MEMORY_ENV = "PARAKEET_MODEL_MEMORY_MB"
+
+
+def parse_language_models(entries: list[str]) -> dict[str, str]:
+    """Parse "lang=model" entries.
+
+    Raises:
+        ValueError: If an entry has no "=" or an empty side
+    """
+    language_models = {}
+    for entry in entries:
+        lang, _, model = entry.partition("=")
+        lang, model = lang.strip().lower(), model.strip()
+        if not lang or not model:
+            raise ValueError(f"Expected lang=model, got {entry!r}")
+        language_models[lang] = model
+    return language_models
+
+
+def language_models_from_env() -> dict[str, str]:
+    """Return the language -> model table set in PARAKEET_LANG_MODELS."""
+    value = os.environ.get(LANG_MODELS_ENV, "").strip()
+    if not value:
+        return {}
+    try:
+        return parse_language_models([entry for entry in value.split(",") if entry.strip()])
+    except ValueError as e:
+        print(f"Ignoring {LANG_MODELS_ENV}: {e}")
+        return {}
+
+
+def model_for_language(
+    lang_id: Optional[str],
+    language_models: dict[str, str],
+    default: str = DEFAULT_MODEL
+) -> str:
+    """Return the model a language is recognized with."""
+    if not lang_id:
+        return default
+    return language_models.get(lang_id.lower(), default)
+
+
+def _load_allosaurus(model_name: str):
+    """Load an Allosaurus recognizer."""
+    # Imported here so processes served by a recognition server never load torch
+    from allosaurus.app import read_recognizer
+
+    print(f"Loading Allosaurus model '{model_name}'...")
+    model = read_recognizer(model_name)
+    print("Model loaded.")
+    return model
+
+
+def model_size_bytes(model) -> int:
+    """Estimate the memory held by a loaded model's acoustic network."""
+    try:
+        tensors = [*model.am.parameters(), *model.am.buffers()]
+    except AttributeError:
+        return 0
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+class ModelPool:
+    """Loaded models by name, least recently used first out.
+
+    The model just requested is never unloaded, so a single model larger
+    than the cap still works. Recognizers holding a model keep using it
+    after it leaves the pool; it is freed once they let go.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_POOL_MAX_BYTES,
+        loader: Callable[[str], object] = _load_allosaurus
+    ):
+        """Create an empty pool.
+
+        Args:
+            max_bytes: Combined size of the loaded models to stay under
+            loader: Loads a model by name
+        """
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.loads = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._models: OrderedDict[str, tuple[object, int]] = OrderedDict()  # Name -> (model, size)
+        self._loading: dict[str, threading.Lock] = {}
+
+    def get(self, model_name: str):
+        """Return a loaded model, loading it on first use.
+
+        Concurrent requests for the same model wait for one load; different
+        models load in parallel.
+        """
+        with self._lock:
+            entry = self._models.get(model_name)
+            if entry is not None:
+                self._models.move_to_end(model_name)
+                return entry[0]
+            load_lock = self._loading.setdefault(model_name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(model_name)
+                if entry is not None:
+                    self._models.move_to_end(model_name)
+                    return entry[0]
+
+            model = self.loader(model_name)
+            size = model_size_bytes(model)
+            with self._lock:
+                self._models[model_name] = (model, size)
+                self.loads += 1
+                self._evict(keep=model_name)
+                self._loading.pop(model_name, None)
+            return model
+
+    def _evict(self, keep: str) -> None:
+        """Unload least recently used models until the pool fits its cap."""
+        for name in list(self._models):
+            if self.size_bytes <= self.max_bytes:
+                return
+            if name != keep:
+                del self._models[name]
+                self.evictions += 1
+                print(f"Unloaded Allosaurus model '{name}' to stay under the model memory cap")
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the combined size of the loaded models."""
+        return sum(size for _, size in self._models.values())
+
+    def loaded(self) -> list[str]:
+        """Return the loaded model names, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self) -> None:
+        """Unload every model."""
+        with self._lock:
+            self._models.clear()
+
+
+_default_pool: Optional[ModelPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> ModelPool:
+    """Return the pool shared by the recognizers of this process."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            max_bytes = DEFAULT_POOL_MAX_BYTES
+            value = os.environ.get(POOL_MEMORY_ENV, "").strip()
+            if value:
+                try:
+                    max_bytes = int(float(value) * 1024 * 1024)
+                except ValueError:
+                    print(f"Ignoring {POOL_MEMORY_ENV}: expected a number of MB, got {value!r}")
+            _default_pool = ModelPool(max_bytes)
+        return _default_pool
@@ -1,10 +1,30 @@
 """Data models for Parakeet Lipsync."""
 
-from dataclasses import dataclass, field
-from typing import Iterator
+import io
+import os
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
 
+import numpy as np
 
-@dataclass
+
+# Binary result format: header, UTF-8 shape table, then packed columns.
+# Header fields: magic, version, flags, step count, longest step duration,
+# shape table size in bytes.
+BINARY_EXTENSION = ".pkr"
+BINARY_MAGIC = b"PKRS"
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<4sHHQfI")
+_BINARY_FLAG_SORTED = 0x1
+_BINARY_ALIGN = 8
+
+# Times closer than this (in seconds) are considered equal when snapping to frames
+_TIME_EPSILON = 1e-3
+
+
+@dataclass(frozen=True)
 class PhonemeStep:
     """Represents a single phoneme/mouth shape with timing information."""
 
@@ -44,56 +64,280 @@ class PhonemeStep:
         return None
 
 
-@dataclass
 class RecognitionResult:
-    """Contains the complete lip-sync recognition result."""
+    """Contains the complete lip-sync recognition result.
+
+    Steps are stored column-wise: NumPy arrays of start times, durations and
+    small integer shape codes that index into an interned ``shape_table``.
+    Iterating or indexing still yields PhonemeStep objects.
+    """
+
+    _INITIAL_CAPACITY = 64
+    _FRAME_TABLE_CACHE_SIZE = 4
+
+    def __init__(self, steps: Optional[Iterable[PhonemeStep]] = None):
+        self.shape_table: list[str] = []
+        self._shape_codes: dict[str, int] = {}
+
+        self._starts = np.empty(self._INITIAL_CAPACITY, dtype=np.float32)
+        self._durations = np.empty(self._INITIAL_CAPACITY, dtype=np.float32)
+        self._codes = np.empty(self._INITIAL_CAPACITY, dtype=np.uint8)
+        self._size = 0
+
+        # Sort order by start time, computed lazily when steps arrive out of order
+        self._sorted = True
+        self._order: Optional[np.ndarray] = None
+        self._max_duration: Optional[float] = None
+
+        # fps -> frame table, least recently used first
+        self._frame_tables: OrderedDict[int, np.ndarray] = OrderedDict()
+
+        # Phone tokens the steps were mapped from (a mapping.PhoneSequence), if known
+        self.phones = None
+
+        if steps is not None:
+            for step in steps:
+                self.add_step(step)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        starts: np.ndarray,
+        durations: np.ndarray,
+        codes: np.ndarray,
+        shape_table: list[str],
+        copy: bool = True,
+        is_sorted: Optional[bool] = None
+    ) -> "RecognitionResult":
+        """Build a result directly from columns.
+
+        Args:
+            starts: Start times in seconds
+            durations: Durations in seconds
+            codes: Indices into shape_table
+            shape_table: Mouth shape names
+            copy: Copy the columns; if False, arrays of the right dtype
+                (including read-only memmaps) are used as they are
+            is_sorted: Whether starts are ascending, if already known
+
+        Returns:
+            RecognitionResult backed by the columns
+        """
+        convert = np.array if copy else np.asarray
+        result = cls()
+        result.shape_table = list(shape_table)
+        result._shape_codes = {shape: i for i, shape in enumerate(result.shape_table)}
+        result._starts = convert(starts, dtype=np.float32)
+        result._durations = convert(durations, dtype=np.float32)
+        result._codes = convert(codes, dtype=np.uint8)
+        result._size = len(result._starts)
+        if is_sorted is None:
+            is_sorted = bool(np.all(result._starts[1:] >= result._starts[:-1]))
+        result._sorted = is_sorted
+        return result
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Return start times in seconds (read-only view)."""
+        return self._readonly(self._starts[:self._size])
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Return durations in seconds (read-only view)."""
+        return self._readonly(self._durations[:self._size])
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Return shape codes indexing shape_table (read-only view)."""
+        return self._readonly(self._codes[:self._size])
 
-    steps: list[PhonemeStep] = field(default_factory=list)
+    @property
+    def ends(self) -> np.ndarray:
+        """Return end times in seconds."""
+        return self.starts + self.durations
+
+    @property
+    def steps(self) -> tuple[PhonemeStep, ...]:
+        """Return the steps as PhonemeStep objects.
+
+        The steps are built from the columns on each access, so they are a
+        read-only snapshot (a tuple of frozen steps); use add_step() to
+        change the result.
+        """
+        return tuple(self)
+
+    @staticmethod
+    def _readonly(array: np.ndarray) -> np.ndarray:
+        """Return a non-writeable view of an array."""
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def intern_shape(self, mouth_shape: str) -> int:
+        """Return the code for a mouth shape, adding it to the table if new."""
+        code = self._shape_codes.get(mouth_shape)
+        if code is None:
+            code = len(self.shape_table)
+            if code > np.iinfo(np.uint8).max:
+                raise ValueError("Too many distinct mouth shapes")
+            self.shape_table.append(mouth_shape)
+            self._shape_codes[mouth_shape] = code
+        return code
+
+    def _step_at(self, index: int) -> PhonemeStep:
+        """Materialize the step at a storage index."""
+        return PhonemeStep(
+            start_time=float(self._starts[index]),
+            duration=float(self._durations[index]),
+            mouth_shape=self.shape_table[self._codes[index]]
+        )
 
     def __len__(self) -> int:
         """Return the number of phoneme steps."""
-        return len(self.steps)
+        return self._size
 
     def __iter__(self) -> Iterator[PhonemeStep]:
         """Iterate over phoneme steps."""
-        return iter(self.steps)
+        for i in range(self._size):
+            yield self._step_at(i)
+
+    def __getitem__(self, index):
+        """Get a phoneme step by index, or a new result for a slice."""
+        if isinstance(index, slice):
+            return self.from_arrays(
+                self.starts[index], self.durations[index], self.codes[index], self.shape_table
+            )
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RecognitionResult index out of range")
+        return self._step_at(index)
 
-    def __getitem__(self, index: int) -> PhonemeStep:
-        """Get a phoneme step by index."""
-        return self.steps[index]
+    def __eq__(self, other) -> bool:
+        """Compare steps, ignoring how shape codes were assigned."""
+        if not isinstance(other, RecognitionResult):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return (
+            np.array_equal(self.starts, other.starts)
+            and np.array_equal(self.durations, other.durations)
+            and [self.shape_table[c] for c in self.codes] == [other.shape_table[c] for c in other.codes]
+        )
+
+    def __repr__(self) -> str:
+        """Return a short summary of the result."""
+        return f"RecognitionResult({self._size} steps, {self.duration:.2f}s)"
 
     @property
     def duration(self) -> float:
         """Return the total duration of all phoneme steps."""
-        if not self.steps:
+        if self._size == 0:
             return 0.0
-        return max(step.end_time for step in self.steps)
+        return float(self.ends.max())
 
     @property
     def is_empty(self) -> bool:
         """Check if the result contains any phoneme steps."""
-        return len(self.steps) == 0
+        return self._size == 0
 
     def add_step(self, step: PhonemeStep) -> None:
         """Add a phoneme step to the result."""
-        self.steps.append(step)
+        if self._size == len(self._starts):
+            capacity = max(self._INITIAL_CAPACITY, 2 * self._size)
+            self._starts = np.resize(self._starts, capacity)
+            self._durations = np.resize(self._durations, capacity)
+            self._codes = np.resize(self._codes, capacity)
+
+        i = self._size
+        self._starts[i] = step.start_time
+        self._durations[i] = step.duration
+        self._codes[i] = self.intern_shape(step.mouth_shape)
+        self._size += 1
+
+        if self._sorted and i > 0 and self._starts[i] < self._starts[i - 1]:
+            self._sorted = False
+        self._order = None
+        self._max_duration = None
+        self._frame_tables.clear()
+
+    def _sorted_view(self) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Return start times in ascending order and the index mapping, if any."""
+        starts = self.starts
+        if self._sorted:
+            return starts, None
+        if self._order is None:
+            self._order = np.argsort(starts, kind="stable")
+        return starts[self._order], self._order
+
+    def get_shape_index_at(self, time: float) -> int:
+        """Return the index of the step at a given time, or -1 if none.
+
+        Uses binary search over start times. If steps overlap, the step that
+        started most recently wins.
+        """
+        if self._size == 0:
+            return -1
+        sorted_starts, order = self._sorted_view()
+        pos = int(np.searchsorted(sorted_starts, time, side="right")) - 1
+        if pos < 0:
+            return -1
+        index = int(order[pos]) if order is not None else pos
+        if time < self._starts[index] + self._durations[index]:
+            return index
+        return -1
 
     def get_shape_at(self, time: float) -> PhonemeStep | None:
         """Get the phoneme step at a given time.
 
         Returns None if no step contains the given time.
         """
-        for step in self.steps:
-            if step.contains_time(time):
-                return step
-        return None
+        index = self.get_shape_index_at(time)
+        if index < 0:
+            return None
+        return self._step_at(index)
+
+    def indices_in_range(self, start: float, end: float) -> np.ndarray:
+        """Return indices of the steps overlapping [start, end), in start order.
+
+        Uses binary search over start times, so the cost depends on the
+        number of steps in range rather than the size of the result.
+        """
+        if self._size == 0 or end <= start:
+            return np.zeros(0, dtype=np.intp)
+        if self._max_duration is None:
+            self._max_duration = float(self.durations.max())
+
+        sorted_starts, order = self._sorted_view()
+        # No step starting before start - max_duration can reach the range
+        lo = int(np.searchsorted(sorted_starts, start - self._max_duration, side="left"))
+        hi = int(np.searchsorted(sorted_starts, end, side="left"))
+        positions = np.arange(lo, hi)
+        indices = order[positions] if order is not None else positions
+        return indices[self._starts[indices] + self._durations[indices] > start]
+
+    def slice_time(self, start: float, end: float) -> "RecognitionResult":
+        """Return the steps that overlap the time range [start, end).
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds
+
+        Returns:
+            New RecognitionResult sharing this result's shape table
+        """
+        # Back in stored order, as a scan over all steps would return them
+        indices = np.sort(self.indices_in_range(start, end))
+        return self.from_arrays(
+            self._starts[indices], self._durations[indices], self._codes[indices], self.shape_table
+        )
 
     def to_string(self) -> str:
         """Convert to multi-line string format.
 
         Each line: 'start_time duration mouth_shape'
         """
-        return "\n".join(step.to_string() for step in self.steps)
+        return "\n".join(step.to_string() for step in self)
 
     @classmethod
     def from_string(cls, data: str) -> "RecognitionResult":
@@ -109,6 +353,117 @@ class RecognitionResult:
                     result.add_step(step)
         return result
 
+    def frame_spans(self, fps: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the frames covered by each step at a frame rate.
+
+        Step boundaries are snapped to the nearest frame with the same rounding
+        for starts and ends, so adjacent steps share a boundary and no frame is
+        dropped or counted twice. Where steps overlap, the step that starts
+        later takes over from that frame on, matching get_shape_at.
+
+        Args:
+            fps: Frames per second
+
+        Returns:
+            (first_frame, frame_count, code) arrays in time order, with
+            0-based frame indices. Steps shorter than half a frame may get
+            a count of zero.
+        """
+        first, counts, indices = self._frame_span_indices(fps)
+        return first, counts, self.codes[indices]
+
+    def _frame_span_indices(self, fps: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Like frame_spans, but return step indices instead of shape codes."""
+        sorted_starts, order = self._sorted_view()
+        indices = np.arange(self._size) if order is None else order
+        durations = self.durations[indices]
+
+        starts64 = sorted_starts.astype(np.float64)
+        ends64 = starts64 + durations
+        if len(starts64) > 1:
+            # Treat ends within float32 precision of the next start as touching,
+            # otherwise rounding can open a one-frame gap between them
+            touching = np.abs(ends64[:-1] - starts64[1:]) < _TIME_EPSILON
+            ends64[:-1][touching] = starts64[1:][touching]
+
+        first = np.rint(starts64 * fps).astype(np.int64)
+        last = np.rint(ends64 * fps).astype(np.int64)
+        if len(first) > 1:
+            last[:-1] = np.minimum(last[:-1], first[1:])
+        counts = np.maximum(last - first, 0)
+        return first, counts, indices
+
+    def frame_table(self, fps: int) -> np.ndarray:
+        """Return the step index shown on every frame at a frame rate.
+
+        The table is built once per fps and memoized; the most recently used
+        tables for a few frame rates are kept until the steps change.
+
+        Args:
+            fps: Frames per second
+
+        Returns:
+            Read-only int32 array with one entry per frame up to the end of
+            the last step; -1 marks frames not covered by any step
+        """
+        table = self._frame_tables.get(fps)
+        if table is not None:
+            self._frame_tables.move_to_end(fps)
+            return table
+
+        first, counts, indices = self._frame_span_indices(fps)
+        num_frames = int((first + counts).max()) if self._size else 0
+        table = np.full(num_frames, -1, dtype=np.int32)
+
+        total = int(counts.sum())
+        if total:
+            offsets = np.cumsum(counts) - counts
+            frames = np.repeat(first - offsets, counts) + np.arange(total)
+            table[frames] = np.repeat(indices, counts)
+
+        table.flags.writeable = False
+        self._frame_tables[fps] = table
+        while len(self._frame_tables) > self._FRAME_TABLE_CACHE_SIZE:
+            self._frame_tables.popitem(last=False)
+        return table
+
+    def get_shape_index_at_frame(self, frame: int, fps: int) -> int:
+        """Return the index of the step shown on a frame, or -1 if none."""
+        table = self.frame_table(fps)
+        if 0 <= frame < len(table):
+            return int(table[frame])
+        return -1
+
+    def write_moho_timesheet(self, file, fps: int = 24, chunk_frames: int = 65536) -> None:
+        """Stream a Moho/Anime Studio timesheet to a text file handle.
+
+        Lines are produced from the frame table a block of frames at a time
+        and written as they are generated, so no single string for the
+        whole timesheet is ever built.
+
+        Args:
+            file: Writable text file object
+            fps: Frames per second for the animation
+            chunk_frames: Number of frames converted per write
+        """
+        table = self.frame_table(fps)
+        names = np.array(self.shape_table, dtype=object)
+
+        file.write("MohoSwitch1\n")
+        separator = ""  # Frame lines are joined by newlines, with none after the last
+        for lo in range(0, len(table), chunk_frames):
+            block = table[lo:lo + chunk_frames]
+            covered = np.flatnonzero(block >= 0)
+            if len(covered) == 0:
+                continue
+
+            frames = covered + lo + 1  # Moho frames are 1-based
+            shapes = names[self.codes[block[covered]]]
+
+            file.write(separator)
+            separator = "\n"
+            file.write("\n".join([f"{frame} {shape}" for frame, shape in zip(frames.tolist(), shapes.tolist())]))
+
     def export_as_moho_timesheet(self, fps: int = 24) -> str:
         """Export as Moho/Anime Studio timesheet format.
 
@@ -118,15 +473,106 @@ class RecognitionResult:
         Returns:
             Moho timesheet formatted string starting with 'MohoSwitch1'.
         """
-        frames: list[str] = []
-
-        for step in self.steps:
-            start_frame = int(step.start_time * fps) + 1
-            end_frame = start_frame + int(step.duration * fps)
-            frames.extend(f"{i} {step.mouth_shape}" for i in range(start_frame, end_frame))
-
-        return "MohoSwitch1\n" + "\n".join(frames)
+        buffer = io.StringIO()
+        self.write_moho_timesheet(buffer, fps)
+        return buffer.getvalue()
 
     def export_as_text(self) -> str:
         """Export as plain text format (alias for to_string)."""
         return self.to_string()
+
+    def save_binary(self, path: str | os.PathLike) -> None:
+        """Save in the compact binary format.
+
+        Layout: a fixed header, the shape table as newline-separated UTF-8,
+        padding to an 8-byte boundary, then the start (float32), duration
+        (float32) and shape code (uint8) columns, little-endian.
+
+        Args:
+            path: Destination file path
+        """
+        table = "\n".join(self.shape_table).encode("utf-8")
+        max_duration = float(self.durations.max()) if self._size else 0.0
+        flags = _BINARY_FLAG_SORTED if self._sorted else 0
+        header = _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, self._size, max_duration, len(table))
+
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(table)
+            f.write(b"\0" * _binary_padding(_BINARY_HEADER.size + len(table)))
+            f.write(self.starts.astype("<f4", copy=False).tobytes())
+            f.write(self.durations.astype("<f4", copy=False).tobytes())
+            f.write(self.codes.tobytes())
+
+    @classmethod
+    def load_binary(
+        cls,
+        path: str | os.PathLike,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> "RecognitionResult":
+        """Load a result saved with save_binary.
+
+        Columns are memory-mapped, so loading does no parsing and reads no
+        more of the file than is touched. When a time window is given, only
+        the steps overlapping [start, end) are read and copied.
+
+        Args:
+            path: File written by save_binary
+            start: Optional window start in seconds
+            end: Optional window end in seconds
+
+        Returns:
+            RecognitionResult (memory-mapped when no window is given)
+
+        Raises:
+            ValueError: If the file isn't a supported binary result
+        """
+        with open(path, "rb") as f:
+            header = f.read(_BINARY_HEADER.size)
+            if len(header) < _BINARY_HEADER.size:
+                raise ValueError(f"Not a Parakeet binary result: {path}")
+            magic, version, flags, num_steps, max_duration, table_bytes = _BINARY_HEADER.unpack(header)
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"Not a Parakeet binary result: {path}")
+            if version > BINARY_VERSION:
+                raise ValueError(f"Unsupported binary result version {version}: {path}")
+            table_data = f.read(table_bytes).decode("utf-8")
+
+        shape_table = table_data.split("\n") if table_data else []
+        is_sorted = bool(flags & _BINARY_FLAG_SORTED)
+        if num_steps == 0:
+            result = cls()
+            result.shape_table = shape_table
+            result._shape_codes = {shape: i for i, shape in enumerate(shape_table)}
+            return result
+
+        offset = _BINARY_HEADER.size + table_bytes
+        offset += _binary_padding(offset)
+        starts = np.memmap(path, dtype="<f4", mode="r", offset=offset, shape=(num_steps,))
+        durations = np.memmap(path, dtype="<f4", mode="r", offset=offset + 4 * num_steps, shape=(num_steps,))
+        codes = np.memmap(path, dtype=np.uint8, mode="r", offset=offset + 8 * num_steps, shape=(num_steps,))
+
+        if start is None and end is None:
+            return cls.from_arrays(starts, durations, codes, shape_table, copy=False, is_sorted=is_sorted)
+
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        if is_sorted:
+            # Only steps starting within one max duration before the window can reach into it
+            lo = int(np.searchsorted(starts, start - max_duration, side="left"))
+            hi = int(np.searchsorted(starts, end, side="left"))
+        else:
+            lo, hi = 0, num_steps
+
+        window_starts = np.asarray(starts[lo:hi])
+        window_durations = np.asarray(durations[lo:hi])
+        mask = (window_starts < end) & (window_starts + window_durations > start)
+        return cls.from_arrays(
+            window_starts[mask], window_durations[mask], np.asarray(codes[lo:hi])[mask], shape_table
+        )
+
+
+def _binary_padding(offset: int) -> int:
+    """Return the number of bytes needed to align offset for the columns."""
+    return -offset % _BINARY_ALIGN
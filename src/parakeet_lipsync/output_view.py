@@ -0,0 +1,189 @@
+"""Virtualized table of recognition steps for the output panel."""
+
+from typing import Callable, Optional
+
+import dearpygui.dearpygui as dpg
+
+from parakeet_lipsync.models import RecognitionResult
+
+
+class ResultTable:
+    """Scrollable table showing a RecognitionResult a window of rows at a time.
+
+    Only ``visible_rows`` row widgets exist, however long the result is.
+    Scrolling changes which steps they show; labels are formatted straight
+    from the result's columns for just those rows, and only rewritten when
+    they change. Must be used from the UI thread.
+    """
+
+    def __init__(
+        self,
+        tag: str,
+        visible_rows: int = 16,
+        on_row_clicked: Optional[Callable[[int], None]] = None
+    ):
+        """Create the table controller (call ``build`` to add the widgets).
+
+        Args:
+            tag: Tag prefix for the table's widgets
+            visible_rows: Number of rows shown at once
+            on_row_clicked: Called with the step index of a clicked row
+        """
+        self.tag = tag
+        self.visible_rows = visible_rows
+        self.on_row_clicked = on_row_clicked
+
+        self.result: Optional[RecognitionResult] = None
+        self.offset: int = 0  # Step index shown in the first row
+        self.highlighted: int = -1  # Step index of the highlighted row
+
+        self._labels: list[tuple] = []  # Last labels written per row
+        self._selected_row: int = -1
+
+    def build(self, width: int = -1, height: int = -1) -> None:
+        """Add the table widgets to the current container."""
+        with dpg.group(horizontal=True, tag=self.tag):
+            with dpg.group(width=width):
+                dpg.add_text("", tag=f"{self.tag}_status", color=(150, 150, 150))
+                with dpg.table(
+                        tag=f"{self.tag}_table",
+                        header_row=True,
+                        row_background=True,
+                        borders_innerV=True,
+                        policy=dpg.mvTable_SizingStretchProp,
+                        height=height,
+                ):
+                    dpg.add_table_column(label="Start (s)")
+                    dpg.add_table_column(label="Duration (s)")
+                    dpg.add_table_column(label="Mouth Shape")
+                    for row in range(self.visible_rows):
+                        with dpg.table_row():
+                            dpg.add_selectable(
+                                label="",
+                                tag=f"{self.tag}_row{row}",
+                                span_columns=True,
+                                user_data=row,
+                                callback=self._on_row_selected
+                            )
+                            dpg.add_text("", tag=f"{self.tag}_dur{row}")
+                            dpg.add_text("", tag=f"{self.tag}_shape{row}")
+            # Vertical sliders put their maximum at the top, so the value
+            # is the number of rows below the window
+            dpg.add_slider_int(
+                tag=f"{self.tag}_scroll",
+                vertical=True,
+                height=height,
+                width=14,
+                min_value=0,
+                max_value=0,
+                format="",
+                callback=self._on_scrollbar
+            )
+        self._labels = [None] * self.visible_rows
+
+    @property
+    def _max_offset(self) -> int:
+        """Return the largest valid first-row index."""
+        if self.result is None:
+            return 0
+        return max(0, len(self.result) - self.visible_rows)
+
+    def set_message(self, message: str) -> None:
+        """Clear the table and show a status message instead."""
+        self.result = None
+        self.offset = 0
+        self.highlighted = -1
+        dpg.set_value(f"{self.tag}_status", message)
+        self._sync_scrollbar()
+        self._render()
+
+    def set_result(self, result: Optional[RecognitionResult]) -> None:
+        """Show a result, keeping the scroll position where possible."""
+        self.result = result
+        self.highlighted = -1
+        self.offset = min(self.offset, self._max_offset)
+        count = len(result) if result is not None else 0
+        dpg.set_value(f"{self.tag}_status", f"{count} steps")
+        self._sync_scrollbar()
+        self._render()
+
+    def scroll_to(self, offset: int) -> None:
+        """Make a step index the first visible row (clamped)."""
+        offset = max(0, min(int(offset), self._max_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self._sync_scrollbar()
+            self._render()
+
+    def scroll_by(self, rows: int) -> None:
+        """Scroll by a number of rows (positive scrolls down)."""
+        self.scroll_to(self.offset + rows)
+
+    def follow(self, index: int) -> None:
+        """Highlight a step and scroll just enough to keep it in view."""
+        if index == self.highlighted:
+            return
+        self.highlighted = index
+        if index >= 0:
+            margin = min(2, self.visible_rows // 4)
+            if index < self.offset + margin:
+                self.scroll_to(index - margin)
+            elif index >= self.offset + self.visible_rows - margin:
+                self.scroll_to(index - self.visible_rows + margin + 1)
+        self._render_selection()
+
+    def is_hovered(self) -> bool:
+        """Return True if the mouse is over the table."""
+        return dpg.is_item_hovered(f"{self.tag}_table")
+
+    def _sync_scrollbar(self) -> None:
+        """Match the scrollbar range and value to the current window."""
+        scroll = f"{self.tag}_scroll"
+        dpg.configure_item(scroll, max_value=self._max_offset, enabled=self._max_offset > 0)
+        dpg.set_value(scroll, self._max_offset - self.offset)
+
+    def _on_scrollbar(self, sender, app_data) -> None:
+        """Handle the scrollbar being dragged."""
+        self.scroll_to(self._max_offset - app_data)
+
+    def _on_row_selected(self, sender, app_data, user_data) -> None:
+        """Seek to the step of a clicked row."""
+        index = self.offset + user_data
+        self._render_selection()  # Selectables toggle themselves; undo that
+        if self.result is not None and index < len(self.result) and self.on_row_clicked:
+            self.on_row_clicked(index)
+
+    def _render(self) -> None:
+        """Write the labels of the visible rows."""
+        result = self.result
+        stop = min(self.offset + self.visible_rows, len(result)) if result is not None else self.offset
+        if stop > self.offset:
+            starts = result.starts[self.offset:stop].tolist()
+            durations = result.durations[self.offset:stop].tolist()
+            codes = result.codes[self.offset:stop].tolist()
+        else:
+            starts = durations = codes = []
+
+        for row in range(self.visible_rows):
+            if row < len(starts):
+                labels = (f"{starts[row]:.4f}", f"{durations[row]:.4f}", result.shape_table[codes[row]])
+            else:
+                labels = ("", "", "")
+            if labels != self._labels[row]:
+                self._labels[row] = labels
+                dpg.configure_item(f"{self.tag}_row{row}", label=labels[0], enabled=bool(labels[0]))
+                dpg.set_value(f"{self.tag}_dur{row}", labels[1])
+                dpg.set_value(f"{self.tag}_shape{row}", labels[2])
+        self._render_selection()
+
+    def _render_selection(self) -> None:
+        """Select the row of the highlighted step, if it is visible."""
+        row = self.highlighted - self.offset
+        row = row if 0 <= row < self.visible_rows and self.highlighted >= 0 else -1
+        if row == self._selected_row and row < 0:
+            return
+        if self._selected_row >= 0:
+            dpg.set_value(f"{self.tag}_row{self._selected_row}", False)
+        if row >= 0:
+            dpg.set_value(f"{self.tag}_row{row}", True)
+        self._selected_row = row
@@ -0,0 +1,150 @@
+"""Clean-up of recognized mouth shapes before export."""
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import numpy as np
+
+from parakeet_lipsync.models import RecognitionResult
+
+
+@dataclass
+class PostProcessSettings:
+    """Settings for the mouth shape clean-up pipeline."""
+
+    fps: int = 24  # Frame rate min_hold_frames refers to
+    min_phone_seconds: float = 0.0  # Drop recognized phones shorter than this
+    fill_gaps: bool = True  # Make the timeline continuous
+    max_hold_gap_seconds: float = 0.2  # Shorter gaps extend the previous shape; longer ones get gap_shape
+    gap_shape: str = "rest"
+    merge_equal: bool = True  # Join touching steps with the same shape
+    min_hold_frames: int = 2  # Absorb shapes held for fewer frames into the previous speech shape
+
+    def to_dict(self) -> dict:
+        """Return the settings as a plain dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PostProcessSettings":
+        """Create settings from a dict, ignoring unknown keys."""
+        known = cls.__dataclass_fields__.keys()
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+def _merge_runs(starts: np.ndarray, ends: np.ndarray, codes: np.ndarray, eps: float):
+    """Merge neighbouring steps that share a shape and touch."""
+    if len(starts) < 2:
+        return starts, ends, codes
+    joins = (codes[1:] == codes[:-1]) & (starts[1:] - ends[:-1] < eps)
+    run_heads = np.flatnonzero(np.concatenate(([True], ~joins)))
+    return starts[run_heads], np.maximum.reduceat(ends, run_heads), codes[run_heads]
+
+
+def _absorb_short(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    codes: np.ndarray,
+    min_hold: float,
+    gap_code: Optional[int] = None
+):
+    """Fold steps shorter than min_hold into the step before them.
+
+    The first step is always kept so the timeline doesn't start later.
+    Nothing is folded into a ``gap_code`` step: a short shape right after
+    silence is kept (and takes in any short shapes after it) rather than
+    being shown as silence.
+    """
+    if len(starts) < 2 or min_hold <= 0:
+        return starts, ends, codes
+    keep = (ends - starts) >= min_hold
+    keep[0] = True
+    if gap_code is not None:
+        keep[1:] |= (codes[:-1] == gap_code) & (codes[1:] != gap_code)
+    kept = np.flatnonzero(keep)
+    # Each kept step now lasts until the last absorbed step after it ends
+    return starts[kept], np.maximum.reduceat(ends, kept), codes[kept]
+
+
+def _fill_gaps(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    codes: np.ndarray,
+    max_hold_gap: float,
+    gap_code: int
+):
+    """Close gaps by extending short holds and inserting gap steps elsewhere."""
+    ends = np.minimum(ends, np.append(starts[1:], np.inf))
+    gaps = np.append(starts[1:], ends[-1]) - ends
+
+    extend = (gaps > 0) & (gaps <= max_hold_gap)
+    ends = np.where(extend, ends + gaps, ends)
+
+    insert = gaps > max_hold_gap
+    gap_starts = ends[insert]
+    gap_ends = np.append(starts[1:], ends[-1])[insert]
+    if starts[0] > 0:
+        gap_starts = np.append(0.0, gap_starts)
+        gap_ends = np.append(starts[0], gap_ends)
+
+    if len(gap_starts) == 0:
+        return starts, ends, codes
+
+    all_starts = np.concatenate((starts, gap_starts))
+    order = np.argsort(all_starts, kind="stable")
+    return (
+        all_starts[order],
+        np.concatenate((ends, gap_ends))[order],
+        np.concatenate((codes, np.full(len(gap_starts), gap_code, dtype=codes.dtype)))[order]
+    )
+
+
+def postprocess(result: RecognitionResult, settings: PostProcessSettings) -> RecognitionResult:
+    """Clean up a recognition result.
+
+    Stages, in order: drop phones shorter than ``min_phone_seconds``, fill
+    gaps, merge equal neighbours, absorb shapes held for fewer than
+    ``min_hold_frames`` into the shape before them (never into silence),
+    and merge again. Every
+    stage is a handful of NumPy operations over the whole result.
+
+    Args:
+        result: Result to clean up (left unchanged)
+        settings: Pipeline settings
+
+    Returns:
+        New RecognitionResult sharing the input's shape codes
+    """
+    if result.is_empty:
+        return RecognitionResult()
+
+    order = np.argsort(result.starts, kind="stable")
+    starts = result.starts[order].astype(np.float64)
+    ends = starts + result.durations[order]
+    codes = result.codes[order]
+
+    if settings.min_phone_seconds > 0:
+        keep = (ends - starts) >= settings.min_phone_seconds
+        starts, ends, codes = starts[keep], ends[keep], codes[keep]
+        if len(starts) == 0:
+            return RecognitionResult()
+
+    shape_table = list(result.shape_table)
+    eps = 1e-3
+    if settings.fill_gaps:
+        if settings.gap_shape not in shape_table:
+            shape_table.append(settings.gap_shape)
+        gap_code = shape_table.index(settings.gap_shape)
+        starts, ends, codes = _fill_gaps(starts, ends, codes, settings.max_hold_gap_seconds, gap_code)
+
+    if settings.merge_equal:
+        starts, ends, codes = _merge_runs(starts, ends, codes, eps)
+
+    if settings.min_hold_frames > 0 and settings.fps > 0:
+        gap_code = shape_table.index(settings.gap_shape) if settings.gap_shape in shape_table else None
+        starts, ends, codes = _absorb_short(
+            starts, ends, codes, settings.min_hold_frames / settings.fps, gap_code
+        )
+        if settings.merge_equal:
+            starts, ends, codes = _merge_runs(starts, ends, codes, eps)
+
+    return RecognitionResult.from_arrays(starts, ends - starts, codes, shape_table, is_sorted=True)
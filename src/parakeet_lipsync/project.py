@@ -0,0 +1,244 @@
+"""Project files: a saved session with its derived data.
+
+A project is a small JSON file (``.pkp``) describing the session, next to
+a binary sidecar (``.pkp.npz``) holding the bulky derived data: the raw and
+displayed recognition results as columns, and level 0 of the waveform peak
+pyramid. Reopening a project restores all of it without decoding audio
+for the waveform or running recognition again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from parakeet_lipsync.models import RecognitionResult
+from parakeet_lipsync.postprocess import PostProcessSettings
+
+
+PROJECT_EXTENSION = ".pkp"
+SIDECAR_SUFFIX = ".npz"
+PROJECT_VERSION = 1
+
+
+class ProjectError(ValueError):
+    """Raised when a project file or its sidecar can't be read."""
+
+
+class AudioStatus(Enum):
+    """Whether a project's audio file still matches what was saved."""
+
+    OK = "ok"
+    CHANGED = "changed"
+    MISSING = "missing"
+
+
+def hash_file(path: str | os.PathLike, block_size: int = 1024 * 1024) -> str:
+    """Return the BLAKE2b digest of a file's contents."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class AudioFingerprint:
+    """Identity of the audio file a project was made from."""
+
+    path: str  # Absolute path when saved
+    size: int
+    mtime_ns: int
+    digest: str  # hash_file() of the contents
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike) -> "AudioFingerprint":
+        """Fingerprint an audio file."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        return cls(str(path), stat.st_size, stat.st_mtime_ns, hash_file(path))
+
+    def check(self, path: str | os.PathLike) -> AudioStatus:
+        """Compare a file against the fingerprint.
+
+        Size and modification time are compared first; the contents are
+        only hashed when those differ, so a file that was merely touched or
+        copied still counts as unchanged.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return AudioStatus.MISSING
+        if stat.st_size != self.size:
+            return AudioStatus.CHANGED
+        if stat.st_mtime_ns == self.mtime_ns:
+            return AudioStatus.OK
+        return AudioStatus.OK if hash_file(path) == self.digest else AudioStatus.CHANGED
+
+
+@dataclass
+class Project:
+    """Everything needed to restore a session."""
+
+    audio: AudioFingerprint
+    sample_rate: int
+    num_frames: int
+    fps: int = 24
+    postprocess_enabled: bool = False
+    postprocess_settings: PostProcessSettings = field(default_factory=PostProcessSettings)
+    raw_result: Optional[RecognitionResult] = None  # Recognizer output
+    result: Optional[RecognitionResult] = None  # After clean-up, as displayed
+    peak_block: int = 64
+    peaks: Optional[tuple[np.ndarray, np.ndarray]] = None  # Level-0 (mins, maxs)
+    view: dict = field(default_factory=dict)  # zoom_level, view_start, cursor_position, rig
+
+    def resolve_audio_path(self, project_path: str | os.PathLike) -> str:
+        """Return where the audio is now.
+
+        Prefers the saved absolute path; otherwise looks for a file of the
+        same name next to the project, so moving a folder of clips together
+        with their project still works.
+        """
+        if os.path.exists(self.audio.path):
+            return self.audio.path
+        beside = Path(project_path).resolve().parent / Path(self.audio.path).name
+        return str(beside) if beside.exists() else self.audio.path
+
+    def check_audio(self, project_path: str | os.PathLike) -> AudioStatus:
+        """Check whether the project's audio is still the file it was made from."""
+        return self.audio.check(self.resolve_audio_path(project_path))
+
+
+def sidecar_path(project_path: str | os.PathLike) -> Path:
+    """Return the binary sidecar path for a project file."""
+    project_path = Path(project_path)
+    return project_path.with_name(project_path.name + SIDECAR_SUFFIX)
+
+
+def _result_arrays(prefix: str, result: Optional[RecognitionResult], arrays: dict) -> Optional[list[str]]:
+    """Add a result's columns to the sidecar arrays and return its shape table."""
+    if result is None:
+        return None
+    arrays[f"{prefix}_starts"] = result.starts
+    arrays[f"{prefix}_durations"] = result.durations
+    arrays[f"{prefix}_codes"] = result.codes
+    return list(result.shape_table)
+
+
+def _load_result(prefix: str, shape_table: Optional[list[str]], data) -> Optional[RecognitionResult]:
+    """Rebuild a result from sidecar arrays."""
+    if shape_table is None:
+        return None
+    return RecognitionResult.from_arrays(
+        data[f"{prefix}_starts"], data[f"{prefix}_durations"], data[f"{prefix}_codes"], shape_table,
+        copy=False
+    )
+
+
+def _write_atomic(path: Path, write) -> None:
+    """Write a file through a temporary file so readers never see partial data."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def save_project(path: str | os.PathLike, project: Project) -> None:
+    """Write a project file and its binary sidecar.
+
+    Args:
+        path: Project file path (``.pkp``)
+        project: Session to save
+    """
+    path = Path(path)
+    sidecar = sidecar_path(path)
+
+    arrays: dict[str, np.ndarray] = {}
+    raw_table = _result_arrays("raw", project.raw_result, arrays)
+    result_table = _result_arrays("result", project.result, arrays)
+    if project.peaks is not None:
+        arrays["peaks_min"], arrays["peaks_max"] = project.peaks
+    _write_atomic(sidecar, lambda f: np.savez(f, **arrays))
+
+    document = {
+        "version": PROJECT_VERSION,
+        "audio": {
+            "path": project.audio.path,
+            "size": project.audio.size,
+            "mtime_ns": project.audio.mtime_ns,
+            "digest": project.audio.digest,
+            "sample_rate": project.sample_rate,
+            "num_frames": project.num_frames,
+        },
+        "fps": project.fps,
+        "postprocess": {
+            "enabled": project.postprocess_enabled,
+            "settings": project.postprocess_settings.to_dict(),
+        },
+        "results": {"raw": raw_table, "result": result_table},
+        "peaks": {"block": project.peak_block, "stored": project.peaks is not None},
+        "view": project.view,
+        "sidecar": {"name": sidecar.name, "size": sidecar.stat().st_size},
+    }
+    data = json.dumps(document, indent=2).encode("utf-8")
+    _write_atomic(path, lambda f: f.write(data))
+
+
+def load_project(path: str | os.PathLike) -> Project:
+    """Read a project file and its sidecar.
+
+    Raises:
+        ProjectError: If either file is missing, malformed, from a newer
+            version, or the sidecar doesn't belong to the project
+    """
+    path = Path(path)
+    try:
+        document = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ProjectError(f"Could not read project {path}: {e}") from e
+
+    if document.get("version", 0) > PROJECT_VERSION:
+        raise ProjectError(f"Project {path} was saved by a newer version (format {document['version']})")
+
+    try:
+        sidecar = path.with_name(document["sidecar"]["name"])
+        if sidecar.stat().st_size != document["sidecar"]["size"]:
+            raise ProjectError(f"Sidecar {sidecar} doesn't match the project file")
+        with np.load(sidecar, allow_pickle=False) as npz:
+            arrays = {name: npz[name] for name in npz.files}
+    except ProjectError:
+        raise
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ProjectError(f"Could not read project data for {path}: {e}") from e
+
+    try:
+        audio = document["audio"]
+        postprocess = document.get("postprocess", {})
+        results = document.get("results", {})
+        peaks = document.get("peaks", {})
+        return Project(
+            audio=AudioFingerprint(audio["path"], audio["size"], audio["mtime_ns"], audio["digest"]),
+            sample_rate=audio["sample_rate"],
+            num_frames=audio["num_frames"],
+            fps=document.get("fps", 24),
+            postprocess_enabled=postprocess.get("enabled", False),
+            postprocess_settings=PostProcessSettings.from_dict(postprocess.get("settings", {})),
+            raw_result=_load_result("raw", results.get("raw"), arrays),
+            result=_load_result("result", results.get("result"), arrays),
+            peak_block=peaks.get("block", 64),
+            peaks=(arrays["peaks_min"], arrays["peaks_max"]) if peaks.get("stored") else None,
+            view=document.get("view", {}),
+        )
+    except (KeyError, TypeError) as e:
+        raise ProjectError(f"Project {path} is missing {e}") from e
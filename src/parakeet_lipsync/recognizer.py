@@ -1,87 +1,501 @@
 """Phoneme recognition using Allosaurus model."""
 
-import threading
-from typing import Callable, Optional
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
 
-from allosaurus.app import read_recognizer
+import librosa
+import numpy as np
 
-from parakeet_lipsync.models import PhonemeStep, RecognitionResult
+from parakeet_lipsync.audio_source import SampleSource, resample_source
+from parakeet_lipsync.cache import AudioCache, PosteriorCache, RecognitionCache
+from parakeet_lipsync.chunking import AudioChunk, ChunkingConfig, plan_chunks, stitch_ipa_outputs
+from parakeet_lipsync.mapping import MappingTable, load_mapping
+from parakeet_lipsync.model_pool import ModelPool, default_pool, language_models_from_env, model_for_language
+from parakeet_lipsync.models import RecognitionResult
+from parakeet_lipsync.remote import RecognitionClient, RemoteError, server_address
 
 
-# IPA to Preston-Blair mouth shape mapping
-IPA_PRESTON_BLAIR_MAP = {
-    "b": "MBP", "ʧ": "WQ", "d": "E", "ð": "L", "f": "FV", "g": "E",
-    "h": "E", "ʤ": "WQ", "k": "E", "l": "L", "m": "MBP", "n": "etc",
-    "ŋ": "E", "p": "MBP", "r": "L", "s": "etc", "ʃ": "WQ", "t": "E",
-    "θ": "E", "v": "FV", "w": "WQ", "j": "E", "z": "etc", "ʒ": "WQ",
-    "ɑ": "AI", "æ": "AI", "ə": "E", "ʌ": "E", "ɔ": "O", "ɛ": "E",
-    "ɚ": "WQ", "ɝ": "WQ", "ɪ": "AI", "i": "E", "ʊ": "U", "u": "U",
-    "aʊ": "WQ", "aɪ": "AI", "eɪ": "E", "oʊ": "WQ", "o": "O", "ɔɪ": "WQ",
-    "e": "E", "a": "AI", "ʔ": "rest", "ɒ": "O", "ɯ": "U", "ɹ": "L",
-    "ɻ": "L", "-": "rest", "ɡ": "E", "x": "N"
-}
+# Sample rate audio is decoded at before it is fed to the model
+MODEL_SAMPLE_RATE = 16000
+
+# Allosaurus' feature extractor expects 16-bit PCM sample values
+_INT16_SCALE = 32768.0
+
+# Part of recognition cache keys. Entries hold IPA before it is mapped to
+# mouth shapes, so editing mapping tables never needs a bump.
+MAPPING_VERSION = 1
+
+# Parameters of the Allosaurus decoding step; see PhonemeRecognizer.decode_params
+DEFAULT_DECODE_PARAMS = {"lang_id": "ipa", "topk": 1, "emit": 1.0, "timestamp": True}
+
+
+ProgressCallback = Callable[[int, int], None]
+
+T = TypeVar("T")
+
+
+def _pad_by_length(feats: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Zero-pad feature matrices into one batch, longest first.
+
+    The acoustic model packs the batch with pack_padded_sequence, which
+    requires lengths in decreasing order.
+
+    Returns:
+        (padded batch, length of each row, input index of each row)
+    """
+    lengths = np.array([feat.shape[0] for feat in feats], dtype=np.int32)
+    order = np.argsort(-lengths, kind="stable")
+    padded = np.zeros((len(feats), lengths.max(), feats[0].shape[1]), dtype=np.float32)
+    for row, index in enumerate(order):
+        padded[row, :lengths[index]] = feats[index]
+    return padded, lengths[order], order
+
+
+class RecognitionCancelled(Exception):
+    """Raised when a recognition run is cancelled before it finishes."""
 
 
 class PhonemeRecognizer:
     """Handles phoneme recognition and conversion to mouth shapes."""
 
-    def __init__(self):
-        self._model = None
-        self._is_processing = False
-        self._worker_thread: Optional[threading.Thread] = None
+    def __init__(
+        self,
+        model_name: str = "latest",
+        cache: Optional[RecognitionCache] = None,
+        use_cache: bool = True,
+        chunking: Optional[ChunkingConfig] = None,
+        chunk_workers: int = 2,
+        audio_cache: Optional[AudioCache] = None,
+        use_server: bool = True,
+        decode_params: Optional[dict] = None,
+        keep_posteriors: bool = False,
+        posterior_cache: Optional[PosteriorCache] = None,
+        mapping: Optional[MappingTable] = None,
+        rig_directory: Optional[str | Path] = None,
+        language_models: Optional[dict[str, str]] = None,
+        pool: Optional[ModelPool] = None
+    ):
+        """Create a recognizer.
 
-    def _load_model(self):
-        """Lazy load the Allosaurus model."""
-        if self._model is None:
-            print("Loading Allosaurus model...")
-            self._model = read_recognizer()
-            print("Model loaded.")
+        Args:
+            model_name: Allosaurus model for languages without one of their own
+            cache: Recognition cache to use (defaults to the shared on-disk cache)
+            use_cache: Set to False to always run the model and decode audio
+            chunking: Long-audio chunking settings (defaults to ChunkingConfig())
+            chunk_workers: Number of chunks recognized concurrently
+            audio_cache: Cache of 16 kHz decodes (defaults to the shared on-disk cache)
+            use_server: Send inference to a running ``parakeet serve`` when
+                there is one (see PARAKEET_SERVER), falling back to
+                loading the model in this process
+            decode_params: Overrides of DEFAULT_DECODE_PARAMS
+            keep_posteriors: Cache the model's per-frame phone posteriors, so
+                decoding the same audio with other decode_params skips the
+                model; skipped while a recognition server is running
+            posterior_cache: Posterior cache to use (defaults to the shared
+                on-disk cache when keep_posteriors is set)
+            mapping: IPA to mouth shape table to use instead of the one for
+                the decoding language and rig
+            rig_directory: Rig whose mapping.json is layered over the
+                language's table
+            language_models: Language id -> Allosaurus model for languages
+                recognized with their own model (defaults to
+                PARAKEET_LANG_MODELS)
+            pool: Loaded models to draw from (defaults to the pool shared by
+                this process)
+        """
+        self.model_name = model_name
+        self.cache: Optional[RecognitionCache] = None
+        self.audio_cache: Optional[AudioCache] = None
+        if use_cache:
+            self.cache = cache if cache is not None else RecognitionCache()
+            self.audio_cache = audio_cache if audio_cache is not None else AudioCache()
+        self.posterior_cache: Optional[PosteriorCache] = None
+        if use_cache and (keep_posteriors or posterior_cache is not None):
+            self.posterior_cache = posterior_cache if posterior_cache is not None else PosteriorCache()
+        self.decode_params: dict = {**DEFAULT_DECODE_PARAMS, **(decode_params or {})}
+        self.mapping = mapping
+        self.rig_directory = rig_directory
+        self.language_models = language_models if language_models is not None else language_models_from_env()
+        self.pool = pool if pool is not None else default_pool()
+        self._async_scheduler = None  # Created by the first recognize_async() call
+        self._async_job = None
+        self.chunking = chunking if chunking is not None else ChunkingConfig()
+        self.chunk_workers = max(1, chunk_workers)
+        self.client: Optional[RecognitionClient] = None
+        address = server_address() if use_server else None
+        if address:
+            try:
+                self.client = RecognitionClient(address, model_name)
+            except ValueError as e:
+                print(f"Ignoring recognition server setting: {e}")
 
-    @staticmethod
-    def _parse_ipa_output(ipa_output: str) -> RecognitionResult:
+    def model_for(self, lang_id: Optional[str] = None) -> str:
+        """Return the model a language is recognized with.
+
+        Args:
+            lang_id: Allosaurus language id (defaults to the decoding language)
+        """
+        return model_for_language(lang_id or self.decode_params["lang_id"], self.language_models, self.model_name)
+
+    def _load_model(self, model_name: Optional[str] = None):
+        """Return a loaded Allosaurus model from the pool, loading it on first use."""
+        return self.pool.get(model_name or self.model_name)
+
+    def _recognize_params(self, lang_id: Optional[str] = None) -> dict:
+        """Return the decoding parameters passed to the Allosaurus language model."""
+        params = dict(self.decode_params)
+        if lang_id:
+            params["lang_id"] = lang_id
+        return params
+
+    def _compute_logprobs(self, samples: np.ndarray, model_name: Optional[str] = None) -> np.ndarray:
+        """Run the acoustic model on 16 kHz mono samples.
+
+        Args:
+            samples: Float samples in [-1, 1] at MODEL_SAMPLE_RATE
+            model_name: Model to run (defaults to model_name)
+
+        Returns:
+            Per-frame phone log probabilities (frames x phones)
+        """
+        return self.compute_logprobs_batch([samples], model_name)[0]
+
+    def compute_logprobs_batch(self, batch: list[np.ndarray], model_name: Optional[str] = None) -> list[np.ndarray]:
+        """Run the acoustic model on several clips in one forward pass.
+
+        Features are zero-padded to the longest clip and the model is given
+        each clip's length, so every output matches running the clip alone.
+
+        Args:
+            batch: Float samples in [-1, 1] at MODEL_SAMPLE_RATE, one array per clip
+            model_name: Model to run (defaults to model_name)
+
+        Returns:
+            Per-frame phone log probabilities (frames x phones) per clip
+        """
+        import torch
+        from allosaurus.am.utils import move_to_tensor
+        from allosaurus.audio import Audio
+
+        model = self._load_model(model_name)
+
+        feats = [model.pm.compute(Audio(samples * _INT16_SCALE, MODEL_SAMPLE_RATE)) for samples in batch]
+        padded, feat_lens, order = _pad_by_length(feats)
+
+        with torch.no_grad():
+            tensor_feat, tensor_feat_len = move_to_tensor([padded, feat_lens], model.config.device_id)
+            tensor_lprobs = model.am(tensor_feat, tensor_feat_len).cpu().numpy()
+
+        logprobs: list[Optional[np.ndarray]] = [None] * len(feats)
+        for i, (index, length) in enumerate(zip(order, feat_lens)):
+            logprobs[index] = tensor_lprobs[i, :length]
+        return logprobs
+
+    def _decode(self, logprobs: np.ndarray, params: dict, model_name: Optional[str] = None) -> str:
+        """Turn per-frame log probabilities into "start duration phoneme" lines."""
+        return self._load_model(model_name).lm.compute(
+            logprobs,
+            params["lang_id"],
+            params["topk"],
+            emit=params["emit"],
+            timestamp=params["timestamp"]
+        )
+
+    def _infer_ipa(
+        self,
+        samples: np.ndarray,
+        params: dict,
+        progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        posterior_key: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> str:
+        """Run recognition on samples, splitting long audio into chunks.
+
+        When a recognition server is running, the samples are sent there
+        instead and it does the chunking.
+
+        Audio longer than the chunk cap is split at pauses and the chunks are
+        recognized concurrently on a thread pool. Only ``chunk_workers``
+        chunks are in the model at once, and unless posteriors are cached
+        each chunk's are decoded and dropped as soon as it finishes, so the
+        model's working memory depends on the chunk length. The samples
+        themselves (64 KB per second of audio) stay in memory throughout.
+
+        Args:
+            samples: Float samples at MODEL_SAMPLE_RATE
+            params: Decoding parameters
+            progress: Called with (completed, total) chunks as they finish
+            should_cancel: Polled before each chunk; returning True aborts
+            posterior_key: Store the model's posteriors in the posterior
+                cache under this key
+            model_name: Model to run (defaults to model_name)
+
+        Raises:
+            RecognitionCancelled: If should_cancel returned True
+        """
+        def check_cancelled():
+            if should_cancel and should_cancel():
+                raise RecognitionCancelled()
+
+        model_name = model_name or self.model_name
+
+        # Posteriors only exist in-process, so keeping them means running the model here
+        if posterior_key is None and self._server_serves(model_name):
+            check_cancelled()
+            try:
+                output = self.client.recognize(samples, params, self.chunking.to_dict())
+                if progress:
+                    progress(1, 1)
+                return output
+            except RemoteError as e:
+                print(f"{e}; recognizing locally")
+                self.client.mark_unavailable()
+
+        if posterior_key is None:
+            def recognize_chunk(chunk_samples: np.ndarray) -> str:
+                return self._decode(self._compute_logprobs(chunk_samples, model_name), params, model_name)
+
+            chunks, outputs = self._run_chunks(samples, recognize_chunk, progress, check_cancelled, model_name)
+            if chunks is None:
+                return outputs[0]
+            return stitch_ipa_outputs(chunks, outputs, MODEL_SAMPLE_RATE)
+
+        chunks, logprobs = self._run_chunks(
+            samples, lambda chunk_samples: self._compute_logprobs(chunk_samples, model_name),
+            progress, check_cancelled, model_name
+        )
+        try:
+            self.posterior_cache.put(posterior_key, logprobs)
+        except OSError as e:
+            print(f"Could not cache posteriors: {e}")
+        return self._decode_posteriors(chunks, logprobs, params, model_name)
+
+    def _server_serves(self, model_name: str) -> bool:
+        """Return True if a running recognition server can recognize with the model."""
+        return self.client is not None and self.client.model_name == model_name and self.client.is_available()
+
+    def _plan(self, samples: np.ndarray) -> Optional[list[AudioChunk]]:
+        """Return the recognition chunks for samples, or None if they fit in one."""
+        max_samples = int(self.chunking.max_chunk_seconds * MODEL_SAMPLE_RATE)
+        if len(samples) <= max_samples:
+            return None
+        return plan_chunks(samples, MODEL_SAMPLE_RATE, self.chunking)
+
+    def _run_chunks(
+        self,
+        samples: np.ndarray,
+        process: Callable[[np.ndarray], T],
+        progress: Optional[ProgressCallback],
+        check_cancelled: Callable[[], None],
+        model_name: Optional[str] = None
+    ) -> tuple[Optional[list[AudioChunk]], list[T]]:
+        """Run ``process`` over samples, chunk by chunk, on the thread pool.
+
+        Returns:
+            (chunks, or None for a single pass over all samples; result of
+            ``process`` per chunk)
+        """
+        chunks = self._plan(samples)
+        if chunks is None:
+            check_cancelled()
+            result = process(samples)
+            if progress:
+                progress(1, 1)
+            return None, [result]
+
+        self._load_model(model_name)
+
+        def run_chunk(chunk):
+            check_cancelled()
+            return process(samples[chunk.start:chunk.end])
+
+        results: list = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=self.chunk_workers) as executor:
+            futures = {executor.submit(run_chunk, chunk): i for i, chunk in enumerate(chunks)}
+            try:
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    if progress:
+                        progress(completed, len(chunks))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return chunks, results
+
+    def _decode_posteriors(
+        self,
+        chunks: Optional[list[AudioChunk]],
+        logprobs: list[np.ndarray],
+        params: dict,
+        model_name: Optional[str] = None
+    ) -> str:
+        """Decode per-chunk log probabilities and stitch the chunk outputs."""
+        outputs = [self._decode(np.asarray(lp, dtype=np.float32), params, model_name) for lp in logprobs]
+        if chunks is None:
+            return outputs[0]
+        return stitch_ipa_outputs(chunks, outputs, MODEL_SAMPLE_RATE)
+
+    @property
+    def mapping_table(self) -> MappingTable:
+        """Return the IPA to mouth shape table of the decoding language."""
+        return self.mapping_for()
+
+    def mapping_for(self, lang_id: Optional[str] = None) -> MappingTable:
+        """Return the IPA to mouth shape table for a language.
+
+        Args:
+            lang_id: Allosaurus language id (defaults to the decoding language)
+        """
+        if self.mapping is not None:
+            return self.mapping
+        return load_mapping(lang_id or self.decode_params.get("lang_id", "ipa"), self.rig_directory)
+
+    def _parse_ipa_output(
+        self,
+        ipa_output: str,
+        report: bool = True,
+        lang_id: Optional[str] = None
+    ) -> RecognitionResult:
         """Parse IPA output from Allosaurus and convert to RecognitionResult.
 
         Args:
             ipa_output: IPA output from allosaurus (format: "start duration phoneme" per line)
+            report: Print the phones the mapping table has no entry for
+            lang_id: Language the output was decoded with (defaults to the decoding language)
 
         Returns:
             RecognitionResult with Preston-Blair mouth shapes
         """
-        result = RecognitionResult()
-
-        for line in ipa_output.strip().split('\n'):
-            if line:
-                parts = line.split()
-                if len(parts) >= 3:
-                    try:
-                        start_time = float(parts[0])
-                        duration = float(parts[1])
-                        ipa = parts[2]
-                        mouth_shape = IPA_PRESTON_BLAIR_MAP.get(ipa, "rest")
-
-                        step = PhonemeStep(
-                            start_time=start_time,
-                            duration=duration,
-                            mouth_shape=mouth_shape
-                        )
-                        result.add_step(step)
-                    except ValueError:
-                        continue
-
-        return result
-
-    def recognize(self, audio_path: str) -> RecognitionResult:
+        table = self.mapping_for(lang_id)
+        phones = table.segment(ipa_output)
+        if report:
+            unknown = table.unknown_report(phones)
+            if unknown:
+                print(unknown)
+        return table.apply(phones)
+
+    def remap(self, result: RecognitionResult) -> RecognitionResult:
+        """Map a result's phones again with the current mapping table.
+
+        Returns the result unchanged if it doesn't carry its phones (for
+        example, one loaded from a file).
+        """
+        if result.phones is None:
+            return result
+        return self.mapping_table.apply(result.phones)
+
+    def recognize(
+        self,
+        audio_path: str,
+        progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        lang_id: Optional[str] = None
+    ) -> RecognitionResult:
         """Synchronously recognize phonemes from audio file.
 
         Args:
             audio_path: Path to the audio file
+            progress: Called with (completed, total) chunks as they finish
+            should_cancel: Polled between chunks; returning True aborts
+            lang_id: Language to recognize, which picks its phone inventory
+                and model (defaults to the decoding language)
+
+        Returns:
+            RecognitionResult containing mouth shapes with timestamps
+
+        Raises:
+            RecognitionCancelled: If should_cancel returned True
+        """
+        ipa_output = self.recognize_ipa(audio_path, progress, should_cancel, lang_id)
+        return self._parse_ipa_output(ipa_output, lang_id=lang_id)
+
+    def recognize_array(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        lang_id: Optional[str] = None
+    ) -> RecognitionResult:
+        """Recognize phonemes from already-decoded audio.
+
+        The buffer is used in place when it is already 16 kHz mono float32;
+        otherwise it is downmixed and resampled exactly once.
+
+        Args:
+            samples: Audio samples, shape (n,) or (channels, n)
+            sample_rate: Sample rate of the samples
+            progress: Called with (completed, total) chunks as they finish
+            should_cancel: Polled between chunks; returning True aborts
+            lang_id: Language to recognize, which picks its phone inventory
+                and model (defaults to the decoding language)
+
+        Returns:
+            RecognitionResult containing mouth shapes with timestamps
+
+        Raises:
+            RecognitionCancelled: If should_cancel returned True
+        """
+        model_samples = self._to_model_rate(samples, sample_rate)
+        ipa_output = self._recognize_samples(model_samples, progress, should_cancel, lang_id)
+        return self._parse_ipa_output(ipa_output, lang_id=lang_id)
+
+    def recognize_window(self, samples: np.ndarray) -> RecognitionResult:
+        """Recognize a short window of 16 kHz mono audio straight away.
+
+        Used for live input: the window is run through the model in one
+        piece, bypassing chunking and the caches, since a live window never
+        repeats.
+
+        Args:
+            samples: Float samples at MODEL_SAMPLE_RATE
+
+        Returns:
+            RecognitionResult with times relative to the window start
+        """
+        params = self._recognize_params()
+        model_name = self.model_for(params["lang_id"])
+        logprobs = self._compute_logprobs(samples, model_name)
+        return self._parse_ipa_output(self._decode(logprobs, params, model_name), report=False)
+
+    def recognize_source(
+        self,
+        source: SampleSource,
+        progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        lang_id: Optional[str] = None
+    ) -> RecognitionResult:
+        """Recognize phonemes from a lazily loaded sample source.
+
+        The source is read and resampled to 16 kHz block by block, so the
+        full native-rate audio is never held in memory at once. Sources
+        still decoding in the background are waited on first.
+
+        Args:
+            source: Audio to recognize
+            progress: Called with (completed, total) chunks as they finish
+            should_cancel: Polled between chunks; returning True aborts
+            lang_id: Language to recognize, which picks its phone inventory
+                and model (defaults to the decoding language)
 
         Returns:
             RecognitionResult containing mouth shapes with timestamps
+
+        Raises:
+            RecognitionCancelled: If should_cancel returned True
         """
-        self._load_model()
-        ipa_output = self._model.recognize(audio_path, timestamp=True)
-        return self._parse_ipa_output(ipa_output)
+        if source.path:
+            model_samples = self._cached_model_samples(
+                source.path, lambda: resample_source(source, MODEL_SAMPLE_RATE)
+            )
+        else:
+            model_samples = resample_source(source, MODEL_SAMPLE_RATE)
+        ipa_output = self._recognize_samples(model_samples, progress, should_cancel, lang_id)
+        return self._parse_ipa_output(ipa_output, lang_id=lang_id)
 
     def recognize_async(
         self,
@@ -91,31 +505,131 @@ class PhonemeRecognizer:
     ) -> None:
         """Asynchronously recognize phonemes from audio file.
 
+        Deprecated: submit jobs to a scheduler.RecognitionScheduler, which
+        adds priorities, progress and cancellation. Kept as a thin wrapper
+        over a private one-worker scheduler; like before, a call made while
+        a job is running is ignored.
+
         Args:
             audio_path: Path to the audio file
             on_complete: Callback with RecognitionResult
             on_error: Optional callback for errors
         """
-        if self._is_processing:
+        warnings.warn(
+            "PhonemeRecognizer.recognize_async is deprecated; use RecognitionScheduler.submit",
+            DeprecationWarning, stacklevel=2
+        )
+        if self.is_processing:
             return
-
-        def worker():
-            self._is_processing = True
-            try:
-                result = self.recognize(audio_path)
-                on_complete(result)
-            except Exception as e:
-                if on_error:
-                    on_error(e)
-                else:
-                    print(f"Recognition error: {e}")
-            finally:
-                self._is_processing = False
-
-        self._worker_thread = threading.Thread(target=worker, daemon=True)
-        self._worker_thread.start()
+        if self._async_scheduler is None:
+            # Imported here because the scheduler module imports this one
+            from parakeet_lipsync.scheduler import RecognitionScheduler
+            self._async_scheduler = RecognitionScheduler(self, max_workers=1)
+        self._async_job = self._async_scheduler.submit(audio_path, on_complete=on_complete, on_error=on_error)
 
     @property
     def is_processing(self) -> bool:
-        """Return True if recognition is in progress."""
-        return self._is_processing
+        """Return True while a recognize_async() job is queued or running."""
+        return self._async_job is not None and not self._async_job.done()
+
+    @staticmethod
+    def _to_model_rate(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return a read-only 16 kHz mono float32 view of the samples."""
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim > 1:
+            samples = librosa.to_mono(samples)
+        if sample_rate != MODEL_SAMPLE_RATE:
+            samples = librosa.resample(samples, orig_sr=sample_rate, target_sr=MODEL_SAMPLE_RATE)
+
+        view = samples.view()
+        view.flags.writeable = False
+        return view
+
+    def recognize_ipa(
+        self,
+        audio_path: str,
+        progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        lang_id: Optional[str] = None
+    ) -> str:
+        """Return raw IPA output for an audio file, using the cache if enabled.
+
+        Args:
+            audio_path: Path to the audio file
+            progress: Called with (completed, total) chunks as they finish
+            should_cancel: Polled between chunks; returning True aborts
+            lang_id: Language to recognize, which picks its phone inventory
+                and model (defaults to the decoding language)
+
+        Returns:
+            Allosaurus output in "start duration phoneme" lines
+        """
+        samples = self._cached_model_samples(
+            audio_path, lambda: librosa.load(audio_path, sr=MODEL_SAMPLE_RATE, mono=True)[0]
+        )
+        return self._recognize_samples(samples, progress, should_cancel, lang_id)
+
+    def _cached_model_samples(self, audio_path: str, decode: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return 16 kHz mono samples for a file, decoding only on a cache miss."""
+        if self.audio_cache is None:
+            return decode()
+
+        try:
+            key = AudioCache.make_key(audio_path)
+        except OSError:
+            return decode()
+
+        samples = self.audio_cache.get_model_rate(key, MODEL_SAMPLE_RATE)
+        if samples is not None:
+            return samples
+
+        samples = decode()
+        try:
+            self.audio_cache.put_model_rate(key, samples, MODEL_SAMPLE_RATE)
+        except OSError as e:
+            print(f"Could not cache decoded audio: {e}")
+        return samples
+
+    def _recognize_samples(
+        self,
+        samples: np.ndarray,
+        progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        lang_id: Optional[str] = None
+    ) -> str:
+        """Return raw IPA output for 16 kHz mono samples, using the caches if enabled.
+
+        A recognition cache miss with cached posteriors only re-runs the
+        decoding step. Posteriors are neither read nor kept while a
+        recognition server can do the work, since using them needs the
+        model in this process.
+        """
+        params = self._recognize_params(lang_id)
+        model_name = self.model_for(params["lang_id"])
+
+        key = None
+        if self.cache is not None:
+            key_params = dict(params, chunking=self.chunking.to_dict())
+            key = RecognitionCache.make_key(samples, model_name, MAPPING_VERSION, key_params)
+            cached = self.cache.get(key)
+            if cached is not None:
+                if progress:
+                    progress(1, 1)
+                return cached
+
+        ipa_output = None
+        posterior_key = None
+        if self.posterior_cache is not None and not self._server_serves(model_name):
+            posterior_key = PosteriorCache.make_key(samples, model_name, self.chunking.to_dict())
+            logprobs = self.posterior_cache.get(posterior_key)
+            if logprobs is not None:
+                ipa_output = self._decode_posteriors(self._plan(samples), logprobs, params, model_name)
+                if progress:
+                    progress(1, 1)
+
+        if ipa_output is None:
+            ipa_output = self._infer_ipa(samples, params, progress, should_cancel, posterior_key, model_name)
+
+        if key is not None:
+            self.cache.put(key, ipa_output)
+        return ipa_output
@@ -0,0 +1,166 @@
+"""Client for a local recognition server started with ``parakeet serve``.
+
+The protocol is plain HTTP on localhost:
+
+- ``GET /health`` returns JSON with the server's model name and protocol
+  version.
+- ``POST /recognize`` takes 16 kHz mono float32 little-endian samples as
+  the body, and the decoding parameters and chunking settings as JSON in
+  the ``X-Parakeet-Request`` header. Bodies over MAX_REQUEST_BYTES are
+  refused with 413. It returns the Allosaurus output as
+  "start duration phoneme" lines, the same text the recognition cache
+  stores.
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+
+PROTOCOL_VERSION = 1
+DEFAULT_SERVER_ADDRESS = "127.0.0.1:8756"
+REQUEST_HEADER = "X-Parakeet-Request"
+
+# Largest request body the server accepts, a little over two hours of audio
+MAX_REQUEST_BYTES = 512 * 1024 * 1024
+
+# After failing to reach the server, run locally for this long before trying again
+_RETRY_SECONDS = 30.0
+
+
+def server_address() -> Optional[str]:
+    """Return the server address to use, or None to run locally.
+
+    The server is opt-in: PARAKEET_SERVER is "host:port", or "on" for the
+    default address. Unset, empty or "off" runs locally without probing.
+    """
+    address = os.environ.get("PARAKEET_SERVER", "").strip()
+    if address.lower() in ("", "off", "none", "0"):
+        return None
+    return DEFAULT_SERVER_ADDRESS if address.lower() in ("on", "1") else address
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """Split "host:port" into its parts.
+
+    Raises:
+        ValueError: If the port is missing or not a number
+    """
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Expected host:port, got {address!r}")
+    return host, int(port)
+
+
+class RemoteError(Exception):
+    """Raised when the server can't be reached or rejects a request."""
+
+
+class RecognitionClient:
+    """Sends recognition requests to a running ``parakeet serve``.
+
+    Callers fall back to in-process inference on RemoteError. A server that
+    can't be reached isn't tried again for a while, so processes without a
+    server only pay for one refused connection.
+    """
+
+    def __init__(
+        self,
+        address: str = DEFAULT_SERVER_ADDRESS,
+        model_name: str = "latest",
+        connect_timeout: float = 0.25,
+        timeout: float = 600.0
+    ):
+        """Create a client.
+
+        Args:
+            address: Server "host:port"
+            model_name: Model the caller wants; servers running another are ignored
+            connect_timeout: Seconds allowed for the health check
+            timeout: Seconds allowed for a recognition request
+        """
+        self.host, self.port = parse_address(address)
+        self.model_name = model_name
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._available: Optional[bool] = None
+        self._checked_at: float = 0.0
+
+    @property
+    def address(self) -> str:
+        """Return the server address."""
+        return f"{self.host}:{self.port}"
+
+    def _request(self, method: str, path: str, timeout: float, body: Optional[bytes] = None,
+                 headers: Optional[dict] = None) -> bytes:
+        """Make one HTTP request and return the response body."""
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise RemoteError(f"Recognition server at {self.address} unreachable: {e}") from e
+        finally:
+            connection.close()
+        if response.status != 200:
+            message = data.decode("utf-8", errors="replace").strip()
+            raise RemoteError(f"Recognition server error {response.status}: {message}")
+        return data
+
+    def is_available(self) -> bool:
+        """Return True if a compatible server is running.
+
+        The answer is remembered; a missing server is checked again after
+        a while.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._available or (self._available is False and now - self._checked_at < _RETRY_SECONDS):
+                return bool(self._available)
+            try:
+                health = json.loads(self._request("GET", "/health", self.connect_timeout))
+                self._available = (
+                    health.get("protocol") == PROTOCOL_VERSION and health.get("model") == self.model_name
+                )
+            except (RemoteError, ValueError):
+                self._available = False
+            self._checked_at = now
+            return self._available
+
+    def mark_unavailable(self) -> None:
+        """Stop using the server until the next retry period."""
+        with self._lock:
+            self._available = False
+            self._checked_at = time.monotonic()
+
+    def recognize(self, samples: np.ndarray, params: dict, chunking: dict) -> str:
+        """Recognize 16 kHz mono samples on the server.
+
+        Args:
+            samples: Float samples at 16 kHz
+            params: Decoding parameters
+            chunking: ChunkingConfig.to_dict() of the caller
+
+        Returns:
+            Allosaurus output in "start duration phoneme" lines
+
+        Raises:
+            RemoteError: If the request failed
+        """
+        if samples.size * 4 > MAX_REQUEST_BYTES:
+            raise RemoteError("Audio too long for the recognition server")
+        body = np.ascontiguousarray(samples, dtype="<f4").tobytes()
+        header = json.dumps({"params": params, "chunking": chunking})
+        data = self._request(
+            "POST", "/recognize", self.timeout, body=body,
+            headers={"Content-Type": "application/octet-stream", REQUEST_HEADER: header}
+        )
+        return data.decode("utf-8")
@@ -0,0 +1,223 @@
+"""Character rigs: named sets of mouth shape sprites packed into atlases."""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from parakeet_lipsync.cache import default_cache_dir
+
+
+MOUTH_SHAPES = ["AI", "E", "FV", "L", "MBP", "O", "U", "WQ", "etc", "rest", "N"]
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+RESOURCES_DIR = Path(__file__).parent.parent.parent / "resources"
+DEFAULT_RIG = "default"
+
+# Bump when the atlas layout changes so stale cached atlases aren't reused
+ATLAS_VERSION = 1
+
+
+@dataclass
+class CharacterRig:
+    """A named set of mouth shape images."""
+
+    name: str
+    directory: Path
+    images: dict[str, Path]  # Mouth shape -> image file
+
+
+@dataclass
+class RigAtlas:
+    """All sprites of a rig packed into one RGBA float32 image.
+
+    Sprites sit in a grid of square cells, in ``shapes`` order, scaled to
+    fit and centred. ``uvs`` gives each shape's (uv_min, uv_max) corners
+    for drawing its cell.
+    """
+
+    rig_name: str
+    data: np.ndarray  # (height, width, 4) float32 in [0, 1]
+    cell_size: int
+    shapes: list[str]
+    uvs: dict[str, tuple[tuple[float, float], tuple[float, float]]]
+
+    @property
+    def width(self) -> int:
+        """Return the atlas width in pixels."""
+        return self.data.shape[1]
+
+    @property
+    def height(self) -> int:
+        """Return the atlas height in pixels."""
+        return self.data.shape[0]
+
+    def uv(self, shape: str) -> Optional[tuple[tuple[float, float], tuple[float, float]]]:
+        """Return the UV rectangle for a shape, falling back to rest."""
+        return self.uvs.get(shape) or self.uvs.get("rest")
+
+
+def user_rigs_dir() -> Path:
+    """Return the directory for user-installed rigs.
+
+    Honours PARAKEET_RIGS_DIR, then XDG_CONFIG_HOME, then ~/.config.
+    """
+    override = os.environ.get("PARAKEET_RIGS_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".config"
+    return base / "parakeet_lipsync" / "rigs"
+
+
+def find_rig_images(directory: Path) -> dict[str, Path]:
+    """Map mouth shape names to image files in a directory.
+
+    Standard Preston Blair shapes come first; any other images are kept
+    as extra shapes after them.
+    """
+    found = {}
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file():
+            found.setdefault(path.stem, path)
+    ordered = {shape: found.pop(shape) for shape in MOUTH_SHAPES if shape in found}
+    ordered.update(found)
+    return ordered
+
+
+def discover_rigs(extra_dirs: Optional[list[Path]] = None) -> dict[str, CharacterRig]:
+    """Find every available character rig.
+
+    The bundled mouth shapes are the "default" rig. Every subdirectory of
+    ``resources/rigs``, the user rigs directory and ``extra_dirs`` that
+    contains images is a rig named after the subdirectory. Later
+    directories override earlier ones with the same name.
+
+    Returns:
+        Rigs by name, with the default rig first
+    """
+    rigs: dict[str, CharacterRig] = {}
+    default_dir = RESOURCES_DIR / "mouthShapes"
+    if default_dir.is_dir():
+        rigs[DEFAULT_RIG] = CharacterRig(DEFAULT_RIG, default_dir, find_rig_images(default_dir))
+
+    for root in [RESOURCES_DIR / "rigs", user_rigs_dir(), *(extra_dirs or [])]:
+        if not root.is_dir():
+            continue
+        for directory in sorted(root.iterdir()):
+            if directory.is_dir():
+                images = find_rig_images(directory)
+                if images:
+                    rigs[directory.name] = CharacterRig(directory.name, directory, images)
+    return rigs
+
+
+def _atlas_key(rig: CharacterRig, cell_size: int) -> str:
+    """Build a cache key from the rig's files and the atlas settings."""
+    files = []
+    for shape, path in rig.images.items():
+        stat = path.stat()
+        files.append([shape, str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+    meta = {"version": ATLAS_VERSION, "cell_size": cell_size, "files": files}
+    return hashlib.blake2b(json.dumps(meta).encode(), digest_size=16).hexdigest()
+
+
+def _decode_sprite(path: Path, cell_size: int) -> np.ndarray:
+    """Decode an image and fit it, centred, into a transparent square cell."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        img.thumbnail((cell_size, cell_size), Image.LANCZOS)
+        cell = Image.new("RGBA", (cell_size, cell_size), (0, 0, 0, 0))
+        cell.paste(img, ((cell_size - img.width) // 2, (cell_size - img.height) // 2))
+        return np.asarray(cell, dtype=np.uint8)
+
+
+def _cell_size_for(rig: CharacterRig, max_cell_size: int) -> int:
+    """Return the cell size: the largest sprite side, capped."""
+    from PIL import Image
+
+    largest = 1
+    for path in rig.images.values():
+        with Image.open(path) as img:  # Reads the header only
+            largest = max(largest, *img.size)
+    return min(largest, max_cell_size)
+
+
+def _layout(shapes: list[str], cell_size: int) -> tuple[int, int, dict]:
+    """Return the atlas size in cells and each shape's UV rectangle."""
+    columns = max(1, math.ceil(math.sqrt(len(shapes))))
+    rows = max(1, math.ceil(len(shapes) / columns))
+    uvs = {}
+    for i, shape in enumerate(shapes):
+        row, col = divmod(i, columns)
+        uvs[shape] = ((col / columns, row / rows), ((col + 1) / columns, (row + 1) / rows))
+    return columns, rows, uvs
+
+
+def build_atlas(
+    rig: CharacterRig,
+    max_cell_size: int = 256,
+    workers: int = 4,
+    cache_dir: Optional[Path] = None
+) -> RigAtlas:
+    """Pack a rig's sprites into an atlas, reusing a cached one if possible.
+
+    Atlases are stored as float32 .npy files, so a cached rig loads with a
+    single read and no image decoding or conversion. Otherwise the images
+    are decoded on a thread pool.
+
+    Args:
+        rig: Rig to pack
+        max_cell_size: Largest side of one sprite cell in pixels
+        workers: Number of images decoded in parallel
+        cache_dir: Atlas cache directory (defaults to the shared cache)
+
+    Returns:
+        The rig's atlas
+    """
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "sprites"
+    shapes = list(rig.images)
+    cell_size = _cell_size_for(rig, max_cell_size)
+    columns, rows, uvs = _layout(shapes, cell_size)
+
+    cache_path = cache_dir / f"{rig.name}-{_atlas_key(rig, cell_size)}.npy"
+    try:
+        data = np.load(cache_path)
+        if data.shape == (rows * cell_size, columns * cell_size, 4) and data.dtype == np.float32:
+            return RigAtlas(rig.name, data, cell_size, shapes, uvs)
+    except (OSError, ValueError):
+        pass
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        sprites = list(pool.map(lambda path: _decode_sprite(path, cell_size), rig.images.values()))
+
+    pixels = np.zeros((rows * cell_size, columns * cell_size, 4), dtype=np.uint8)
+    for i, sprite in enumerate(sprites):
+        row, col = divmod(i, columns)
+        pixels[row * cell_size:(row + 1) * cell_size, col * cell_size:(col + 1) * cell_size] = sprite
+    data = pixels.astype(np.float32)
+    data /= 255.0
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, data, allow_pickle=False)
+        os.replace(tmp_path, cache_path)
+        # Drop atlases of older versions of this rig
+        for stale in cache_dir.glob(f"{rig.name}-*.npy"):
+            if stale != cache_path and stale.stem.rsplit("-", 1)[0] == rig.name:
+                stale.unlink()
+    except OSError as e:
+        print(f"Could not cache sprite atlas: {e}")
+
+    return RigAtlas(rig.name, data, cell_size, shapes, uvs)
@@ -0,0 +1,336 @@
+"""Prioritized, cancellable job queue for phoneme recognition."""
+
+import heapq
+import itertools
+import queue
+import threading
+from enum import Enum, IntEnum
+from typing import Callable, Optional
+
+import numpy as np
+
+from parakeet_lipsync.audio_source import SampleSource
+from parakeet_lipsync.models import RecognitionResult
+from parakeet_lipsync.recognizer import PhonemeRecognizer, RecognitionCancelled
+
+
+class Priority(IntEnum):
+    """Job priorities; lower values run first."""
+
+    INTERACTIVE = 0  # The file currently open in the GUI
+    NORMAL = 10
+    BACKGROUND = 20  # Bulk batch work
+
+
+class JobStatus(Enum):
+    """Lifecycle states of a recognition job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class RecognitionJob:
+    """Handle to a submitted recognition job.
+
+    Callbacks are invoked on the scheduler's worker thread.
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        audio_path: str,
+        priority: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+        on_complete: Optional[Callable[[RecognitionResult], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_cancel: Optional[Callable[[], None]] = None,
+        samples: Optional[np.ndarray] = None,
+        sample_rate: Optional[int] = None,
+        source: Optional[SampleSource] = None
+    ):
+        self.id = job_id
+        self.audio_path = audio_path
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.source = source
+        self.priority = priority
+        self.status = JobStatus.QUEUED
+        self.progress: float = 0.0  # Fraction complete, 0.0 - 1.0
+
+        self._on_progress = on_progress
+        self._on_complete = on_complete
+        self._on_error = on_error
+        self._on_cancel = on_cancel
+        self._result: Optional[RecognitionResult] = None
+        self._error: Optional[Exception] = None
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._scheduler: Optional["RecognitionScheduler"] = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Return True if cancellation has been requested."""
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        """Return True if the job has finished, failed or been cancelled."""
+        return self._done_event.is_set()
+
+    def cancel(self) -> bool:
+        """Request cancellation.
+
+        A queued job is removed immediately. A running job stops at the next
+        chunk boundary.
+
+        Returns:
+            False if the job had already finished, True otherwise
+        """
+        if self.done():
+            return False
+        self._cancel_event.set()
+        if self._scheduler is not None:
+            self._scheduler._remove_queued(self)
+        return True
+
+    def result(self, timeout: Optional[float] = None) -> RecognitionResult:
+        """Wait for the job and return its result.
+
+        Raises:
+            TimeoutError: If the job doesn't finish within the timeout
+            RecognitionCancelled: If the job was cancelled
+            Exception: Whatever error made the job fail
+        """
+        if not self._done_event.wait(timeout):
+            raise TimeoutError(f"Job {self.id} did not finish within {timeout}s")
+        if self.status == JobStatus.CANCELLED:
+            raise RecognitionCancelled(f"Job {self.id} was cancelled")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _report_progress(self, completed: int, total: int) -> None:
+        """Record chunk-level progress and notify the listener."""
+        self.progress = completed / total if total else 1.0
+        if self._on_progress:
+            # Like the other callbacks, a failing listener must not fail the job
+            try:
+                self._on_progress(self.progress)
+            except Exception as e:
+                print(f"Error in progress callback of job {self.id}: {e}")
+
+    def _finish(self, status: JobStatus, result=None, error: Optional[Exception] = None) -> None:
+        """Store the outcome, wake waiters and fire callbacks."""
+        self.status = status
+        self._result = result
+        self._error = error
+        self._done_event.set()
+
+        # A failing callback must not take the worker thread down with it
+        try:
+            if status == JobStatus.DONE and self._on_complete:
+                self._on_complete(result)
+            elif status == JobStatus.FAILED:
+                if self._on_error:
+                    self._on_error(error)
+                else:
+                    print(f"Recognition error: {error}")
+            elif status == JobStatus.CANCELLED and self._on_cancel:
+                self._on_cancel()
+        except Exception as e:
+            print(f"Error in callback of job {self.id}: {e}")
+
+
+class RecognitionScheduler:
+    """Runs recognition jobs on a fixed set of worker threads.
+
+    Pending jobs wait in a bounded priority queue; among jobs of equal
+    priority the oldest runs first.
+    """
+
+    def __init__(self, recognizer: PhonemeRecognizer, max_workers: int = 1, max_queue: int = 64):
+        """Create a scheduler and start its workers.
+
+        Args:
+            recognizer: Recognizer shared by all workers
+            max_workers: Number of jobs that may run at the same time
+            max_queue: Maximum number of queued (not yet running) jobs
+        """
+        self.recognizer = recognizer
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+
+        self._heap: list[tuple[int, int, RecognitionJob]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running: set[RecognitionJob] = set()
+        self._shutdown = False
+
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"recognition-worker-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        audio_path: str,
+        priority: int = Priority.NORMAL,
+        on_progress: Optional[Callable[[float], None]] = None,
+        on_complete: Optional[Callable[[RecognitionResult], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_cancel: Optional[Callable[[], None]] = None,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        samples: Optional[np.ndarray] = None,
+        sample_rate: Optional[int] = None,
+        source: Optional[SampleSource] = None
+    ) -> RecognitionJob:
+        """Queue an audio file for recognition.
+
+        Args:
+            audio_path: Path to the audio file (used as a label if samples are given)
+            priority: Job priority (see Priority)
+            on_progress: Called with the fraction complete after each chunk
+            on_complete: Called with the RecognitionResult
+            on_error: Called with the exception if recognition fails
+            on_cancel: Called once the job has been cancelled
+            block: Wait for space if the queue is full
+            timeout: Maximum time to wait for space when blocking
+            samples: Already-decoded audio to recognize instead of reading the file
+            sample_rate: Sample rate of samples
+            source: Lazily loaded audio to recognize instead of reading the file
+
+        Returns:
+            Handle for tracking or cancelling the job
+
+        Raises:
+            queue.Full: If the queue is full and no space became available
+            RuntimeError: If the scheduler has been shut down
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down")
+
+            has_space = lambda: len(self._heap) < self.max_queue or self._shutdown
+            if not has_space():
+                if not block or not self._condition.wait_for(has_space, timeout):
+                    raise queue.Full("Recognition queue is full")
+                if self._shutdown:
+                    raise RuntimeError("Scheduler has been shut down")
+
+            seq = next(self._counter)
+            job = RecognitionJob(
+                seq, audio_path, priority, on_progress, on_complete, on_error, on_cancel,
+                samples=samples, sample_rate=sample_rate, source=source
+            )
+            job._scheduler = self
+            heapq.heappush(self._heap, (priority, seq, job))
+            self._condition.notify_all()
+            return job
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of queued jobs."""
+        with self._condition:
+            return len(self._heap)
+
+    @property
+    def running_count(self) -> int:
+        """Return the number of jobs currently running."""
+        with self._condition:
+            return len(self._running)
+
+    @property
+    def is_busy(self) -> bool:
+        """Return True if any job is queued or running."""
+        with self._condition:
+            return bool(self._heap or self._running)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True) -> None:
+        """Stop accepting jobs and stop the workers.
+
+        Args:
+            wait: Block until the workers have exited
+            cancel_pending: Cancel queued and running jobs instead of draining them
+        """
+        pending: list[RecognitionJob] = []
+        with self._condition:
+            self._shutdown = True
+            if cancel_pending:
+                pending = [job for _, _, job in self._heap]
+                self._heap.clear()
+                for job in self._running:
+                    job._cancel_event.set()
+            self._condition.notify_all()
+
+        for job in pending:
+            job._cancel_event.set()
+            job._finish(JobStatus.CANCELLED)
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _remove_queued(self, job: RecognitionJob) -> None:
+        """Drop a cancelled job from the queue if it hasn't started yet."""
+        with self._condition:
+            for i, (_, _, queued) in enumerate(self._heap):
+                if queued is job:
+                    self._heap[i] = self._heap[-1]
+                    self._heap.pop()
+                    heapq.heapify(self._heap)
+                    break
+            else:
+                return
+            self._condition.notify_all()
+        job._finish(JobStatus.CANCELLED)
+
+    def _worker_loop(self) -> None:
+        """Take the highest-priority job off the queue and run it."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._heap or self._shutdown)
+                if not self._heap:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                job.status = JobStatus.RUNNING
+                self._running.add(job)
+                self._condition.notify_all()
+
+            try:
+                if job.source is not None:
+                    result = self.recognizer.recognize_source(
+                        job.source,
+                        progress=job._report_progress,
+                        should_cancel=lambda: job.is_cancelled
+                    )
+                elif job.samples is not None:
+                    result = self.recognizer.recognize_array(
+                        job.samples,
+                        job.sample_rate,
+                        progress=job._report_progress,
+                        should_cancel=lambda: job.is_cancelled
+                    )
+                else:
+                    result = self.recognizer.recognize(
+                        job.audio_path,
+                        progress=job._report_progress,
+                        should_cancel=lambda: job.is_cancelled
+                    )
+            except RecognitionCancelled:
+                job._finish(JobStatus.CANCELLED)
+            except Exception as e:
+                job._finish(JobStatus.FAILED, error=e)
+            else:
+                if job.is_cancelled:
+                    job._finish(JobStatus.CANCELLED)
+                else:
+                    job._finish(JobStatus.DONE, result=result)
+            finally:
+                with self._condition:
+                    self._running.discard(job)
+                    self._condition.notify_all()
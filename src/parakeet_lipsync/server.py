@@ -0,0 +1,261 @@
+"""Local recognition server that keeps models loaded between invocations.
+
+``parakeet serve`` loads the model once and answers requests from
+PhonemeRecognizer clients in other processes (see remote.py for the
+protocol). Chunks of concurrent requests are gathered into micro-batches
+and run through the acoustic model together.
+"""
+
+import json
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+import numpy as np
+
+from parakeet_lipsync.chunking import ChunkingConfig, plan_chunks, stitch_ipa_outputs
+from parakeet_lipsync.model_pool import ModelPool
+from parakeet_lipsync.recognizer import MODEL_SAMPLE_RATE, PhonemeRecognizer
+from parakeet_lipsync.remote import MAX_REQUEST_BYTES, PROTOCOL_VERSION, REQUEST_HEADER, parse_address
+
+
+class MicroBatcher:
+    """Groups work items submitted from many threads into batches.
+
+    Each worker thread takes the oldest pending item, then waits up to
+    ``max_wait`` seconds for more to arrive, and hands up to ``max_batch``
+    of them to its ``run_batch`` function in one call. One worker per model
+    instance keeps every instance busy without sharing one between threads.
+    """
+
+    def __init__(
+        self,
+        run_batch_functions: list[Callable[[list], list]],
+        max_batch: int = 8,
+        max_wait: float = 0.01
+    ):
+        """Start the workers.
+
+        Args:
+            run_batch_functions: One function per worker, mapping a list of
+                items to a list of results in the same order
+            max_batch: Most items per batch
+            max_wait: Seconds to wait for a batch to fill after its first item
+        """
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._workers = [
+            threading.Thread(target=self._run, args=(run_batch,), daemon=True, name=f"batcher-{i}")
+            for i, run_batch in enumerate(run_batch_functions)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, item) -> Future:
+        """Queue an item; the future resolves to its result."""
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the workers once the queue is empty."""
+        for _ in self._workers:
+            self._queue.put(None)
+
+    def _run(self, run_batch: Callable[[list], list]) -> None:
+        """Collect and run batches until closed."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    entry = self._queue.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            items = [item for item, _ in batch]
+            try:
+                results = run_batch(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            if stop:
+                return
+
+
+class RecognitionServer:
+    """Recognizes audio for clients with warm, micro-batched models."""
+
+    def __init__(
+        self,
+        model_name: str = "latest",
+        instances: int = 1,
+        max_batch: int = 8,
+        max_wait: float = 0.01
+    ):
+        """Load the models.
+
+        Args:
+            model_name: Allosaurus model to serve
+            instances: Model instances, each run by its own batch worker
+            max_batch: Most chunks per forward pass
+            max_wait: Seconds a batch waits to fill
+        """
+        self.model_name = model_name
+        # Each instance gets its own pool so that every batch worker runs its own copy of the model
+        self.recognizers = [
+            PhonemeRecognizer(model_name, use_cache=False, use_server=False, language_models={}, pool=ModelPool())
+            for _ in range(max(1, instances))
+        ]
+        for recognizer in self.recognizers:
+            recognizer._load_model()
+        self.batcher = MicroBatcher(
+            [self._batch_function(recognizer) for recognizer in self.recognizers], max_batch, max_wait
+        )
+
+    @staticmethod
+    def _batch_function(recognizer: PhonemeRecognizer) -> Callable[[list], list]:
+        """Return a batch runner for one model instance."""
+        def run_batch(items: list[tuple[np.ndarray, dict]]) -> list[str]:
+            logprobs = recognizer.compute_logprobs_batch([samples for samples, _ in items])
+            return [recognizer._decode(lp, params) for lp, (_, params) in zip(logprobs, items)]
+        return run_batch
+
+    def recognize(self, samples: np.ndarray, params: dict, chunking: ChunkingConfig) -> str:
+        """Recognize 16 kHz samples, chunked as the client would chunk them.
+
+        Returns:
+            Allosaurus output in "start duration phoneme" lines
+        """
+        max_samples = int(chunking.max_chunk_seconds * MODEL_SAMPLE_RATE)
+        if len(samples) <= max_samples:
+            return self.batcher.submit((samples, params)).result()
+
+        chunks = plan_chunks(samples, MODEL_SAMPLE_RATE, chunking)
+        futures = [self.batcher.submit((samples[chunk.start:chunk.end], params)) for chunk in chunks]
+        return stitch_ipa_outputs(chunks, [future.result() for future in futures], MODEL_SAMPLE_RATE)
+
+    def close(self) -> None:
+        """Stop the batch workers."""
+        self.batcher.close()
+
+
+def _chunking_from_dict(data: dict) -> ChunkingConfig:
+    """Build chunking settings from a client request, ignoring unknown keys."""
+    names = {f.name for f in fields(ChunkingConfig)}
+    return ChunkingConfig(**{k: v for k, v in data.items() if k in names})
+
+
+def _make_handler(server: RecognitionServer) -> type:
+    """Create the HTTP request handler class for a server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: bytes, content_type: str = "text/plain; charset=utf-8") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _refuse(self, status: int, body: bytes) -> None:
+            """Reply to a request whose body was not read, and close the
+            connection, since the unread body would be taken for the next request."""
+            self.close_connection = True
+            self._reply(status, body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._reply(404, b"Not found")
+                return
+            health = {"protocol": PROTOCOL_VERSION, "model": server.model_name,
+                      "instances": len(server.recognizers)}
+            self._reply(200, json.dumps(health).encode(), "application/json")
+
+        def do_POST(self):
+            if self.path != "/recognize":
+                self._refuse(404, b"Not found")
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                self._refuse(400, b"Bad request: invalid Content-Length")
+                return
+            if length > MAX_REQUEST_BYTES:
+                self._refuse(413, f"Request body over {MAX_REQUEST_BYTES} bytes".encode())
+                return
+            if length <= 0 or length % 4 != 0:
+                self._refuse(400, b"Bad request: body must be a non-empty run of float32 samples")
+                return
+            try:
+                request = json.loads(self.headers.get(REQUEST_HEADER, "{}"))
+                params = request["params"]
+                chunking = _chunking_from_dict(request.get("chunking", {}))
+            except (ValueError, KeyError, TypeError) as e:
+                self._refuse(400, f"Bad request: {e}".encode())
+                return
+            body = self.rfile.read(length)
+            if len(body) != length:
+                self._refuse(400, b"Bad request: body shorter than Content-Length")
+                return
+            samples = np.frombuffer(body, dtype="<f4")
+            try:
+                output = server.recognize(samples, params, chunking)
+            except Exception as e:
+                self._reply(500, f"Recognition failed: {e}".encode())
+                return
+            self._reply(200, output.encode("utf-8"))
+
+        def log_message(self, format, *args):
+            pass  # One line per request would drown the console
+
+    return Handler
+
+
+def serve(
+    address: str,
+    model_name: str = "latest",
+    instances: int = 1,
+    max_batch: int = 8,
+    max_wait: float = 0.01,
+    ready: Optional[Callable[[ThreadingHTTPServer], None]] = None
+) -> None:
+    """Load the models and answer requests until interrupted.
+
+    Args:
+        address: "host:port" to listen on
+        model_name: Allosaurus model to serve
+        instances: Model instances kept loaded
+        max_batch: Most chunks per forward pass
+        max_wait: Seconds a batch waits to fill
+        ready: Called with the HTTP server once it is listening
+    """
+    host, port = parse_address(address)
+    recognition = RecognitionServer(model_name, instances, max_batch, max_wait)
+    httpd = ThreadingHTTPServer((host, port), _make_handler(recognition))
+    httpd.daemon_threads = True
+    print(f"Serving model '{model_name}' ({len(recognition.recognizers)} instance(s)) on {host}:{port}")
+    if ready:
+        ready(httpd)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        recognition.close()
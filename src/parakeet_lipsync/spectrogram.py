@@ -0,0 +1,205 @@
+"""Tiled spectrogram rendering on a background worker pool."""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from parakeet_lipsync.audio_source import SampleSource
+
+
+TileKey = tuple[int, int]  # (zoom level, tile index)
+
+# Colour map anchors (dark blue -> purple -> orange -> pale yellow)
+_COLORMAP_POSITIONS = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+_COLORMAP_COLORS = np.array([
+    [0.02, 0.02, 0.08],
+    [0.25, 0.07, 0.43],
+    [0.72, 0.21, 0.47],
+    [0.99, 0.55, 0.24],
+    [0.99, 0.99, 0.75],
+])
+
+
+def apply_colormap(values: np.ndarray) -> np.ndarray:
+    """Map values in [0, 1] to RGBA float32 colours."""
+    values = np.clip(values, 0.0, 1.0)
+    rgba = np.empty(values.shape + (4,), dtype=np.float32)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(values, _COLORMAP_POSITIONS, _COLORMAP_COLORS[:, channel])
+    rgba[..., 3] = 1.0
+    return rgba
+
+
+class SpectrogramTile:
+    """A computed block of spectrogram columns, ready to upload as a texture."""
+
+    def __init__(self, key: TileKey, start: float, end: float, max_frequency: float, pixels: np.ndarray):
+        self.key = key
+        self.start = start  # Seconds
+        self.end = end
+        self.max_frequency = max_frequency  # Hz at the top edge
+        self.pixels = pixels  # (height, width, 4) float32, top row = highest frequency
+
+    @property
+    def width(self) -> int:
+        """Return the tile width in columns."""
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        """Return the tile height in frequency bins."""
+        return self.pixels.shape[0]
+
+
+class SpectrogramTiler:
+    """Computes spectrogram tiles of a source for a given zoom level.
+
+    At zoom level z the visible range (the file duration divided by z) is
+    covered by about ``view_columns`` STFT columns, so deeper zooms use a
+    shorter hop. Each level is cut into tiles of ``tile_columns`` columns;
+    tiles are computed on a thread pool, reported through ``on_tile_ready``
+    as they finish, and kept in an LRU cache keyed by (zoom level, tile
+    index) so scrolling back or zooming out again costs nothing.
+    """
+
+    def __init__(
+        self,
+        source: SampleSource,
+        on_tile_ready: Optional[Callable[[SpectrogramTile], None]] = None,
+        n_fft: int = 512,
+        max_frequency: float = 8000.0,
+        view_columns: int = 1024,
+        tile_columns: int = 256,
+        workers: int = 2,
+        max_tiles: int = 96,
+        dynamic_range_db: float = 80.0
+    ):
+        """Create a tiler.
+
+        Args:
+            source: Audio to analyse
+            on_tile_ready: Called from a worker thread when a tile finishes
+            n_fft: FFT size in samples
+            max_frequency: Highest frequency shown
+            view_columns: STFT columns across the visible range
+            tile_columns: STFT columns per tile
+            workers: Number of tiles computed in parallel
+            max_tiles: Tiles kept in the cache
+            dynamic_range_db: Level range mapped onto the colour map
+        """
+        self.source = source
+        self.on_tile_ready = on_tile_ready
+        self.n_fft = n_fft
+        self.view_columns = view_columns
+        self.tile_columns = tile_columns
+        self.max_tiles = max_tiles
+        self.dynamic_range_db = dynamic_range_db
+
+        nyquist = source.sample_rate / 2
+        self.num_bins = int(min(max_frequency, nyquist) / nyquist * (n_fft // 2)) + 1
+        self.max_frequency = (self.num_bins - 1) * source.sample_rate / n_fft
+        self._window = np.hanning(n_fft).astype(np.float32)
+        # Full-scale sine peaks at sum(window) / 2 in the magnitude spectrum
+        self._reference = float(self._window.sum() / 2)
+
+        self._lock = threading.Lock()
+        self._tiles: OrderedDict[TileKey, SpectrogramTile] = OrderedDict()
+        self._pending: set[TileKey] = set()
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="spectrogram")
+
+    def hop_length(self, level: int) -> int:
+        """Return the STFT hop, in samples, used at a zoom level."""
+        view_samples = self.source.num_frames / max(1, level)
+        return max(16, int(view_samples / self.view_columns))
+
+    def tile_range(self, level: int, start: float, end: float) -> range:
+        """Return the indices of the tiles covering a time range at a level."""
+        samples_per_tile = self.hop_length(level) * self.tile_columns
+        total = -(-self.source.num_frames // samples_per_tile)
+        first = max(0, int(start * self.source.sample_rate) // samples_per_tile)
+        last = min(total, int(np.ceil(end * self.source.sample_rate / samples_per_tile)))
+        return range(first, last)
+
+    def get(self, key: TileKey) -> Optional[SpectrogramTile]:
+        """Return a cached tile, marking it recently used."""
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def request(self, level: int, start: float, end: float) -> list[SpectrogramTile]:
+        """Return the cached tiles covering a range and queue the missing ones.
+
+        Missing tiles are reported through ``on_tile_ready`` once computed.
+        """
+        ready = []
+        for index in self.tile_range(level, start, end):
+            key = (level, index)
+            with self._lock:
+                if self._closed:
+                    break
+                tile = self._tiles.get(key)
+                if tile is not None:
+                    self._tiles.move_to_end(key)
+                    ready.append(tile)
+                    continue
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+            self._pool.submit(self._run_tile, key)
+        return ready
+
+    def _run_tile(self, key: TileKey) -> None:
+        """Compute a tile, cache it and report it."""
+        try:
+            tile = self.compute_tile(*key)
+        except Exception as e:
+            print(f"Error computing spectrogram tile {key}: {e}")
+            with self._lock:
+                self._pending.discard(key)
+            return
+
+        with self._lock:
+            self._pending.discard(key)
+            if self._closed:
+                return
+            self._tiles[key] = tile
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        if self.on_tile_ready:
+            self.on_tile_ready(tile)
+
+    def compute_tile(self, level: int, index: int) -> SpectrogramTile:
+        """Compute one tile's magnitudes in dB and colour them."""
+        hop = self.hop_length(level)
+        sample_rate = self.source.sample_rate
+        first = index * self.tile_columns * hop
+        columns = min(self.tile_columns, -(-(self.source.num_frames - first) // hop))
+
+        # Frames are centred on their column, so read half a window either side
+        pad = self.n_fft // 2
+        lo = first - pad
+        hi = first + (columns - 1) * hop + pad
+        samples = self.source.read(max(0, lo), hi)
+        samples = np.pad(samples, (max(0, -lo), max(0, hi - lo - max(0, -lo) - len(samples))))
+
+        frames = np.lib.stride_tricks.sliding_window_view(samples, self.n_fft)[::hop][:columns]
+        spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1))[:, :self.num_bins]
+        db = 20.0 * np.log10(np.maximum(spectrum, 1e-10) / self._reference)
+        values = 1.0 + db.T[::-1] / self.dynamic_range_db  # Highest frequency in the top row
+
+        start = first / sample_rate
+        end = (first + columns * hop) / sample_rate
+        return SpectrogramTile((level, index), start, end, self.max_frequency, apply_colormap(values))
+
+    def close(self) -> None:
+        """Stop reporting tiles and shut the worker pool down."""
+        with self._lock:
+            self._closed = True
+            self._tiles.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,66 @@
+"""Hand-off of work from background threads to the UI thread."""
+
+import threading
+from collections import deque
+from typing import Any, Callable, Hashable
+
+
+class UIDispatcher:
+    """Queue of calls posted from any thread and run on the UI thread.
+
+    Background threads (audio position updates, recognition callbacks,
+    decoders) post calls here instead of touching widgets directly; the
+    render loop runs them once per frame with ``drain``.
+
+    Calls posted with ``post_latest`` are coalesced by key: only the newest
+    arguments run, in the queue position of the first call that is still
+    pending, so a burst of position updates between two frames costs one
+    widget update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: deque = deque()
+        # key -> newest (callback, args) for coalesced calls still pending
+        self._latest: dict[Hashable, tuple[Callable[..., Any], tuple]] = {}
+
+    def post(self, callback: Callable[..., Any], *args) -> None:
+        """Queue a call to run on the UI thread."""
+        with self._lock:
+            self._queue.append((False, callback, args))
+
+    def post_latest(self, key: Hashable, callback: Callable[..., Any], *args) -> None:
+        """Queue a call, replacing any pending call with the same key."""
+        with self._lock:
+            if key not in self._latest:
+                self._queue.append((True, key, None))
+            self._latest[key] = (callback, args)
+
+    def __len__(self) -> int:
+        """Return the number of pending calls."""
+        with self._lock:
+            return len(self._queue)
+
+    def drain(self) -> int:
+        """Run every call posted so far (call from the UI thread).
+
+        Calls posted while draining run on the next drain. An exception in
+        one call is printed and doesn't stop the others.
+
+        Returns:
+            Number of calls run
+        """
+        with self._lock:
+            pending = self._queue
+            latest = self._latest
+            self._queue = deque()
+            self._latest = {}
+
+        for coalesced, callback, args in pending:
+            if coalesced:
+                callback, args = latest[callback]
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in UI callback: {e}")
+        return len(pending)
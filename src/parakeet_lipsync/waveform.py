@@ -0,0 +1,133 @@
+"""Multi-resolution min/max peaks for drawing waveforms."""
+
+from typing import Optional
+
+import numpy as np
+
+from parakeet_lipsync.audio_source import SampleSource
+
+
+class PeakPyramid:
+    """Min/max peaks of an audio source at power-of-two block sizes.
+
+    Level 0 holds the minimum and maximum of every ``base_block`` samples;
+    each level above halves the resolution. Drawing a time range picks the
+    coarsest level that still gives about one block per output point, or
+    the raw samples once the range is short enough, so the cost of drawing
+    depends on the plot width rather than the file length or zoom level.
+    """
+
+    def __init__(
+        self,
+        source: SampleSource,
+        base_block: int = 64,
+        read_blocks: int = 16384,
+        base_level: Optional[tuple[np.ndarray, np.ndarray]] = None
+    ):
+        """Build the pyramid from a source.
+
+        Args:
+            source: Audio to summarize (must be ready)
+            base_block: Samples per block at level 0
+            read_blocks: Level-0 blocks computed per source read
+            base_level: Previously computed (mins, maxs) of level 0; the
+                source isn't read to build the pyramid when given
+        """
+        self.source = source
+        self.sample_rate = source.sample_rate
+        self.num_frames = source.num_frames
+        self.base_block = base_block
+
+        if base_level is not None:
+            mins, maxs = (np.asarray(level, dtype=np.float32) for level in base_level)
+            if len(mins) != len(maxs) or len(mins) != -(-self.num_frames // base_block):
+                raise ValueError("Peak data doesn't match the audio length")
+        else:
+            mins, maxs = self._base_level(source, base_block, read_blocks)
+        self.mins: list[np.ndarray] = [mins]
+        self.maxs: list[np.ndarray] = [maxs]
+        while len(self.mins[-1]) > 1:
+            mins, maxs = self.mins[-1], self.maxs[-1]
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            self.mins.append(mins.reshape(-1, 2).min(axis=1))
+            self.maxs.append(maxs.reshape(-1, 2).max(axis=1))
+
+    @staticmethod
+    def _base_level(source: SampleSource, base_block: int, read_blocks: int) -> tuple[np.ndarray, np.ndarray]:
+        """Reduce the source to per-block minima and maxima, one read at a time."""
+        num_blocks = -(-source.num_frames // base_block)
+        mins = np.zeros(num_blocks, dtype=np.float32)
+        maxs = np.zeros(num_blocks, dtype=np.float32)
+
+        step = base_block * read_blocks
+        for start in range(0, source.num_frames, step):
+            samples = source.read(start, start + step)
+            first = start // base_block
+            full = len(samples) // base_block
+            if full:
+                blocks = samples[:full * base_block].reshape(full, base_block)
+                mins[first:first + full] = blocks.min(axis=1)
+                maxs[first:first + full] = blocks.max(axis=1)
+            tail = samples[full * base_block:]
+            if len(tail):
+                mins[first + full] = tail.min()
+                maxs[first + full] = tail.max()
+        return mins, maxs
+
+    @property
+    def num_levels(self) -> int:
+        """Return the number of peak levels."""
+        return len(self.mins)
+
+    def block_size(self, level: int) -> int:
+        """Return the number of samples per block at a level."""
+        return self.base_block << level
+
+    def level_for(self, num_samples: int, max_points: int) -> Optional[int]:
+        """Pick the level for drawing a range.
+
+        Returns:
+            The finest level with at most max_points blocks in the range,
+            or None if the raw samples fit
+        """
+        if num_samples <= max_points:
+            return None
+        for level in range(self.num_levels):
+            if num_samples / self.block_size(level) <= max_points:
+                return level
+        return self.num_levels - 1
+
+    def window(self, start_seconds: float, end_seconds: float, max_points: int = 2048) -> tuple[np.ndarray, np.ndarray]:
+        """Return plot vertices for a time range.
+
+        At peak levels each block becomes a vertical stroke from its minimum
+        to its maximum; zoomed in far enough, the samples themselves are
+        returned.
+
+        Args:
+            start_seconds: Start of the visible range
+            end_seconds: End of the visible range
+            max_points: Roughly the number of horizontal points to draw
+
+        Returns:
+            (x, y) arrays with times in seconds and amplitudes
+        """
+        start = max(0, int(start_seconds * self.sample_rate))
+        end = min(self.num_frames, int(np.ceil(end_seconds * self.sample_rate)) + 1)
+        if end <= start:
+            return np.zeros(0), np.zeros(0)
+
+        level = self.level_for(end - start, max_points)
+        if level is None:
+            x = np.arange(start, end) / self.sample_rate
+            return x, self.source.read(start, end)
+
+        block = self.block_size(level)
+        first = start // block
+        last = min(len(self.mins[level]), -(-end // block))
+        times = np.arange(first, last) * block / self.sample_rate
+        x = np.repeat(times, 2)
+        y = np.column_stack((self.mins[level][first:last], self.maxs[level][first:last])).ravel()
+        return x, y
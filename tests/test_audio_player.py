@@ -0,0 +1,156 @@
+import threading
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from parakeet_lipsync.audio_player import AudioPlayer
+
+SAMPLE_RATE = 1000
+BLOCK = 256
+
+
+class FakeStream:
+    """Output stream whose callback is driven by the test."""
+
+    def __init__(self, callback, **kwargs):
+        self.callback = callback
+        self.kwargs = kwargs
+        self.time = 0.0
+        self.started = False
+        self.closed = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def close(self):
+        self.closed = True
+
+    def pull(self, dac_time, frames=BLOCK):
+        """Request one block as the device would, heard at dac_time."""
+        out = np.full((frames, 1), np.nan, dtype=np.float32)
+        self.callback(out, frames, SimpleNamespace(outputBufferDacTime=dac_time), None)
+        return out[:, 0]
+
+
+@pytest.fixture
+def ramp_wav(tmp_path):
+    """One second of a ramp, so every sample's value encodes its index."""
+    samples = np.arange(SAMPLE_RATE, dtype=np.int16)
+    path = tmp_path / "ramp.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+    return str(path)
+
+
+@pytest.fixture
+def player(ramp_wav):
+    streams = []
+
+    def factory(**kwargs):
+        streams.append(FakeStream(**kwargs))
+        return streams[-1]
+
+    player = AudioPlayer(stream_factory=factory, blocksize=BLOCK)
+    player.load(ramp_wav)
+    player.streams = streams
+    yield player
+    player.close()
+
+
+def sample_index(values):
+    return np.rint(values * 32768).astype(int)
+
+
+def test_opens_stream_at_file_rate(player):
+    player.play()
+    (stream,) = player.streams
+    assert stream.started
+    assert stream.kwargs["samplerate"] == SAMPLE_RATE
+    assert stream.kwargs["blocksize"] == BLOCK
+
+
+def test_position_follows_dac_time_anchor(player):
+    player.play()
+    stream = player.streams[0]
+    out = stream.pull(dac_time=0.1)
+    np.testing.assert_array_equal(sample_index(out), np.arange(BLOCK))
+
+    # Nothing heard yet before the block reaches the DAC
+    stream.time = 0.05
+    assert player.get_position_seconds() == 0.0
+    stream.time = 0.2
+    assert player.get_position_seconds() == pytest.approx(0.1)
+    # Never ahead of what has been handed to the device
+    stream.time = 5.0
+    assert player.get_position_seconds() == pytest.approx(BLOCK / SAMPLE_RATE)
+
+    stream.pull(dac_time=0.1 + BLOCK / SAMPLE_RATE)
+    stream.time = 0.1 + BLOCK / SAMPLE_RATE + 0.05
+    assert player.get_position_seconds() == pytest.approx((BLOCK + 50) / SAMPLE_RATE)
+
+
+def test_stop_keeps_heard_position_and_silences_output(player):
+    player.play()
+    stream = player.streams[0]
+    stream.pull(dac_time=0.0)
+    stream.time = 0.1
+    player.stop()
+
+    assert not player.is_playing
+    assert player.get_position_seconds() == pytest.approx(0.1)
+    assert not stream.pull(dac_time=0.2).any()
+
+    # Resuming continues from the heard position on the same stream
+    player.play()
+    out = stream.pull(dac_time=0.3)
+    assert sample_index(out[:1])[0] == 100
+    assert len(player.streams) == 1
+
+
+def test_play_to_stops_at_end_marker(player):
+    finished = threading.Event()
+    player.set_finished_callback(finished.set)
+    player.play_to(0.1)
+    stream = player.streams[0]
+
+    out = stream.pull(dac_time=1.0)
+    np.testing.assert_array_equal(sample_index(out[:100]), np.arange(100))
+    assert not out[100:].any()
+    assert not player.is_playing
+
+    # Finished only once the last sample has been heard
+    stream.time = 1.05
+    assert not player._playback_done()
+    stream.time = 1.1
+    assert finished.wait(1.0)
+
+    # stop() clears the end marker so the next play runs to the end
+    player.stop()
+    player.play_from(0.5)
+    out = stream.pull(dac_time=2.0)
+    assert sample_index(out[:1])[0] == 500
+
+
+def test_end_of_buffer_pads_with_silence(player):
+    player.seek(0.9)
+    player.play()
+    stream = player.streams[0]
+
+    out = stream.pull(dac_time=0.0)
+    np.testing.assert_array_equal(sample_index(out[:100]), np.arange(900, 1000))
+    assert not out[100:].any()
+    assert not player.is_playing
+
+    stream.time = 10.0
+    assert player.get_position_seconds() == pytest.approx(1.0)
+    # Playing again at the end does nothing
+    player.play()
+    assert not player.is_playing
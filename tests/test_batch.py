@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("librosa")
+
+from parakeet_lipsync.batch import group_by_model, known_language_ids, language_from_directory
+
+
+def test_language_from_directory_accepts_known_ids_only():
+    known = known_language_ids({"xho": "latest"})
+
+    assert language_from_directory("dialogue/eng/line01.wav", known) == "eng"
+    assert language_from_directory("dialogue/FRA/line01.wav", known) == "fra"
+    assert language_from_directory("dialogue/xho/line01.wav", known) == "xho"
+    for folder in ("wav", "raw", "out", "new", "tmp", "episode_01"):
+        assert language_from_directory(f"dialogue/{folder}/line01.wav", known) is None
+
+
+def test_group_by_model_keeps_input_order():
+    files = ["eng/a.wav", "fra/b.wav", "c.wav", "eng/d.wav"]
+    languages = {"eng/a.wav": "eng", "fra/b.wav": "fra", "eng/d.wav": "eng"}
+
+    groups = group_by_model(files, languages, {"eng": "eng2102"})
+
+    assert groups == {"eng2102": ["eng/a.wav", "eng/d.wav"], "latest": ["fra/b.wav", "c.wav"]}
@@ -0,0 +1,160 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+from parakeet_lipsync.live import LiveConfig, LiveLipsync, RingBuffer, synthetic_input
+from parakeet_lipsync.models import PhonemeStep, RecognitionResult
+
+SAMPLE_RATE = 16000
+STEP = 0.1
+SHAPES = ["AI", "E", "MBP", "O"]
+
+
+def expected_steps(until: float) -> list[tuple[float, str]]:
+    """The grid of 0.1 s steps the stub recognizes, up to a stream time."""
+    count = int(round(until / STEP))
+    return [(round(k * STEP, 3), SHAPES[k % len(SHAPES)]) for k in range(count)]
+
+
+class StubRecognizer:
+    """Recognizes a fixed grid of steps in absolute stream time.
+
+    The fed samples are their own stream positions, so a window knows
+    where it starts. Steps cut off by the window start are left out and
+    the step cut off by its end is shortened, like real recognition of a
+    partial phone.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def recognize_window(self, samples: np.ndarray) -> RecognitionResult:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        start = float(samples[0]) / SAMPLE_RATE
+        end = start + len(samples) / SAMPLE_RATE
+        steps = []
+        k = int(np.ceil(start / STEP - 1e-6))
+        while k * STEP < end - 1e-6:
+            step_end = min((k + 1) * STEP, end)
+            steps.append(PhonemeStep(k * STEP - start, step_end - k * STEP, SHAPES[k % len(SHAPES)]))
+            k += 1
+        return RecognitionResult(steps)
+
+
+def positions(seconds: float) -> np.ndarray:
+    return np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def committed(updates) -> list[tuple[float, str]]:
+    return [(round(step.start_time, 3), step.mouth_shape) for update in updates for step in update.steps]
+
+
+def test_ring_buffer_wraps_around():
+    buffer = RingBuffer(5)
+    buffer.write(np.array([0, 1, 2]))
+    samples, end, _ = buffer.latest(5)
+    assert list(samples) == [0, 1, 2] and end == 3
+
+    buffer.write(np.array([3, 4, 5, 6]))
+    samples, end, _ = buffer.latest(5)
+    assert list(samples) == [2, 3, 4, 5, 6] and end == 7
+    assert list(buffer.latest(3)[0]) == [4, 5, 6]
+
+    # A block larger than the buffer keeps only its tail
+    buffer.write(np.arange(10, 18))
+    samples, end, _ = buffer.latest(10)
+    assert list(samples) == [13, 14, 15, 16, 17] and end == 15
+
+
+def test_ring_buffer_wait_and_close():
+    buffer = RingBuffer(4)
+    assert not buffer.wait_for(1, timeout=0.01)
+    buffer.write(np.zeros(2))
+    assert buffer.wait_for(2, timeout=0.01)
+    buffer.close()
+    assert not buffer.wait_for(3, timeout=1.0)
+
+
+def run_live(recognizer, seconds: float, config: LiveConfig, live=None):
+    """Feed ``seconds`` of positions through live mode as fast as possible.
+
+    Returns once the last window has been recognized.
+    """
+    updates = []
+    caught_up = threading.Event()
+
+    def on_update(update):
+        updates.append(update)
+        if update.stream_time >= seconds - 1e-6:
+            caught_up.set()
+
+    factory = synthetic_input(positions(seconds), SAMPLE_RATE, realtime=False)
+    if live is None:
+        live = LiveLipsync(recognizer, config=config, sample_rate=SAMPLE_RATE, stream_factory=factory)
+    live.on_update = on_update
+    live._stream_factory = factory
+    live.start()
+    assert caught_up.wait(10.0)
+    live.stop()
+    return live, updates
+
+
+CONFIG = LiveConfig(window_seconds=1.0, hop_seconds=0.2, commit_delay_seconds=0.3)
+
+
+def test_overlapping_windows_commit_each_step_once():
+    live = LiveLipsync(StubRecognizer(), config=CONFIG, sample_rate=SAMPLE_RATE)
+    audio = positions(3.0)
+    hop = int(CONFIG.hop_seconds * SAMPLE_RATE)
+
+    updates = []
+    for end in range(hop, len(audio) + 1, hop):
+        live.buffer.write(audio[end - hop:end])
+        updates.append(live._process(*live.buffer.latest(live.buffer.capacity)))
+
+    # Everything up to about commit_delay before the end is final, exactly once
+    assert 2.6 - 1e-6 <= live._committed_until <= 2.7 + 1e-6
+    assert committed(updates) == expected_steps(round(live._committed_until, 1))
+    assert updates[-1].shape == SHAPES[29 % len(SHAPES)]
+
+
+def test_synthetic_input_end_to_end():
+    live, updates = run_live(StubRecognizer(), 3.0, CONFIG)
+
+    assert live.error is None
+    steps = committed(updates)
+    assert len(steps) == len(set(steps))  # Never committed twice
+    grid = expected_steps(3.0)
+    assert all(step in grid for step in steps)
+    if live.stats.dropped_windows == 0:
+        assert steps == expected_steps(round(live._committed_until, 1))
+
+
+def test_slow_inference_drops_windows():
+    recognizer = StubRecognizer(delay=0.05)
+    live, updates = run_live(recognizer, 3.0, CONFIG)
+
+    # The input arrives all at once, so the worker skips to the newest window
+    hops = int(round(3.0 / CONFIG.hop_seconds))
+    assert live.stats.dropped_windows > 0
+    assert recognizer.calls < hops
+    assert live.stats.count == recognizer.calls == len(updates)
+    steps = committed(updates)
+    assert len(steps) == len(set(steps))
+
+
+def test_restart_after_stop():
+    live, first = run_live(StubRecognizer(), 0.6, CONFIG)
+    live, second = run_live(None, 0.6, CONFIG, live=live)
+
+    assert first and second
+    assert not live.running
+    # The second session starts again from stream time zero
+    assert second[0].stream_time == pytest.approx(first[0].stream_time)
@@ -0,0 +1,16 @@
+import json
+import os
+
+from parakeet_lipsync.mapping import RIG_MAPPING_FILE, load_mapping
+
+
+def test_edited_rig_mapping_is_reloaded(tmp_path):
+    path = tmp_path / RIG_MAPPING_FILE
+    path.write_text(json.dumps({"p": "O"}), encoding="utf-8")
+    first = load_mapping("ipa", tmp_path)
+    assert first.mapping["p"] == "O"
+    assert load_mapping("ipa", tmp_path) is first
+
+    path.write_text(json.dumps({"p": "E"}), encoding="utf-8")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000_000))
+    assert load_mapping("ipa", tmp_path).mapping["p"] == "E"
@@ -0,0 +1,17 @@
+import io
+
+from parakeet_lipsync.models import PhonemeStep, RecognitionResult
+
+
+def test_moho_timesheet_of_empty_result_is_header_line():
+    assert RecognitionResult([]).export_as_moho_timesheet() == "MohoSwitch1\n"
+
+
+def test_moho_timesheet_is_the_same_in_any_block_size():
+    result = RecognitionResult([PhonemeStep(0.0, 0.125, "AI"), PhonemeStep(0.125, 0.0625, "O")])
+    expected = "MohoSwitch1\n1 AI\n2 AI\n3 AI\n4 O"
+    assert result.export_as_moho_timesheet(fps=24) == expected
+
+    buffer = io.StringIO()
+    result.write_moho_timesheet(buffer, fps=24, chunk_frames=2)
+    assert buffer.getvalue() == expected
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+from parakeet_lipsync.recognizer import _pad_by_length
+
+
+def test_pad_by_length_sorts_unsorted_lengths():
+    rng = np.random.default_rng(0)
+    feats = [rng.standard_normal((length, 4)).astype(np.float32) for length in (3, 7, 5, 7, 1)]
+
+    padded, lengths, order = _pad_by_length(feats)
+
+    # pack_padded_sequence(enforce_sorted=True) needs non-increasing lengths
+    assert np.all(np.diff(lengths) <= 0)
+    assert padded.shape == (5, 7, 4)
+    for row, index in enumerate(order):
+        np.testing.assert_array_equal(padded[row, :lengths[row]], feats[index])
+        assert not padded[row, lengths[row]:].any()
+
+    restored = [None] * len(feats)
+    for row, index in enumerate(order):
+        restored[index] = padded[row, :lengths[row]]
+    for feat, back in zip(feats, restored):
+        np.testing.assert_array_equal(feat, back)
+
+
+def test_pad_by_length_keeps_sorted_batches_in_place():
+    feats = [np.ones((length, 2), dtype=np.float32) for length in (6, 4, 4, 2)]
+
+    _, lengths, order = _pad_by_length(feats)
+
+    assert list(order) == [0, 1, 2, 3]
+    assert list(lengths) == [6, 4, 4, 2]
@@ -0,0 +1,18 @@
+import pytest
+
+from parakeet_lipsync.remote import DEFAULT_SERVER_ADDRESS, server_address
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("off", None),
+    ("on", DEFAULT_SERVER_ADDRESS),
+    ("10.0.0.2:9000", "10.0.0.2:9000"),
+])
+def test_server_is_opt_in(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("PARAKEET_SERVER", raising=False)
+    else:
+        monkeypatch.setenv("PARAKEET_SERVER", value)
+    assert server_address() == expected
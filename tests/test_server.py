@@ -0,0 +1,63 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+from parakeet_lipsync import server as server_module
+from parakeet_lipsync.remote import REQUEST_HEADER
+
+
+@pytest.fixture
+def address(monkeypatch):
+    """Serve the HTTP handler over a stub that echoes the sample count."""
+    monkeypatch.setattr(server_module, "MAX_REQUEST_BYTES", 64)
+    stub = SimpleNamespace(
+        model_name="stub", recognizers=[None],
+        recognize=lambda samples, params, chunking: f"0.0 {len(samples)} a"
+    )
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server_module._make_handler(stub))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(address, body: bytes, headers=None):
+    connection = http.client.HTTPConnection(*address, timeout=5)
+    headers = {REQUEST_HEADER: json.dumps({"params": {}}), **(headers or {})}
+    connection.request("POST", "/recognize", body=body, headers=headers)
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    return response.status, data
+
+
+def test_accepts_float32_body(address):
+    status, data = post(address, np.zeros(4, dtype="<f4").tobytes())
+    assert status == 200
+    assert data == b"0.0 4 a"
+
+
+def test_rejects_oversized_body(address):
+    assert post(address, np.zeros(17, dtype="<f4").tobytes())[0] == 413
+
+
+@pytest.mark.parametrize("body", [b"", b"\x00" * 6])
+def test_rejects_partial_or_empty_samples(address, body):
+    assert post(address, body)[0] == 400
+
+
+def test_rejects_invalid_content_length(address):
+    connection = http.client.HTTPConnection(*address, timeout=5)
+    connection.putrequest("POST", "/recognize")
+    connection.putheader("Content-Length", "lots")
+    connection.endheaders()
+    assert connection.getresponse().status == 400
+    connection.close()